@@ -0,0 +1,65 @@
+"""Add indexes for the quest listing filters
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 12:00:00.000000
+
+``get_quests`` filters on visibility, author, campaign, difficulty, interest
+or quest type and pages in (created_at, id) order. Each index leads with the
+filter column and continues with the sort key, so the first page is read
+straight from the index instead of sorting every matching row.
+
+Tables are created by the application on startup, so on a fresh database
+there is nothing to migrate yet and the indexes come with the tables.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+QUEST_INDEXES = {
+    "ix_quests_created_at_id": ["created_at", "id"],
+    "ix_quests_author_id_created_at_id": ["author_id", "created_at", "id"],
+    "ix_quests_campaign_id_created_at_id": ["campaign_id", "created_at", "id"],
+    "ix_quests_difficulty_id_created_at_id": ["difficulty_id", "created_at", "id"],
+    "ix_quests_interest_id_created_at_id": ["interest_id", "created_at", "id"],
+    "ix_quests_quest_type_id_created_at_id": ["quest_type_id", "created_at", "id"],
+    "ix_quests_start_location_id": ["start_location_id"],
+    "ix_quests_destination_id": ["destination_id"],
+}
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("quests"):
+        return
+    # CONCURRENTLY keeps the tables writable while PostgreSQL builds the
+    # indexes; it cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in QUEST_INDEXES.items():
+            op.create_index(name, "quests", columns, if_not_exists=True, postgresql_concurrently=True)
+        # Public listings, the common case, only index public quests
+        op.create_index(
+            "ix_quests_public_created_at_id", "quests", ["created_at", "id"],
+            postgresql_where=sa.text("is_public = true"), sqlite_where=sa.text("is_public = 1"),
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_user_quest_bookmarks_quest_id", "user_quest_bookmarks", ["quest_id"],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("quests"):
+        return
+    op.drop_index("ix_user_quest_bookmarks_quest_id", table_name="user_quest_bookmarks", if_exists=True)
+    op.drop_index("ix_quests_public_created_at_id", table_name="quests", if_exists=True)
+    for name in reversed(list(QUEST_INDEXES)):
+        op.drop_index(name, table_name="quests", if_exists=True)
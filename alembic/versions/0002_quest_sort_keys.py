@@ -0,0 +1,73 @@
+"""Add the trending score and indexes for the quest sort orders
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 14:00:00.000000
+
+``GET /quests/?sort=popular|bookmarked|trending`` reads the top of an index
+on (likes, id), (bookmarks, id) or (trending_score, id). Existing quests get
+a trending score as if all their likes and bookmarks happened when the quest
+was created (see ``app.db.trending``), and missing counters become 0 so they
+sort last.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in step with app.db.trending, which this migration must not import
+EPOCH = "2024-01-01 00:00:00+00"
+LIKE_WEIGHT = 1.0
+BOOKMARK_WEIGHT = 2.0
+HALF_LIFE_HOURS = 24.0
+
+SORT_INDEXES = {
+    "ix_quests_likes_id": ["likes", "id"],
+    "ix_quests_bookmarks_id": ["bookmarks", "id"],
+    "ix_quests_trending_score_id": ["trending_score", "id"],
+}
+
+
+def _hours_since_epoch(dialect: str) -> str:
+    if dialect == "postgresql":
+        return f"extract(epoch FROM created_at - timestamptz '{EPOCH}') / 3600"
+    return "(julianday(created_at) - julianday('2024-01-01')) * 24"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("quests"):
+        return
+    if "trending_score" not in {column["name"] for column in inspector.get_columns("quests")}:
+        op.add_column(
+            "quests",
+            sa.Column("trending_score", sa.Float(), nullable=False, server_default="0"),
+        )
+    op.execute("UPDATE quests SET likes = 0 WHERE likes IS NULL")
+    op.execute("UPDATE quests SET bookmarks = 0 WHERE bookmarks IS NULL")
+    op.execute(
+        "UPDATE quests SET trending_score = "
+        f"ln(likes * {LIKE_WEIGHT} + bookmarks * {BOOKMARK_WEIGHT}) "
+        f"+ ln(2) * {_hours_since_epoch(bind.dialect.name)} / {HALF_LIFE_HOURS} "
+        "WHERE likes + bookmarks > 0 AND trending_score = 0 AND created_at IS NOT NULL"
+    )
+    with op.get_context().autocommit_block():
+        for name, columns in SORT_INDEXES.items():
+            op.create_index(name, "quests", columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("quests"):
+        return
+    for name in reversed(list(SORT_INDEXES)):
+        op.drop_index(name, table_name="quests", if_exists=True)
+    # Not batch mode: recreating the table on SQLite would lose its search triggers
+    op.drop_column("quests", "trending_score")
@@ -0,0 +1,42 @@
+"""Add row versions to users, locations, campaigns and quests
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 16:00:00.000000
+
+Every UPDATE of these rows increments ``row_version`` (see
+``app.db.models``), including counter updates that bypass the ORM. Entity
+endpoints derive their ``ETag`` from it: ``updated_at`` only has one-second
+resolution on SQLite, so two edits in the same second would share a
+validator. Existing rows start at version 1.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ["users", "locations", "campaigns", "quests"]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table in VERSIONED_TABLES:
+        if not inspector.has_table(table):
+            continue
+        if "row_version" not in {column["name"] for column in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column("row_version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table in reversed(VERSIONED_TABLES):
+        if inspector.has_table(table):
+            # Not batch mode: recreating the quests table on SQLite would lose its search triggers
+            op.drop_column(table, "row_version")
@@ -0,0 +1,82 @@
+"""Add follower counts, feed timelines and the indexes follows and feeds read
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 18:00:00.000000
+
+``GET /users/me/feed/`` reads the caller's timeline from ``feed_entries``
+(when Redis is not configured), which new quests and campaigns are pushed
+into for each follower of their author; see ``app.db.feed``. The push reads
+an author's followers through ``ix_follows_followee_id``, and
+``users.follower_count`` decides whether an author is pushed or read at
+feed time. Duplicate follows are dropped before the pair is made unique, and
+existing users get their follower count. Timelines start empty.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_follows_followee_id": ("follows", ["followee_id"]),
+    "ix_campaigns_author_id_created_at_id": ("campaigns", ["author_id", "created_at", "id"]),
+}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("users"):
+        return
+    if "follower_count" not in {column["name"] for column in inspector.get_columns("users")}:
+        op.add_column("users", sa.Column("follower_count", sa.Integer(), nullable=False, server_default="0"))
+    op.execute(
+        "DELETE FROM follows WHERE id NOT IN "
+        "(SELECT min(id) FROM follows GROUP BY follower_id, followee_id)"
+    )
+    op.execute(
+        "UPDATE users SET follower_count = "
+        "(SELECT count(*) FROM follows WHERE follows.followee_id = users.id)"
+    )
+    if not inspector.has_table("feed_entries"):
+        op.create_table(
+            "feed_entries",
+            sa.Column("follower_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("kind", sa.String(20), primary_key=True),
+            sa.Column("item_id", sa.Integer(), primary_key=True),
+            sa.Column("author_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        )
+    op.create_index(
+        "ix_feed_entries_follower_id_created_at", "feed_entries",
+        ["follower_id", "created_at", "kind", "item_id"], if_not_exists=True,
+    )
+    op.create_index(
+        "ix_feed_entries_follower_id_author_id", "feed_entries", ["follower_id", "author_id"], if_not_exists=True
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_follows_follower_id_followee_id", "follows", ["follower_id", "followee_id"],
+            unique=True, if_not_exists=True, postgresql_concurrently=True,
+        )
+        for name, (table, columns) in INDEXES.items():
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("users"):
+        return
+    for name, (table, _) in reversed(list(INDEXES.items())):
+        op.drop_index(name, table_name=table, if_exists=True)
+    op.drop_index("ix_follows_follower_id_followee_id", table_name="follows", if_exists=True)
+    if inspector.has_table("feed_entries"):
+        op.drop_table("feed_entries")
+    # Not batch mode, like 0003
+    op.drop_column("users", "follower_count")
@@ -0,0 +1,48 @@
+"""Add created_at and updated_at to locations
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 19:00:00.000000
+
+Location listings page in (created_at, id) order, and entity endpoints send
+``updated_at`` as ``Last-Modified``. Locations created before the columns
+existed get the time of the upgrade as their creation time.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("locations"):
+        return
+    existing = {column["name"] for column in inspector.get_columns("locations")}
+    columns = [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    ]
+    missing = [column for column in columns if column.name not in existing]
+    if not missing:
+        return
+    # SQLite cannot ALTER TABLE ADD COLUMN with a CURRENT_TIMESTAMP default, so
+    # the table is rebuilt there; locations has no triggers to lose
+    recreate = "always" if op.get_bind().dialect.name == "sqlite" else "never"
+    with op.batch_alter_table("locations", recreate=recreate) as batch_op:
+        for column in missing:
+            batch_op.add_column(column)
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("locations"):
+        return
+    op.drop_column("locations", "updated_at")
+    op.drop_column("locations", "created_at")
@@ -0,0 +1,45 @@
+"""Add the generated geography column and its GiST index to locations
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 20:00:00.000000
+
+On PostgreSQL, radius and bounding-box searches filter and sort on
+``locations.geog``, a point generated from the latitude and longitude, through
+a GiST index; see ``app.db.geo``. Generated columns are computed for existing
+rows when they are added. SQLite has no spatial types and narrows searches
+with ``ix_locations_latitude_longitude``, which the tables were created with.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql" or not sa.inspect(bind).has_table("locations"):
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    op.execute(
+        "ALTER TABLE locations ADD COLUMN IF NOT EXISTS geog geography(Point, 4326) "
+        "GENERATED ALWAYS AS "
+        "(ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_locations_geog ON locations USING GIST (geog)")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql" or not sa.inspect(bind).has_table("locations"):
+        return
+    op.execute("DROP INDEX IF EXISTS ix_locations_geog")
+    op.execute("ALTER TABLE locations DROP COLUMN IF EXISTS geog")
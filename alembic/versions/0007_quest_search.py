@@ -0,0 +1,82 @@
+"""Add the full-text search index over quests
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 21:00:00.000000
+
+``GET /quests/search/`` matches quests through a weighted index of their
+name, tags, synopsis, lore excerpt and quest giver; see ``app.db.search``.
+On PostgreSQL that is the generated ``search_vector`` tsvector column with a
+GIN index. PostgreSQL computes a generated column for every existing row
+when it is added, so that is the backfill: the column cannot be UPDATEd.
+SQLite gets an FTS5 table kept in step with ``quests`` by triggers. It is
+rebuilt from the existing quests.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in step with app.db.search, which this migration must not import
+TSVECTOR_WEIGHTS = {"name": "A", "tags": "B", "synopsis": "C", "lore_excerpt": "D", "quest_giver": "D"}
+SEARCH_FIELDS = ", ".join(TSVECTOR_WEIGHTS)
+NEW = ", ".join(f"new.{field}" for field in TSVECTOR_WEIGHTS)
+OLD = ", ".join(f"old.{field}" for field in TSVECTOR_WEIGHTS)
+SEARCH_VECTOR = " || ".join(
+    f"setweight(to_tsvector('english', coalesce({field}, '')), '{weight}')"
+    for field, weight in TSVECTOR_WEIGHTS.items()
+)
+
+SQLITE_TRIGGERS = {
+    "quests_fts_insert": "AFTER INSERT ON quests BEGIN "
+    f"INSERT INTO quests_fts(rowid, {SEARCH_FIELDS}) VALUES (new.id, {NEW}); END",
+    "quests_fts_delete": "AFTER DELETE ON quests BEGIN "
+    f"INSERT INTO quests_fts(quests_fts, rowid, {SEARCH_FIELDS}) VALUES ('delete', old.id, {OLD}); END",
+    "quests_fts_update": f"AFTER UPDATE OF {SEARCH_FIELDS} ON quests BEGIN "
+    f"INSERT INTO quests_fts(quests_fts, rowid, {SEARCH_FIELDS}) VALUES ('delete', old.id, {OLD}); "
+    f"INSERT INTO quests_fts(rowid, {SEARCH_FIELDS}) VALUES (new.id, {NEW}); END",
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("quests"):
+        return
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "ALTER TABLE quests ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+        )
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_quests_search_vector ON quests USING GIN (search_vector)"
+            )
+    elif bind.dialect.name == "sqlite":
+        # External-content table: the index only, the text stays in quests
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS quests_fts USING fts5({SEARCH_FIELDS}, "
+            "content='quests', content_rowid='id', tokenize='porter unicode61')"
+        )
+        for name, body in SQLITE_TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        op.execute("INSERT INTO quests_fts(quests_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("quests"):
+        return
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_quests_search_vector")
+        op.execute("ALTER TABLE quests DROP COLUMN IF EXISTS search_vector")
+    elif bind.dialect.name == "sqlite":
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS quests_fts")
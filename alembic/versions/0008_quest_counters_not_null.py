@@ -0,0 +1,47 @@
+"""Make the quest like and bookmark counters NOT NULL
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 09:00:00.000000
+
+``sort=popular`` and ``sort=bookmarked`` page through quests by keyset on
+(likes, id) and (bookmarks, id). A NULL counter compares as unknown against
+a cursor, so such quests silently fell out of every page after the first.
+Missing counters become 0. On PostgreSQL the columns also get a default of 0
+and refuse NULLs. SQLite cannot change a column's constraints without
+rebuilding ``quests``, which would drop its search triggers, so there only
+the application's default keeps them filled.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = ["likes", "bookmarks"]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("quests"):
+        return
+    for counter in COUNTERS:
+        op.execute(f"UPDATE quests SET {counter} = 0 WHERE {counter} IS NULL")
+        if bind.dialect.name == "postgresql":
+            op.alter_column(
+                "quests", counter, existing_type=sa.Integer(), nullable=False, server_default="0"
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql" or not sa.inspect(bind).has_table("quests"):
+        return
+    for counter in COUNTERS:
+        op.alter_column("quests", counter, existing_type=sa.Integer(), nullable=True, server_default=None)
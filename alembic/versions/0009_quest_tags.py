@@ -0,0 +1,57 @@
+"""Add the normalised tags and quest_tags tables
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 12:00:00.000000
+
+``?tag=`` filters and tag facets read ``quest_tags`` instead of scanning the
+comma-separated ``quests.tags`` strings; see ``app.db.crud_tags``. Quests
+created or updated after this migration are linked as they are written.
+Existing quests are linked by ``scripts/backfill_quest_tags.py``, which
+parses the strings the way the application does and can run while the API
+is serving.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in step with app.db.models.Tag
+MAX_TAG_LENGTH = 100
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("quests"):
+        return
+    if not inspector.has_table("tags"):
+        op.create_table(
+            "tags",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(MAX_TAG_LENGTH), nullable=False, unique=True),
+        )
+    op.create_index("ix_tags_id", "tags", ["id"], if_not_exists=True)
+    if not inspector.has_table("quest_tags"):
+        op.create_table(
+            "quest_tags",
+            sa.Column("quest_id", sa.Integer(), sa.ForeignKey("quests.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("tag_id", sa.Integer(), sa.ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+        )
+    op.create_index(
+        "ix_quest_tags_tag_id_quest_id", "quest_tags", ["tag_id", "quest_id"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("quest_tags"):
+        op.drop_table("quest_tags")
+    if inspector.has_table("tags"):
+        op.drop_table("tags")
@@ -0,0 +1,17 @@
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+
+from app.db.database import db_mode
+
+
+class DBRoute(APIRoute):
+    """
+    Route class for endpoints that depend on ``get_db``.
+
+    With ``DATABASE_ASYNC`` enabled, each endpoint runs on an ``AsyncSession``
+    instead of occupying a threadpool worker; otherwise routes are unchanged.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, db_mode(endpoint), **kwargs)
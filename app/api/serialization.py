@@ -0,0 +1,242 @@
+"""
+Fast JSON rendering of ORM objects for read endpoints.
+
+``Schema.model_validate(obj)`` followed by a dump validates every field of
+every nested object again, including e-mail addresses, which is most of the
+CPU spent on a page of quests. Rows loaded from the database are already
+valid, so ``dump_json`` instead projects them straight into dicts, following
+the output schema's fields and nested schemas, and encodes them with orjson.
+The output is the same JSON the schema would produce; the schema is still
+given as ``response_model`` for the OpenAPI document.
+
+``entity_validators`` walks the same fields to build an entity's ``ETag``
+from the ``row_version`` of every row its response embeds (a quest's author,
+locations, campaign...), so a conditional request can be answered before the
+body is rendered. Unversioned lookup rows (interests, difficulties, quest
+types) contribute their values instead. ``Last-Modified`` is the newest
+``updated_at`` (or ``created_at``) among the same rows. The ETags are weak:
+they identify a version of the entity, not the exact bytes, which differ with
+``fields=`` and content encoding.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    get_args,
+    get_origin,
+)
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.conditional import raise_if_not_modified
+from app.db.database import off_loop
+from app.db.likes import pending_likes
+from app.db.schemas import QuestOut, nested_schema
+
+Projector = Callable[[Any], Optional[Dict[str, Any]]]
+
+_MISSING = object()
+
+
+def _include_buffered_likes(obj: Any, data: Dict[str, Any]) -> None:
+    # Likes in the write-behind buffer are not in the row yet
+    if "likes" in data:
+        data["likes"] += pending_likes(obj.id)
+
+
+def quest_out(quest: Any) -> QuestOut:
+    """Validate a quest row into ``QuestOut``, with buffered likes as ``projector``."""
+    out = QuestOut.model_validate(quest)
+    out.likes += pending_likes(out.id)
+    return out
+
+
+# Adjustments made to values read from a row when rendering it through a schema
+_AFTER_PROJECTION: Dict[Type[BaseModel], Callable[[Any, Dict[str, Any]], None]] = {
+    QuestOut: _include_buffered_likes,
+}
+
+# State a schema renders that its row version does not cover
+_UNVERSIONED_STATE: Dict[Type[BaseModel], Callable[[Any], Any]] = {
+    QuestOut: lambda quest: pending_likes(quest.id),
+}
+
+
+def _is_list(annotation: Any) -> bool:
+    if get_origin(annotation) in (list, List):
+        return True
+    return any(_is_list(arg) for arg in get_args(annotation))
+
+
+@lru_cache(maxsize=None)
+def projector(
+    schema: Type[BaseModel], keys: Optional[FrozenSet[str]] = None
+) -> Projector:
+    """
+    A function turning an ORM object (or ``None``) into the dict ``schema``
+    would dump, keeping only the top-level ``keys`` if given (see
+    ``app.db.fieldsets``).
+    """
+    plain: List[Tuple[str, Any]] = []
+    nested: List[Tuple[str, Projector, bool]] = []
+    for name, field in schema.model_fields.items():
+        if keys is not None and name not in keys:
+            continue
+        inner = nested_schema(field.annotation)
+        if inner is None:
+            default = (
+                _MISSING
+                if field.is_required()
+                else field.get_default(call_default_factory=True)
+            )
+            plain.append((name, default))
+        else:
+            nested.append((name, projector(inner), _is_list(field.annotation)))
+    after = _AFTER_PROJECTION.get(schema)
+
+    def project(obj: Any) -> Optional[Dict[str, Any]]:
+        if obj is None:
+            return None
+        data = {
+            name: (
+                getattr(obj, name)
+                if default is _MISSING
+                else getattr(obj, name, default)
+            )
+            for name, default in plain
+        }
+        for name, project_nested, many in nested:
+            value = getattr(obj, name, None)
+            if many:
+                data[name] = (
+                    None if value is None else [project_nested(item) for item in value]
+                )
+            else:
+                data[name] = project_nested(value)
+        if after is not None:
+            after(obj, data)
+        return data
+
+    return project
+
+
+@off_loop
+def dumps(content: Any) -> bytes:
+    """Encode projected content as pydantic would; UTC datetimes end in ``Z``."""
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def dump_json(
+    schema: Type[BaseModel],
+    objects: Iterable[Any],
+    keys: Optional[FrozenSet[str]] = None,
+) -> bytes:
+    """A JSON array of ``objects`` rendered through ``schema``."""
+    project = projector(schema, keys)
+    return dumps([project(obj) for obj in objects])
+
+
+def dump_one_json(
+    schema: Type[BaseModel], obj: Any, keys: Optional[FrozenSet[str]] = None
+) -> bytes:
+    return dumps(projector(schema, keys)(obj))
+
+
+def json_response(
+    body: bytes, headers: Optional[Mapping[str, str]] = None, status_code: int = 200
+) -> Response:
+    return Response(
+        body,
+        status_code=status_code,
+        headers=dict(headers or {}),
+        media_type="application/json",
+    )
+
+
+def _walk(
+    schema: Type[BaseModel],
+    obj: Any,
+    keys: Optional[FrozenSet[str]],
+    parts: List[str],
+    stamps: List[datetime],
+) -> None:
+    if obj is None:
+        parts.append("-")
+        return
+    plain: List[str] = []
+    nested: List[Tuple[str, Type[BaseModel]]] = []
+    for name, field in schema.model_fields.items():
+        if keys is not None and name not in keys:
+            continue
+        inner = nested_schema(field.annotation)
+        if inner is None:
+            plain.append(name)
+        else:
+            nested.append((name, inner))
+
+    version = getattr(obj, "row_version", None)
+    if version is not None:
+        parts.append(f"{obj.__tablename__}:{obj.id}:{version}")
+        stamp = getattr(obj, "updated_at", None) or getattr(obj, "created_at", None)
+        if stamp is not None:
+            stamps.append(stamp if stamp.tzinfo else stamp.replace(tzinfo=timezone.utc))
+    else:
+        parts.append(repr([getattr(obj, name, None) for name in plain]))
+    extra = _UNVERSIONED_STATE.get(schema)
+    if extra is not None:
+        parts.append(repr(extra(obj)))
+    for name, inner in nested:
+        value = getattr(obj, name, None)
+        for item in value if isinstance(value, list) else [value]:
+            _walk(inner, item, None, parts, stamps)
+
+
+def entity_validators(
+    schema: Type[BaseModel], obj: Any, keys: Optional[FrozenSet[str]] = None
+) -> Dict[str, str]:
+    """
+    ``ETag`` and ``Last-Modified`` for ``obj`` rendered through ``schema``,
+    limited to the top-level ``keys`` if given. Only attributes the response
+    renders are read, so nothing is lazy-loaded.
+    """
+    parts: List[str] = []
+    stamps: List[datetime] = []
+    _walk(schema, obj, keys, parts, stamps)
+    headers = {
+        "ETag": 'W/"' + hashlib.sha256("|".join(parts).encode()).hexdigest()[:32] + '"'
+    }
+    if stamps:
+        headers["Last-Modified"] = format_datetime(
+            max(stamps).astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def entity_headers(
+    request: Request,
+    schema: Type[BaseModel],
+    obj: Any,
+    cache_control: str,
+    keys: Optional[FrozenSet[str]] = None,
+) -> Dict[str, str]:
+    """
+    The validators and ``Cache-Control`` header for an entity response;
+    raises a 304 first if ``request``'s preconditions match them.
+    """
+    headers = {**entity_validators(schema, obj, keys), "Cache-Control": cache_control}
+    raise_if_not_modified(request, headers)
+    return headers
@@ -3,11 +3,12 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.db import crud_users, schemas
+from app.api.routing import DBRoute
 from app.db.database import get_db
 from app.core import security
 from typing import Dict, Any
 
-router = APIRouter()
+router = APIRouter(route_class=DBRoute)
 
 
 @router.post("/login/", response_model=schemas.UserResponse)
@@ -1,33 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
+from app.api.routing import DBRoute
+from app.api.serialization import dump_json, dump_one_json, entity_headers, json_response
 from app.db.database import get_db
 from app.db import crud_campaigns, schemas # Changed
+from app.core.cache import CachedResponse, response_cache
+from app.core.conditional import cache_control
 from app.core.security import get_current_user
+from app.db.pagination import NEXT_CURSOR_HEADER
 from typing import List, Any, Optional, Dict  # Add Dict if needed
 
 
-router = APIRouter()
+router = APIRouter(route_class=DBRoute)
+
+CAMPAIGN_CACHE_CONTROL = cache_control(shared_max_age=60)
 
 @router.get("/", response_model=List[schemas.CampaignOut])
 def get_campaigns(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
     db: Session = Depends(get_db)
-) -> List[schemas.CampaignOut]:
-    campaigns = crud_campaigns.get_campaigns(db, skip=skip, limit=limit) # Changed
-    
-    # Debug: Print the first campaign to see its structure
-    if campaigns:
-        print(f"Campaign data: {campaigns[0].__dict__}")
-    
-    return [schemas.CampaignOut.model_validate(campaign) for campaign in campaigns]
+) -> Response:
+    def build() -> CachedResponse:
+        page = crud_campaigns.get_campaigns(db, skip=skip, limit=limit, cursor=cursor)
+        headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+        return CachedResponse(dump_json(schemas.CampaignOut, page.items), headers)
+
+    return response_cache.respond(request, ["campaigns"], build)
 
 @router.get("/{campaign_id}/", response_model=schemas.CampaignOut)
-def get_campaign(campaign_id: int, db: Session = Depends(get_db)) -> schemas.CampaignOut:
+def get_campaign(campaign_id: int, request: Request, db: Session = Depends(get_db)) -> Response:
     campaign = crud_campaigns.get_campaign(db, campaign_id=campaign_id) # Changed
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    return schemas.CampaignOut.model_validate(campaign)
+    headers = entity_headers(request, schemas.CampaignOut, campaign, CAMPAIGN_CACHE_CONTROL)
+    return json_response(dump_one_json(schemas.CampaignOut, campaign), headers)
 
 @router.post("/", response_model=schemas.CampaignOut)
 def create_campaign(
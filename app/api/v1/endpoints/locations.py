@@ -1,28 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
+from app.api.routing import DBRoute
+from app.api.serialization import dump_json, dump_one_json, entity_headers, json_response
 from app.db.database import get_db
-from app.db import crud_locations, schemas # Changed
+from app.db import crud_locations, geo, schemas # Changed
+from app.core.cache import CachedResponse, response_cache
+from app.core.conditional import cache_control
 from app.core.security import get_current_user
+from app.db.pagination import NEXT_CURSOR_HEADER
 from typing import List, Any, Optional, Dict  # Add Dict if needed
 
 
-router = APIRouter()
+router = APIRouter(route_class=DBRoute)
+
+LOCATION_CACHE_CONTROL = cache_control(shared_max_age=60)
 
 @router.get("/", response_model=List[schemas.LocationOut])
 def get_locations(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    near: Optional[str] = Query(None, description="Sort by distance from 'lat,lon'"),
+    radius_km: Optional[float] = Query(None, gt=0, le=geo.MAX_RADIUS_KM, description="Only results within this distance of 'near'"),
+    bbox: Optional[str] = Query(None, description="Only results inside 'min_lon,min_lat,max_lon,max_lat'"),
     db: Session = Depends(get_db)
-) -> List[schemas.LocationOut]:
-    locations = crud_locations.get_locations(db, skip=skip, limit=limit)
-    return [schemas.LocationOut.model_validate(location) for location in locations]
+) -> Response:
+    spatial = geo.SpatialFilter.from_params(near, radius_km, bbox)
+
+    def build() -> CachedResponse:
+        page = crud_locations.get_locations(db, skip=skip, limit=limit, cursor=cursor, spatial=spatial)
+        headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+        return CachedResponse(dump_json(schemas.LocationOut, page.items), headers)
+
+    return response_cache.respond(request, ["locations"], build)
 
 @router.get("/{location_id}", response_model=schemas.LocationOut)
-def get_location(location_id: int, db: Session = Depends(get_db)) -> schemas.LocationOut:
+def get_location(location_id: int, request: Request, db: Session = Depends(get_db)) -> Response:
     location = crud_locations.get_location(db, location_id=location_id)
     if not location:
         raise HTTPException(status_code=404, detail="Location not found")
-    return schemas.LocationOut.model_validate(location)
+    headers = entity_headers(request, schemas.LocationOut, location, LOCATION_CACHE_CONTROL)
+    return json_response(dump_one_json(schemas.LocationOut, location), headers)
 
 @router.post("/", response_model=schemas.LocationOut)
 def create_location(
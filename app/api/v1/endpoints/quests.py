@@ -1,47 +1,157 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
+from app.api.routing import DBRoute
+from app.api.serialization import (
+    dump_json, dump_one_json, dumps, entity_headers, json_response, projector, quest_out,
+)
 from app.db.database import get_db
-from app.db import crud_quests, schemas # Changed
+from app.db import crud_quests, crud_tags, geo, models, schemas, search # Changed
+from app.core.cache import CachedResponse, listed_quest_tag, response_cache
+from app.core.conditional import cache_control
+from app.core.config import settings
 from app.core.security import get_current_user
-from typing import List, Optional, Any, Dict
+from app.db.fieldsets import FieldSelection
+from app.db.pagination import NEXT_CURSOR_HEADER
+from typing import AsyncIterator, List, Literal, Optional, Any, Dict, Tuple, cast
+import json
+import logging
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=DBRoute)
+
+# The CDN may serve a quest for half a minute; browsers revalidate with If-None-Match
+QUEST_CACHE_CONTROL = cache_control(shared_max_age=30)
+
+FIELDS_QUERY = Query(
+    None, description="Comma-separated fields to include, e.g. 'id,name,start_location_id'; 'id' is always included"
+)
+EMBED_QUERY = Query(
+    None,
+    description="Comma-separated relationships to embed, e.g. 'author,start_location'; "
+    "all of them by default, none when 'fields' is given",
+)
+
+def quest_field_selection(
+    fields: Optional[str] = FIELDS_QUERY, embed: Optional[str] = EMBED_QUERY
+) -> Optional[FieldSelection]:
+    return FieldSelection.from_params(models.Quest, schemas.QuestOut, fields, embed)
 
 @router.get("/", response_model=List[schemas.QuestOut])
 def get_quests(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
     difficulty_id: Optional[int] = Query(None),
     interest_id: Optional[int] = Query(None),
     quest_type_id: Optional[int] = Query(None),
     is_public: Optional[bool] = Query(None),
+    near: Optional[str] = Query(None, description="Sort by distance from 'lat,lon'"),
+    radius_km: Optional[float] = Query(None, gt=0, le=geo.MAX_RADIUS_KM, description="Only results within this distance of 'near'"),
+    bbox: Optional[str] = Query(None, description="Only results inside 'min_lon,min_lat,max_lon,max_lat'"),
+    tags: Optional[str] = Query(None, description="Comma-separated tags, e.g. 'ghosts,castles'"),
+    tag_mode: Literal["any", "all"] = Query("any", description="Match quests with any or all of the tags"),
+    sort: Literal["newest", "popular", "bookmarked", "trending"] = Query(
+        "newest", description="Result order; results near a point are always sorted by distance"
+    ),
+    selection: Optional[FieldSelection] = Depends(quest_field_selection),
     db: Session = Depends(get_db)
-) -> List[schemas.QuestOut]:    
-    quests = crud_quests.get_quests(
-        db, skip=skip, limit=limit, difficulty_id=difficulty_id,
-        interest_id=interest_id, quest_type_id=quest_type_id, is_public=is_public
-    )
-    return [schemas.QuestOut.model_validate(quest) for quest in quests]
+) -> Response:
+    spatial = geo.SpatialFilter.from_params(near, radius_km, bbox)
+
+    def build() -> CachedResponse:
+        page = crud_quests.get_quests(
+            db, skip=skip, limit=limit, cursor=cursor, difficulty_id=difficulty_id,
+            interest_id=interest_id, quest_type_id=quest_type_id, is_public=is_public,
+            spatial=spatial, tags=crud_tags.parse_tags(tags), tag_mode=tag_mode, sort=sort,
+            selection=selection,
+        )
+        headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+        keys = selection.keys if selection is not None else None
+        quest_tags = tuple(listed_quest_tag(cast(int, quest.id)) for quest in page.items)
+        return CachedResponse(dump_json(schemas.QuestOut, page.items, keys), headers, tags=quest_tags)
+
+    return response_cache.respond(request, ["quests"], build)
+
+@router.get("/facets/", response_model=schemas.QuestFacets)
+def get_quest_facets(
+    request: Request,
+    difficulty_id: Optional[int] = Query(None),
+    interest_id: Optional[int] = Query(None),
+    quest_type_id: Optional[int] = Query(None),
+    is_public: Optional[bool] = Query(None),
+    tags: Optional[str] = Query(None, description="Comma-separated tags, e.g. 'ghosts,castles'"),
+    tag_mode: Literal["any", "all"] = Query("any", description="Match quests with any or all of the tags"),
+    db: Session = Depends(get_db)
+) -> Response:
+    """Count the quests matching the filters per tag, difficulty, interest and quest type"""
+    def build() -> CachedResponse:
+        facets = crud_quests.get_quest_facets(
+            db, difficulty_id=difficulty_id, interest_id=interest_id, quest_type_id=quest_type_id,
+            is_public=is_public, tags=crud_tags.parse_tags(tags), tag_mode=tag_mode,
+        )
+        return CachedResponse(schemas.QuestFacets.model_validate(facets).model_dump_json().encode())
+
+    return response_cache.respond(request, ["quests"], build)
+
+@router.get("/search/", response_model=List[schemas.QuestSearchHit])
+def search_quests(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in the name, tags, synopsis, lore or quest giver"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    db: Session = Depends(get_db)
+) -> Response:
+    """Search quests, best matches first, with the matching words highlighted"""
+    def build() -> CachedResponse:
+        page = crud_quests.search_quests(db, q=q, limit=limit, cursor=cursor)
+        project_quest = projector(schemas.QuestOut)
+        hits = [
+            {
+                "quest": project_quest(row.Quest),
+                "rank": float(row.rank),
+                "highlights": search.highlights_from(row._asdict()),
+            }
+            for row in page.items
+        ]
+        headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+        quest_tags = tuple(listed_quest_tag(row.Quest.id) for row in page.items)
+        return CachedResponse(dumps(hits), headers, tags=quest_tags)
+
+    return response_cache.respond(request, ["quests"], build)
 
 @router.get("/bookmarked/", response_model=List[schemas.QuestOut])
 def get_bookmarked_quests(
     current_user: schemas.UserOut = Depends(get_current_user),
     db: Session = Depends(get_db)
-) -> List[schemas.QuestOut]:
+) -> Response:
     """Get all quests bookmarked by the current user"""
     try:
         bookmarked_quests = crud_quests.get_user_bookmarked_quests(db, user_id=current_user.id)
-        return [schemas.QuestOut.model_validate(quest) for quest in bookmarked_quests]
-    except Exception as e:
-        print(f"Error in get_bookmarked_quests: {e}")  # Debug logging
-        raise HTTPException(status_code=500, detail=str(e))
+        return json_response(dump_json(schemas.QuestOut, bookmarked_quests))
+    except Exception:
+        # The details go to the log, not to the client
+        logger.exception("Loading bookmarked quests failed for user %s", current_user.id)
+        raise HTTPException(status_code=500, detail="Could not load bookmarked quests")
 
 @router.get("/{quest_id}/", response_model=schemas.QuestOut)
-def get_quest(quest_id: int, db: Session = Depends(get_db)) -> schemas.QuestOut:
-    quest = crud_quests.get_quest(db, quest_id=quest_id) # Changed
-    if not quest:
-        raise HTTPException(status_code=404, detail="Quest not found")
-    return schemas.QuestOut.model_validate(quest)
+def get_quest(
+    quest_id: int,
+    request: Request,
+    selection: Optional[FieldSelection] = Depends(quest_field_selection),
+    db: Session = Depends(get_db)
+) -> Response:
+    def build() -> CachedResponse:
+        quest = crud_quests.get_quest(db, quest_id=quest_id, selection=selection) # Changed
+        if not quest:
+            raise HTTPException(status_code=404, detail="Quest not found")
+        keys = selection.keys if selection is not None else None
+        headers = entity_headers(request, schemas.QuestOut, quest, QUEST_CACHE_CONTROL, keys)
+        return CachedResponse(dump_one_json(schemas.QuestOut, quest, keys), headers)
+
+    return response_cache.respond(request, [f"quest:{quest_id}", "quests:embedded"], build)
 
 @router.post("/", response_model=schemas.QuestOut)
 def create_quest(
@@ -52,7 +162,119 @@ def create_quest(
     new_quest = crud_quests.create_quest(db, quest_data, current_user.id)
     db.commit()
     db.refresh(new_quest)
-    return schemas.QuestOut.model_validate(new_quest)
+    return quest_out(new_quest)
+
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/jsonl", "application/json-seq"}
+
+ParsedImport = Tuple[List[Tuple[int, schemas.QuestImportRow]], List[schemas.QuestImportError]]
+
+def _parse_import_row(index: int, data: Any, parsed: ParsedImport) -> None:
+    if index >= settings.QUEST_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.QUEST_IMPORT_MAX_ROWS} quests can be imported at once"
+        )
+    rows, errors = parsed
+    try:
+        rows.append((index, schemas.QuestImportRow.model_validate(data)))
+    except ValidationError as exc:
+        messages = [
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+            for error in exc.errors()
+        ]
+        errors.append(schemas.QuestImportError(row=index, errors=messages))
+
+def _parse_ndjson_line(index: int, line: bytes, parsed: ParsedImport) -> int:
+    """Parse one NDJSON line as row ``index``; return the next row's index."""
+    if not line.strip():
+        return index
+    try:
+        data = json.loads(line)
+    except ValueError:
+        parsed[1].append(schemas.QuestImportError(row=index, errors=["Invalid JSON"]))
+    else:
+        _parse_import_row(index, data, parsed)
+    return index + 1
+
+def _import_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413, detail=f"Bulk imports are limited to {settings.QUEST_IMPORT_MAX_BYTES} bytes"
+    )
+
+async def _import_chunks(request: Request) -> AsyncIterator[bytes]:
+    """The request body as it streams in, refused once it exceeds ``QUEST_IMPORT_MAX_BYTES``."""
+    try:
+        declared = int(request.headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if declared > settings.QUEST_IMPORT_MAX_BYTES:
+        raise _import_too_large()
+    # Content-Length is absent from chunked bodies, and not to be trusted anyway
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > settings.QUEST_IMPORT_MAX_BYTES:
+            raise _import_too_large()
+        yield chunk
+
+async def quest_import_rows(
+    request: Request, current_user: schemas.UserOut = Depends(get_current_user)
+) -> ParsedImport:
+    """
+    Read and validate a bulk import body: a JSON array, or NDJSON (one quest
+    per line) which is parsed as it streams in. The caller is authenticated
+    before any of the body is read.
+    """
+    parsed: ParsedImport = ([], [])
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        index, pending = 0, b""
+        async for chunk in _import_chunks(request):
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                index = _parse_ndjson_line(index, line, parsed)
+        _parse_ndjson_line(index, pending, parsed)
+        return parsed
+
+    try:
+        items = json.loads(b"".join([chunk async for chunk in _import_chunks(request)]))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body is not valid JSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of quests")
+    for index, item in enumerate(items):
+        _parse_import_row(index, item, parsed)
+    return parsed
+
+@router.post("/bulk/", response_model=schemas.QuestImportResult, status_code=201)
+def bulk_create_quests(
+    mode: Literal["atomic", "partial"] = Query(
+        "atomic", description="atomic: import nothing if any row fails; partial: import the valid rows"
+    ),
+    current_user: schemas.UserOut = Depends(get_current_user),
+    parsed: ParsedImport = Depends(quest_import_rows),
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Create many quests at once from a JSON array or an NDJSON stream
+    (``Content-Type: application/x-ndjson``). Rows are reported by position;
+    an atomic import with any failing row answers 422 and creates nothing,
+    as does a partial import in which every row failed.
+    """
+    rows, errors = parsed
+    partial = mode == "partial"
+    # Rows that failed to parse still leave the rest checked against the database
+    quest_ids, resolve_errors = crud_quests.bulk_create_quests(
+        db, rows, current_user.id, partial=partial, validate_only=bool(errors) and not partial
+    )
+    errors = sorted(errors + resolve_errors, key=lambda error: error.row)
+    committed = bool(quest_ids)
+    if committed:
+        db.commit()
+    result = schemas.QuestImportResult(
+        committed=committed, created=len(quest_ids), quest_ids=quest_ids, errors=errors
+    )
+    status_code = 422 if errors and not committed else 201
+    return Response(result.model_dump_json(), status_code=status_code, media_type="application/json")
 
 @router.put("/{quest_id}", response_model=schemas.QuestOut)
 def update_quest(
@@ -72,16 +294,15 @@ def update_quest(
     updated_quest = crud_quests.update_quest(db, db_quest=quest, quest_in=quest_data)
     db.commit()
     db.refresh(updated_quest)
-    return schemas.QuestOut.model_validate(updated_quest)
+    return quest_out(updated_quest)
 
 @router.post("/{quest_id}/like/", response_model=schemas.QuestOut)
 def like_quest(quest_id: int, db: Session = Depends(get_db)) -> schemas.QuestOut:
-    quest = crud_quests.like_quest(db, quest_id=quest_id) # Changed
-    if not quest:
+    likes = crud_quests.like_quest(db, quest_id=quest_id) # Changed
+    if likes is None:
         raise HTTPException(status_code=404, detail="Quest not found")
     db.commit()
-    db.refresh(quest)
-    return schemas.QuestOut.model_validate(quest)
+    return quest_out(crud_quests.get_quest(db, quest_id=quest_id))
 
 @router.post("/{quest_id}/bookmark/")
 def bookmark_quest(
@@ -89,16 +310,13 @@ def bookmark_quest(
     current_user: schemas.UserOut = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
-    # Check if already bookmarked
-    existing_bookmark = crud_quests.get_quest_bookmark_by_user_and_quest(db, user_id=current_user.id, quest_id=quest_id)
-    
-    if existing_bookmark:
-        updated_quest = crud_quests.remove_quest_bookmark_for_user(db, user_id=current_user.id, quest_id=quest_id)
-    else:
-        updated_quest = crud_quests.add_quest_bookmark_for_user(db, user_id=current_user.id, quest_id=quest_id)
-    
-    if not updated_quest:
+    # Toggle: adding fails (returns None) if the bookmark already exists
+    bookmarks = crud_quests.add_quest_bookmark_for_user(db, user_id=current_user.id, quest_id=quest_id)
+    user_bookmarked = bookmarks is not None
+    if not user_bookmarked:
+        bookmarks = crud_quests.remove_quest_bookmark_for_user(db, user_id=current_user.id, quest_id=quest_id)
+
+    if bookmarks is None:
         raise HTTPException(status_code=404, detail="Quest not found")
     db.commit()
-    db.refresh(updated_quest)
-    return {"bookmarks": updated_quest.bookmarks, "user_bookmarked": not existing_bookmark}
+    return {"bookmarks": bookmarks, "user_bookmarked": user_bookmarked}
@@ -1,32 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError  # Add this import
+from app.api.routing import DBRoute
+from app.core.conditional import etag_matches
 from app.db.database import get_db
 from app.db import crud_reference_data, schemas # Changed
-from typing import List
+from typing import Callable, List
 
-router = APIRouter()
+router = APIRouter(route_class=DBRoute)
 
-@router.get("/interests", response_model=List[schemas.InterestOut])
-def get_interests(db: Session = Depends(get_db)) -> List[schemas.InterestOut]:
+# Clients may keep the body but must revalidate it with If-None-Match
+CACHE_CONTROL = "public, no-cache"
+
+
+def _reference_response(
+    request: Request,
+    db: Session,
+    pick: Callable[[crud_reference_data.ReferenceSnapshot], crud_reference_data.ReferenceCollection],
+) -> Response:
     try:
-        interests = crud_reference_data.get_interests(db) # Changed
-        return [schemas.InterestOut.model_validate(interest) for interest in interests]
+        collection = pick(crud_reference_data.get_snapshot(db))
     except SQLAlchemyError:
         raise HTTPException(status_code=500, detail="Database error occurred")
 
+    headers = {"ETag": collection.etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request, collection.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=collection.body, media_type="application/json", headers=headers)
+
+
+@router.get("/all", response_model=schemas.ReferenceDataOut)
+def get_all_reference_data(request: Request, db: Session = Depends(get_db)) -> Response:
+    """Interests, difficulties and quest types in one response."""
+    return _reference_response(request, db, lambda snapshot: snapshot.combined)
+
+@router.get("/interests", response_model=List[schemas.InterestOut])
+def get_interests(request: Request, db: Session = Depends(get_db)) -> Response:
+    return _reference_response(request, db, lambda snapshot: snapshot.interests)
+
 @router.get("/difficulties", response_model=List[schemas.DifficultyOut])
-def get_difficulties(db: Session = Depends(get_db)) -> List[schemas.DifficultyOut]:
-    try:
-        difficulties = crud_reference_data.get_difficulties(db) # Changed
-        return [schemas.DifficultyOut.model_validate(difficulty) for difficulty in difficulties]
-    except SQLAlchemyError:
-        raise HTTPException(status_code=500, detail="Database error occurred")
+def get_difficulties(request: Request, db: Session = Depends(get_db)) -> Response:
+    return _reference_response(request, db, lambda snapshot: snapshot.difficulties)
 
 @router.get("/quest-types", response_model=List[schemas.QuestTypeOut])
-def get_quest_types(db: Session = Depends(get_db)) -> List[schemas.QuestTypeOut]:
-    try:
-        quest_types = crud_reference_data.get_quest_types(db) # Changed
-        return [schemas.QuestTypeOut.model_validate(quest_type) for quest_type in quest_types]
-    except SQLAlchemyError:
-        raise HTTPException(status_code=500, detail="Database error occurred")
+def get_quest_types(request: Request, db: Session = Depends(get_db)) -> Response:
+    return _reference_response(request, db, lambda snapshot: snapshot.quest_types)
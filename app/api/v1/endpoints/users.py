@@ -1,20 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
 from sqlalchemy.orm import Session
+from app.api.routing import DBRoute
+from app.api.serialization import dump_json, dump_one_json, dumps, entity_headers, json_response, projector
 from app.db.database import get_db
-from app.db import crud_users, schemas, models, crud_quests
+from app.db import crud_follows, crud_users, schemas, models, crud_quests
+from app.core.conditional import cache_control
 from app.core.security import get_current_user
-from typing import List, cast
+from app.db.pagination import NEXT_CURSOR_HEADER
+from typing import Iterable, List, Optional, cast
 
-router = APIRouter()
+router = APIRouter(route_class=DBRoute)
+
+# Public profiles only; /me/ is per user and never cached
+USER_CACHE_CONTROL = cache_control(shared_max_age=60)
 
 @router.get("/", response_model=List[schemas.UserOut])
 def get_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
     db: Session = Depends(get_db)
-) -> List[schemas.UserOut]:
-    users = crud_users.get_users(db, skip=skip, limit=limit) # Changed
-    return [schemas.UserOut.model_validate(user) for user in users]
+) -> Response:
+    page = crud_users.get_users(db, skip=skip, limit=limit, cursor=cursor)
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    return json_response(dump_json(schemas.UserOut, page.items), headers)
 
 @router.get("/me/", response_model=schemas.UserOut)
 def get_current_user_info(
@@ -37,37 +46,136 @@ def update_current_user(
     db.refresh(updated_user)
     return schemas.UserOut.model_validate(updated_user)
 
+@router.delete("/me/", status_code=204)
+def deactivate_current_user(
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Deactivate the current user's account. Their quests and campaigns stay,
+    but the account can no longer update its profile.
+    """
+    crud_users.deactivate_user(db, current_user)
+    db.commit()
+    return Response(status_code=204)
+
 @router.get("/{user_id}/", response_model=schemas.UserOut)
 def get_user(
+    request: Request,
     user_id: int = Path(..., gt=0, description="The ID of the user to retrieve."),
     db: Session = Depends(get_db)
-) -> schemas.UserOut:
+) -> Response:
     user = crud_users.get_user(db, user_id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return schemas.UserOut.model_validate(user)
+    headers = entity_headers(request, schemas.UserOut, user, USER_CACHE_CONTROL)
+    return json_response(dump_one_json(schemas.UserOut, user), headers)
 
 @router.get("/me/bookmarks/", response_model=List[schemas.QuestOut]) # Assuming you want to return a list of Quests
 def get_my_bookmarked_quests(
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
-) -> List[schemas.QuestOut]:
+) -> Response:
     """
     Retrieve all quests bookmarked by the current user.
     """
     bookmarked_quests = crud_users.get_bookmarked_quests_by_user(db, user_id=cast(int, current_user.id))
-    return [schemas.QuestOut.model_validate(quest) for quest in bookmarked_quests]
+    return json_response(dump_json(schemas.QuestOut, bookmarked_quests))
 
 
 @router.get("/me/quests/", response_model=List[schemas.QuestOut])
 def get_my_quests(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
-) -> List[schemas.QuestOut]:
+) -> Response:
     """
     Retrieve all quests created by the current user.
     """
-    quests = crud_quests.get_quests(db, author_id=cast(int, current_user.id), skip=skip, limit=limit)
-    return [schemas.QuestOut.model_validate(quest) for quest in quests]
\ No newline at end of file
+    page = crud_quests.get_quests(
+        db, author_id=cast(int, current_user.id), skip=skip, limit=limit, cursor=cursor
+    )
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    return json_response(dump_json(schemas.QuestOut, page.items), headers)
+
+
+@router.get("/me/following/", response_model=List[schemas.FollowOut])
+def get_my_following(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Retrieve the users the current user follows, oldest follow first.
+    """
+    page = crud_follows.get_following(
+        db, follower_id=cast(int, current_user.id), skip=skip, limit=limit, cursor=cursor
+    )
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    return json_response(dump_json(schemas.FollowOut, page.items), headers)
+
+
+@router.post("/me/following/", response_model=schemas.FollowOut)
+def follow_user(
+    follow: schemas.FollowCreate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> schemas.FollowOut:
+    """
+    Follow a user: their new quests and campaigns appear in /me/feed/, starting
+    with their latest ones. Following someone twice is not an error.
+    """
+    follower_id = cast(int, current_user.id)
+    if follow.followee_id == follower_id:
+        raise HTTPException(status_code=400, detail="Users cannot follow themselves")
+    if not crud_users.get_user(db, user_id=follow.followee_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    crud_follows.follow_user(db, follower_id, follow.followee_id)
+    db.commit()
+    return schemas.FollowOut.model_validate(crud_follows.get_follow(db, follower_id, follow.followee_id))
+
+
+@router.delete("/me/following/{user_id}/", status_code=204)
+def unfollow_user(
+    user_id: int = Path(..., gt=0, description="The ID of the user to stop following."),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Response:
+    if not crud_follows.unfollow_user(db, cast(int, current_user.id), user_id):
+        raise HTTPException(status_code=404, detail="Not following this user")
+    db.commit()
+    return Response(status_code=204)
+
+
+def _dump_feed(items: Iterable[crud_follows.FeedItem]) -> bytes:
+    project = {"quest": projector(schemas.QuestOut), "campaign": projector(schemas.CampaignOut)}
+    return dumps([
+        {
+            "type": entry.kind,
+            "id": entry.item.id,
+            "created_at": entry.item.created_at,
+            "quest": project["quest"](entry.item) if entry.kind == "quest" else None,
+            "campaign": project["campaign"](entry.item) if entry.kind == "campaign" else None,
+        }
+        for entry in items
+    ])
+
+
+@router.get("/me/feed/", response_model=List[schemas.FeedItemOut])
+def get_my_feed(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Retrieve new public quests and campaigns by the users the current user
+    follows, newest first.
+    """
+    page = crud_follows.get_feed(db, cast(int, current_user.id), limit=limit, cursor=cursor)
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    return json_response(_dump_feed(page.items), headers)
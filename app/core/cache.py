@@ -0,0 +1,337 @@
+"""
+Response cache for read-heavy public endpoints.
+
+Serialised responses are stored under a key derived from the request path and
+query string, together with a set of tags (e.g. ``quests``, ``quest:42``).
+Writes evict by tag rather than by key, so a CRUD function only needs to know
+which entities it touched, not which URLs rendered them.
+
+Two backends are available: Redis, shared by every worker, when
+``settings.REDIS_URL`` is set, and an in-process LRU otherwise.
+"""
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Set, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core import compression
+from app.core.conditional import raise_if_not_modified
+from app.core.config import settings
+from app.db.database import off_loop
+
+logger = logging.getLogger(__name__)
+
+CACHE_STATUS_HEADER = "X-Cache"
+_PENDING_TAGS_KEY = "response_cache_pending_tags"
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class LRUCacheBackend(CacheBackend):
+    """Thread-safe in-process LRU with per-entry expiry and a tag index."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis backend shared by all workers.
+
+    Each tag is a Redis set holding the keys stored under it. Redis errors are
+    logged and treated as misses so an unavailable cache never fails a request.
+    """
+
+    # Tag sets outlive any entry they point at; stale members are harmless
+    TAG_TTL = 24 * 60 * 60
+
+    def __init__(self, client: Any, prefix: str = "advguild:cache:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "advguild:cache:") -> "RedisCacheBackend":
+        import redis
+
+        client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return cls(client, prefix=prefix)
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    @off_loop
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = self.client.get(self.prefix + key)
+        except Exception:
+            logger.warning("Response cache read failed", exc_info=True)
+            return None
+        return value if value is None else bytes(value)
+
+    @off_loop
+    def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]) -> None:
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(self.prefix + key, value, ex=ttl)
+            for tag in tags:
+                pipe.sadd(self._tag_key(tag), key)
+                pipe.expire(self._tag_key(tag), self.TAG_TTL)
+            pipe.execute()
+        except Exception:
+            logger.warning("Response cache write failed", exc_info=True)
+
+    @off_loop
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        try:
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                keys = [self.prefix + member.decode() for member in self.client.smembers(tag_key)]
+                self.client.delete(tag_key, *keys)
+        except Exception:
+            logger.warning("Response cache invalidation failed", exc_info=True)
+
+    @off_loop
+    def clear(self) -> None:
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + "*"))
+            if keys:
+                self.client.delete(*keys)
+        except Exception:
+            logger.warning("Response cache clear failed", exc_info=True)
+
+
+def backend_from_settings(prefix: str = "advguild:cache:") -> Optional[CacheBackend]:
+    """Redis when ``REDIS_URL`` is set, else an in-process LRU; None if caching is off."""
+    if not settings.CACHE_ENABLED:
+        return None
+    if settings.REDIS_URL:
+        return RedisCacheBackend.from_url(settings.REDIS_URL, prefix=prefix)
+    return LRUCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    media_type: str = "application/json"
+    # Tags known only once the body is built, e.g. one per quest on a page;
+    # stored with the entry, not in it
+    tags: Tuple[str, ...] = ()
+
+    def pack(self) -> bytes:
+        meta = json.dumps({"headers": self.headers, "media_type": self.media_type}).encode()
+        return meta + b"\n" + self.body
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "CachedResponse":
+        meta, _, body = data.partition(b"\n")
+        decoded = json.loads(meta)
+        return cls(body=body, headers=decoded["headers"], media_type=decoded["media_type"])
+
+    def to_response(self, status: str) -> Response:
+        headers = {**self.headers, CACHE_STATUS_HEADER: status}
+        return Response(content=self.body, media_type=self.media_type, headers=headers)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class MonitoredCache(Protocol):
+    """What the health endpoint and the metrics read from a cache."""
+
+    backend: Optional[CacheBackend]
+    stats: CacheStats
+
+
+def listed_quest_tag(quest_id: int) -> str:
+    """
+    Tag of the cached list pages that show ``quest_id``. Counter changes
+    evict these instead of every list; ``quest:<id>`` is the quest's own page.
+    """
+    return f"quests:listed:{quest_id}"
+
+
+def _encoded_key(key: str, encoding: compression.Encoding) -> str:
+    """Where the copy of ``key``'s response compressed with ``encoding`` is stored."""
+    return f"{key}|{encoding.name}"
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        backend: Optional[CacheBackend],
+        default_ttl: int = 30,
+        encodings: Optional[Dict[str, compression.Encoding]] = None,
+    ) -> None:
+        self.backend = backend
+        self.default_ttl = default_ttl
+        # Encodings to store compressed copies for; none keeps only plain bodies
+        self.encodings = encodings or {}
+        self.stats = CacheStats()
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCache":
+        encodings = compression.available_encodings() if settings.COMPRESSION_ENABLED else None
+        return cls(backend_from_settings(), default_ttl=settings.CACHE_DEFAULT_TTL_SECONDS, encodings=encodings)
+
+    @staticmethod
+    def key_for(request: Request) -> str:
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{request.method}:{request.url.path}?{query}"
+
+    def respond(
+        self,
+        request: Request,
+        tags: Iterable[str],
+        build: Callable[[], CachedResponse],
+        ttl: Optional[int] = None,
+    ) -> Response:
+        """
+        Serve ``request`` from the cache, or ``build`` it and store the result.
+
+        A response stored with an ``ETag`` or ``Last-Modified`` header answers
+        matching conditional requests with 304.
+
+        For a client accepting one of ``encodings`` the compressed copy is
+        stored too, under its own key, so later hits are not compressed again.
+        """
+        if self.backend is None:
+            return build().to_response("BYPASS")
+
+        key = self.key_for(request)
+        ttl = ttl or self.default_ttl
+        encoding = compression.negotiate(request.headers.get("accept-encoding"), self.encodings)
+
+        cached: Optional[CachedResponse] = None
+        packed = self.backend.get(_encoded_key(key, encoding)) if encoding is not None else None
+        if packed is not None:
+            cached = CachedResponse.unpack(packed)
+        else:
+            packed = self.backend.get(key)
+            if packed is not None:
+                cached = CachedResponse.unpack(packed)
+                if encoding is not None:
+                    # First client with this encoding since the body was cached
+                    cached = compression.compress_cached(cached, encoding)
+                    self.backend.set(_encoded_key(key, encoding), cached.pack(), ttl, tags)
+        if cached is not None:
+            self.stats.hits += 1
+            raise_if_not_modified(request, cached.headers)
+            return cached.to_response("HIT")
+
+        self.stats.misses += 1
+        cached = build()
+        tags = [*tags, *cached.tags]
+        self.backend.set(key, cached.pack(), ttl, tags)
+        if encoding is not None:
+            cached = compression.compress_cached(cached, encoding)
+            self.backend.set(_encoded_key(key, encoding), cached.pack(), ttl, tags)
+        raise_if_not_modified(request, cached.headers)
+        return cached.to_response("MISS")
+
+    def invalidate(self, *tags: str) -> None:
+        if self.backend is not None:
+            self.backend.invalidate_tags(tags)
+
+    def invalidate_on_commit(self, db: Session, *tags: str) -> None:
+        """
+        Evict ``tags`` once ``db`` commits.
+
+        Evicting before the commit would let a concurrent request re-cache the
+        old rows in between; on rollback nothing changed, so nothing is evicted.
+        """
+        db.info.setdefault(_PENDING_TAGS_KEY, set()).update(tags)
+
+    def clear(self) -> None:
+        self.stats = CacheStats()
+        if self.backend is not None:
+            self.backend.clear()
+
+
+response_cache = ResponseCache.from_settings()
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed_tags(session: Session) -> None:
+    tags: List[str] = list(session.info.pop(_PENDING_TAGS_KEY, ()))
+    if tags:
+        response_cache.invalidate(*tags)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_tags(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_TAGS_KEY, None)
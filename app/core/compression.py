@@ -0,0 +1,241 @@
+"""
+Response compression negotiated from ``Accept-Encoding``.
+
+``CompressionMiddleware`` compresses JSON and text responses of at least
+``COMPRESSION_MIN_SIZE`` bytes with the best encoding the client accepts:
+brotli, zstd or gzip, in ``COMPRESSION_ENCODINGS`` order of preference when
+the client weighs them equally. brotli and zstd need the ``brotli`` and
+``zstandard`` packages and are skipped when those are not installed. Streamed
+responses are compressed chunk by chunk.
+
+The response cache stores one compressed copy per encoding next to the
+plain one (``compress_cached``), so a hit is served without compressing
+again; the middleware leaves responses that already have a
+``Content-Encoding`` alone.
+
+Compressed responses get ``Vary: Accept-Encoding``, and a strong ``ETag``
+becomes weak, since the bytes no longer match the identity representation.
+"""
+import gzip
+import zlib
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Protocol, cast
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.core.cache import CachedResponse
+
+try:
+    import brotli  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+# Responses without a body, or whose body must not change
+_UNCOMPRESSED_STATUSES = {204, 206, 304}
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        ...
+
+    def flush(self) -> bytes:
+        ...
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return cast(bytes, self._compressor.process(data))
+
+    def flush(self) -> bytes:
+        return cast(bytes, self._compressor.finish())
+
+
+def _gzip_compressor(level: int) -> Compressor:
+    # wbits=31 writes the gzip header and trailer
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def _zstd_compressor(level: int) -> Compressor:
+    return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+@dataclass(frozen=True)
+class Encoding:
+    name: str
+    level: int
+    compressor: Callable[[int], Compressor]
+
+    def new_compressor(self) -> Compressor:
+        return self.compressor(self.level)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.name == "gzip":
+            # One shot is cheaper than a streaming compressor for a whole body
+            return gzip.compress(data, compresslevel=self.level, mtime=0)
+        compressor = self.new_compressor()
+        return compressor.compress(data) + compressor.flush()
+
+
+def available_encodings() -> Dict[str, Encoding]:
+    """The configured encodings whose libraries are installed, by preference."""
+    known = {"gzip": Encoding("gzip", settings.COMPRESSION_GZIP_LEVEL, _gzip_compressor)}
+    if brotli is not None:
+        known["br"] = Encoding("br", settings.COMPRESSION_BROTLI_QUALITY, _BrotliCompressor)
+    if zstandard is not None:
+        known["zstd"] = Encoding("zstd", settings.COMPRESSION_ZSTD_LEVEL, _zstd_compressor)
+    return {name: known[name] for name in settings.COMPRESSION_ENCODINGS if name in known}
+
+
+def negotiate(accept_encoding: Optional[str], encodings: Mapping[str, Encoding]) -> Optional[Encoding]:
+    """
+    The encoding to use for a request's ``Accept-Encoding``, or None for identity.
+
+    The highest ``q`` wins; ties go to the order of ``encodings``. ``*``
+    stands for every encoding not listed, and ``q=0`` refuses one.
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name:
+            weights[name.strip().lower()] = weight
+    best: Optional[Encoding] = None
+    best_weight = 0.0
+    for name, encoding in encodings.items():
+        weight = weights.get(name, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(status: int, headers: Mapping[str, str], size: Optional[int]) -> bool:
+    """Whether a response is worth compressing; ``size`` is None while it streams."""
+    if status in _UNCOMPRESSED_STATUSES or "content-encoding" in headers:
+        return False
+    if size is not None and size < settings.COMPRESSION_MIN_SIZE:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _encoded_headers(headers: Headers, encoding: Encoding) -> Dict[str, str]:
+    """Headers to set on a response once it is compressed with ``encoding``."""
+    updates = {"Content-Encoding": encoding.name}
+    vary = headers.get("vary")
+    if vary is None:
+        updates["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        updates["Vary"] = f"{vary}, Accept-Encoding"
+    etag = headers.get("etag")
+    if etag is not None and not etag.startswith("W/"):
+        updates["ETag"] = "W/" + etag
+    return updates
+
+
+def compress_cached(cached: "CachedResponse", encoding: Encoding) -> "CachedResponse":
+    """
+    The variant of a cached response to store for ``encoding``: compressed,
+    or unchanged if it is too small or not compressible.
+    """
+    headers = Headers(headers={"content-type": cached.media_type, **cached.headers})
+    if not is_compressible(200, headers, len(cached.body)):
+        return cached
+    updates = _encoded_headers(headers, encoding)
+    replaced = {name.lower() for name in updates}
+    kept = {name: value for name, value in cached.headers.items() if name.lower() not in replaced}
+    return replace(cached, body=encoding.compress(cached.body), headers={**kept, **updates})
+
+
+class CompressionMiddleware:
+    def __init__(self, app: Any, encodings: Optional[Dict[str, Encoding]] = None) -> None:
+        self.app = app
+        self.encodings = available_encodings() if encodings is None else encodings
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressingResponder(self.app, encoding)(scope, receive, send)
+
+
+class _CompressingResponder:
+    """Holds back the response start until the first body chunk shows whether to compress."""
+
+    def __init__(self, app: Any, encoding: Encoding) -> None:
+        self.app = app
+        self.encoding = encoding
+        self.start: Optional[Dict[str, Any]] = None
+        self.compressor: Optional[Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(scope=start)
+            if not is_compressible(start["status"], headers, None if more_body else len(body)):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            for name, value in _encoded_headers(headers, self.encoding).items():
+                headers[name] = value
+            if not more_body:
+                body = self.encoding.compress(body)
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            del headers["Content-Length"]
+            self.compressor = self.encoding.new_compressor()
+            await self.send(start)
+
+        assert self.compressor is not None
+        chunks: List[bytes] = [self.compressor.compress(body)]
+        if not more_body:
+            chunks.append(self.compressor.flush())
+        await self.send({"type": "http.response.body", "body": b"".join(chunks), "more_body": more_body})
@@ -0,0 +1,56 @@
+"""
+HTTP conditional requests and caching policies.
+
+Entity endpoints compute their ``ETag`` and ``Last-Modified`` from the loaded
+rows (``app.api.serialization.entity_validators``) and call
+``raise_if_not_modified`` before rendering anything, so a matching
+``If-None-Match`` / ``If-Modified-Since`` is answered with 304 without
+serialising the body. The response cache does the same for the validators
+stored with a cached body.
+"""
+from email.utils import parsedate_to_datetime
+from typing import Mapping
+
+from fastapi import HTTPException, Request
+
+# Validator and caching headers repeated on a 304
+NOT_MODIFIED_HEADERS = ("ETag", "Last-Modified", "Cache-Control", "Vary")
+
+
+def cache_control(shared_max_age: int) -> str:
+    """
+    A policy for public entity responses: shared caches (the CDN) may serve
+    them for ``shared_max_age`` seconds, browsers revalidate every time.
+    """
+    return f"public, max-age=0, s-maxage={shared_max_age}, stale-while-revalidate={shared_max_age}"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    # If-None-Match uses the weak comparison, so a W/ prefix still matches
+    candidates = [candidate.strip().removeprefix("W/") for candidate in header.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def not_modified(request: Request, headers: Mapping[str, str]) -> bool:
+    """Whether ``request``'s preconditions match a response with these ``headers``."""
+    etag = headers.get("ETag")
+    if etag is not None and "if-none-match" in request.headers:
+        # If-Modified-Since is ignored when If-None-Match is present
+        return etag_matches(request, etag)
+    last_modified, since = headers.get("Last-Modified"), request.headers.get("if-modified-since")
+    if last_modified is None or since is None:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(since)
+    except (TypeError, ValueError):
+        return False
+
+
+def raise_if_not_modified(request: Request, headers: Mapping[str, str]) -> None:
+    if request.method in ("GET", "HEAD") and not_modified(request, headers):
+        raise HTTPException(
+            status_code=304, headers={name: headers[name] for name in NOT_MODIFIED_HEADERS if name in headers}
+        )
@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,6 +11,16 @@ class Settings(BaseSettings):
     # if the DATABASE_URL environment variable is not set, which is a clearer
     # error than the one you encountered.
     DATABASE_URL: str
+    # Serve endpoints on an AsyncSession (asyncpg/aiosqlite) instead of the threadpool
+    DATABASE_ASYNC: bool = False
+    # Connection pool, per worker process and per engine (sync and async)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # PostgreSQL statement_timeout for every connection; unset means no limit
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -21,7 +31,46 @@ class Settings(BaseSettings):
     BACKEND_CORS_ORIGINS: List[str] = ["https://adv-guild.com", "https://www.adv-guild.com",
                                        'http://localhost:5173',
                                         "http://localhost:3000", "http://localhost:8080"]
-    REDIS_URL: str = "redis://localhost:6379"
+    # bcrypt runs in this many worker processes (0 hashes in the request thread);
+    # requests beyond MAX_PENDING outstanding hashes get a 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+    # When unset, caches fall back to per-process memory instead of Redis
+    REDIS_URL: Optional[str] = None
+    CACHE_ENABLED: bool = True
+    CACHE_DEFAULT_TTL_SECONDS: int = 30
+    CACHE_MAX_ENTRIES: int = 1024
+    # Buffer likes (in Redis if REDIS_URL is set) and write them in batches
+    LIKE_BUFFER_ENABLED: bool = False
+    LIKE_FLUSH_INTERVAL_SECONDS: float = 2.0
+    # Largest number of quests one POST /quests/bulk/ may create
+    QUEST_IMPORT_MAX_ROWS: int = 1000
+    # Larger bulk import bodies are refused (413) before any of them is parsed
+    QUEST_IMPORT_MAX_BYTES: int = 10 * 1024 * 1024
+    # How quickly likes and bookmarks stop counting towards sort=trending
+    TRENDING_HALF_LIFE_HOURS: float = 24.0
+    # Timelines keep this many feed entries per user; authors with at least
+    # FANOUT_MAX_FOLLOWERS followers are read at feed time instead of pushed
+    FEED_MAX_ENTRIES: int = 500
+    FEED_FANOUT_MAX_FOLLOWERS: int = 10000
+    # How often table-backed timelines are trimmed back to FEED_MAX_ENTRIES
+    FEED_TRIM_INTERVAL_SECONDS: float = 300.0
+    # Serve Prometheus metrics at /metrics; set PROMETHEUS_MULTIPROC_DIR under gunicorn
+    METRICS_ENABLED: bool = True
+    # Count and time SQL statements per request (Server-Timing header, app.requests log)
+    QUERY_STATS_ENABLED: bool = True
+    # Statements at least this slow are logged to app.db.slow_queries; unset disables
+    SLOW_QUERY_THRESHOLD_MS: Optional[float] = 200
+    # Authenticated users are re-read from the database at least this often
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    # Compress responses of at least MIN_SIZE bytes with the first of ENCODINGS
+    # the client accepts; br and zstd need the brotli and zstandard packages
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_ENCODINGS: List[str] = ["br", "zstd", "gzip"]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
 
     # This controls how settings are loaded.
     model_config = SettingsConfigDict(
@@ -1,31 +1,166 @@
+"""
+Password hashing, the single place that owns the bcrypt context.
+
+bcrypt costs roughly 250ms of CPU per hash or verification. Running that in
+the request's thread lets a burst of logins starve every other request of the
+worker, so the work is sent to a small dedicated process pool instead. The
+pool accepts at most ``PASSWORD_HASH_MAX_PENDING`` outstanding jobs; beyond
+that ``PasswordHashingBusyError`` is raised (served as a 503) rather than
+letting the backlog grow without bound.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
 from passlib.context import CryptContext
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+
+from app.core.config import settings
+
+T = TypeVar("T")
 
 # Create password context for hashing and verification
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+class PasswordHashingBusyError(RuntimeError):
+    """Raised when the hashing pool already has its maximum of pending jobs."""
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Bounded process pool for bcrypt.
+
+    With ``workers=0`` hashing runs in the calling thread and is not limited,
+    which suits scripts and tests.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self) -> None:
+        """Create the worker processes; otherwise they start on first use."""
+        with self._lock:
+            if self._executor is None and self.workers > 0:
+                # Spawned rather than forked: the parent runs threads and an event loop
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _release(self, future: "Future[Any]") -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        self.start()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordHashingBusyError("Password hashing is at capacity")
+            assert self._executor is not None
+            self._pending += 1
+            try:
+                future = self._executor.submit(fn, *args)
+            except BaseException:
+                self._pending -= 1
+                raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.workers == 0:
+            return fn(*args)
+        future = self._submit(fn, *args)
+        if in_greenlet():
+            # Called from AsyncSession.run_sync: yield to the event loop while waiting
+            return await_only(asyncio.wrap_future(future))
+        return future.result()
+
+    async def _run_async(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.workers == 0:
+            return await asyncio.to_thread(fn, *args)
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(_verify, plain_password, hashed_password)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(_hash, password)
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run_async(_verify, plain_password, hashed_password)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS, max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
 def get_password_hash(password: str) -> str:
     """
     Hash a password using bcrypt.
-    
+
     Args:
         password: Plain text password to hash
-        
+
     Returns:
         Hashed password string
+
+    Raises:
+        PasswordHashingBusyError: If the hashing pool is saturated
     """
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against its hash.
-    
+
     Args:
         plain_password: Plain text password to verify
         hashed_password: Hashed password to verify against
-        
+
     Returns:
         True if password matches, False otherwise
+
+    Raises:
+        PasswordHashingBusyError: If the hashing pool is saturated
     """
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return password_hasher.verify(plain_password, hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Like ``verify_password``, for coroutines that must not block the event loop."""
+    return await password_hasher.verify_async(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Like ``get_password_hash``, for coroutines that must not block the event loop."""
+    return await password_hasher.hash_async(password)
@@ -0,0 +1,136 @@
+"""
+Prometheus metrics, served at ``/metrics``.
+
+Under gunicorn each worker is a separate process. When the
+``PROMETHEUS_MULTIPROC_DIR`` environment variable names a directory (see
+``gunicorn.conf.py``), prometheus_client keeps every metric in memory-mapped
+files there and ``/metrics`` aggregates all workers' files, whichever worker
+serves the scrape. Without it, the metrics are those of the single process.
+
+``MetricsMiddleware`` observes every request: a latency histogram by route
+template and status, and an in-flight gauge. Pool, cache and password
+hashing numbers are kept by their own modules; ``refresh_process_gauges``
+copies them into metrics, at most once per ``PROCESS_GAUGE_INTERVAL_SECONDS``
+per worker, so that a scrape sees every worker's recent values. Running
+totals become counters, advanced by what changed since the last copy, so
+``rate()`` works on them and a restarted worker's totals are not lost.
+"""
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.core.cache import MonitoredCache, response_cache
+from app.core.hashing import password_hasher
+from app.core.principal_cache import principal_cache
+from app.db.pool import pool_status
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+PROCESS_GAUGE_INTERVAL_SECONDS = 1.0
+# Requests that matched no route share one label value
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, by route template.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests being served.",
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Connections per state (checked_out, checked_in, overflow) and engine.",
+    ["engine", "state"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT_SECONDS = Counter(
+    "db_pool_wait_seconds",
+    "Time checkouts waited for a connection.",
+    ["engine"],
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts",
+    "Checkouts that gave up waiting for a connection.",
+    ["engine"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests",
+    "Cache lookups by cache and result (hit, miss).",
+    ["cache", "result"],
+)
+PASSWORD_HASH_PENDING = Gauge(
+    "password_hash_pending",
+    "bcrypt jobs queued or running.",
+    multiprocess_mode="livesum",
+)
+
+_engines: Dict[str, Any] = {}
+_caches: Dict[str, MonitoredCache] = {
+    "responses": response_cache,
+    "principals": principal_cache,
+}
+_refreshed_at = float("-inf")
+# The running totals already added to each counter, by counter and labels
+_exported: Dict[Tuple[Counter, Tuple[str, ...]], float] = {}
+
+
+def register_engine(name: str, engine: Any) -> None:
+    """Report ``engine``'s pool under ``name``."""
+    _engines[name] = engine
+
+
+def _advance(counter: Counter, labels: Tuple[str, ...], total: float) -> None:
+    """Add to ``counter`` what this worker's running ``total`` grew by."""
+    previous = _exported.get((counter, labels), 0.0)
+    # A smaller total was reset, e.g. by clearing the cache, and counts from 0
+    counter.labels(*labels).inc(total - previous if total >= previous else total)
+    _exported[(counter, labels)] = total
+
+
+def refresh_process_gauges(force: bool = False) -> None:
+    """Copy this worker's pool, cache and hashing numbers into their gauges."""
+    global _refreshed_at
+    now = time.monotonic()
+    if not force and now - _refreshed_at < PROCESS_GAUGE_INTERVAL_SECONDS:
+        return
+    _refreshed_at = now
+
+    for name, engine in _engines.items():
+        status = pool_status(engine)
+        for state in ("checked_out", "checked_in", "overflow"):
+            if state in status:
+                DB_POOL_CONNECTIONS.labels(name, state).set(status[state])
+        if "wait" in status:
+            wait = status["wait"]
+            _advance(DB_POOL_WAIT_SECONDS, (name,), wait["wait_seconds_total"])
+            _advance(DB_POOL_TIMEOUTS, (name,), wait["timeouts"])
+    for name, cache in _caches.items():
+        _advance(CACHE_REQUESTS, (name, "hit"), cache.stats.hits)
+        _advance(CACHE_REQUESTS, (name, "miss"), cache.stats.misses)
+    PASSWORD_HASH_PENDING.set(password_hasher.pending)
+
+
+def render(registry: Optional[CollectorRegistry] = None) -> bytes:
+    """The exposition text for a scrape, across all workers in multiprocess mode."""
+    refresh_process_gauges(force=True)
+    if registry is None:
+        if MULTIPROCESS:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+    return generate_latest(registry)
@@ -0,0 +1,111 @@
+"""
+ASGI middleware measuring requests.
+
+``MetricsMiddleware`` feeds the Prometheus metrics in ``app.core.metrics``.
+
+``QueryStatsMiddleware`` runs every HTTP request inside
+``query_stats.track_queries()``. The response gets a ``Server-Timing``
+header (shown by browser dev tools) with the statement count, the time
+spent in the database and in the whole request, and the same numbers plus
+the slowest statement are logged to ``app.requests`` at INFO, as fields of
+the log record for structured handlers.
+"""
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, MutableMapping
+
+from app.core import metrics
+from app.db.query_stats import QueryStats, track_queries
+
+logger = logging.getLogger("app.requests")
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+def server_timing(stats: QueryStats, total_seconds: float) -> str:
+    return (
+        f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries", '
+        f"db-slowest;dur={stats.slowest_seconds * 1000:.2f}, "
+        f"total;dur={total_seconds * 1000:.2f}"
+    )
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status: Dict[str, int] = {}
+
+        with track_queries() as stats:
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    status["code"] = message["status"]
+                    headers = list(message.get("headers", []))
+                    timing = server_timing(stats, time.perf_counter() - started)
+                    headers.append((b"server-timing", timing.encode("latin-1")))
+                    message["headers"] = headers
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        # Logged after the body is sent, so streamed responses are counted in full
+        duration_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            "%s %s %s %.1fms queries=%d db=%.1fms",
+            scope["method"],
+            scope["path"],
+            status.get("code"),
+            duration_ms,
+            stats.count,
+            stats.seconds * 1000,
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status.get("code"),
+                "duration_ms": round(duration_ms, 2),
+                "query_count": stats.count,
+                "db_ms": round(stats.seconds * 1000, 2),
+                "slowest_query_ms": round(stats.slowest_seconds * 1000, 2),
+                "slowest_statement": stats.slowest_statement,
+            },
+        )
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status: Dict[str, int] = {"code": 500}
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        metrics.REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.REQUESTS_IN_FLIGHT.dec()
+            # FastAPI puts the matched route in the scope; its template keeps label values few
+            route = scope.get("route")
+            metrics.REQUEST_DURATION.labels(
+                scope["method"], getattr(route, "path", metrics.UNMATCHED_ROUTE), str(status["code"])
+            ).observe(time.perf_counter() - started)
+            metrics.refresh_process_gauges()
@@ -1,12 +1,4 @@
-from passlib.context import CryptContext
+# Kept for existing imports; hashing lives in app.core.hashing
+from app.core.hashing import get_password_hash, verify_password
 
-# Use bcrypt for password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
\ No newline at end of file
+__all__ = ["get_password_hash", "verify_password"]
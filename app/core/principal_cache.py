@@ -0,0 +1,114 @@
+"""
+Short-lived cache of authenticated users, keyed by the JWT ``sub`` (email).
+
+``get_current_user`` otherwise looks the user up on every authenticated
+request. Cached entries hold the user's columns (never the password hash) and
+are turned back into a ``User`` attached to the request's session without a
+query. ``crud_users`` evicts a user when a profile update or deactivation
+commits; the TTL bounds how long another worker's in-process LRU can serve a
+stale entry when Redis is not configured.
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import DateTime, event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.cache import CacheBackend, CacheStats, backend_from_settings
+from app.core.config import settings
+from app.db import models
+
+_PENDING_USERS_KEY = "principal_cache_pending_users"
+# Never leaves the database, and is loaded on access if anything needs it
+_EXCLUDED_COLUMNS = {"hashed_password"}
+
+
+class PrincipalCache:
+    def __init__(self, backend: Optional[CacheBackend], ttl: int = 60) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    @classmethod
+    def from_settings(cls) -> "PrincipalCache":
+        return cls(
+            backend_from_settings(prefix="advguild:principal:"),
+            ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        )
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return f"user:{email}"
+
+    @staticmethod
+    def _tag(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def _dump(user: models.User) -> bytes:
+        values: Dict[str, Any] = {}
+        for column in models.User.__table__.columns:
+            if column.key in _EXCLUDED_COLUMNS:
+                continue
+            value = getattr(user, column.key)
+            values[column.key] = value.isoformat() if isinstance(value, datetime) else value
+        return json.dumps(values).encode()
+
+    @staticmethod
+    def _load(data: bytes) -> models.User:
+        values = json.loads(data)
+        for column in models.User.__table__.columns:
+            if isinstance(column.type, DateTime) and values.get(column.key) is not None:
+                values[column.key] = datetime.fromisoformat(values[column.key])
+        return models.User(**values)
+
+    def get(self, db: Session, email: str) -> Optional[models.User]:
+        """Return the cached user attached to ``db``, or None on a miss."""
+        if self.backend is None:
+            return None
+        data = self.backend.get(self._key(email))
+        if data is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        user = self._load(data)
+        # Persistent without a SELECT; relationships still lazy-load from ``db``
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def put(self, user: models.User) -> None:
+        if self.backend is not None:
+            self.backend.set(
+                self._key(user.email),  # type: ignore [arg-type]
+                self._dump(user),
+                self.ttl,
+                [self._tag(user.id)],  # type: ignore [arg-type]
+            )
+
+    def invalidate(self, user_id: int) -> None:
+        if self.backend is not None:
+            self.backend.invalidate_tags([self._tag(user_id)])
+
+    def invalidate_on_commit(self, db: Session, user_id: int) -> None:
+        """Evict ``user_id`` once ``db`` commits, so no request re-caches the old row."""
+        db.info.setdefault(_PENDING_USERS_KEY, set()).add(user_id)
+
+    def clear(self) -> None:
+        self.stats = CacheStats()
+        if self.backend is not None:
+            self.backend.clear()
+
+
+principal_cache = PrincipalCache.from_settings()
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed_users(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_USERS_KEY, ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_users(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_USERS_KEY, None)
@@ -4,30 +4,18 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.hashing import get_password_hash, verify_password  # noqa: F401
+from app.core.principal_cache import principal_cache
 from app.db import crud_users, models, schemas
-from app.db.database import get_db
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.db.database import db_mode, get_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password: str) -> str:
-    """Generate password hash."""
-    return pwd_context.hash(password)
-
-
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -43,6 +31,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+@db_mode
 def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
 ) -> models.User:
@@ -66,7 +55,10 @@ def get_current_user(
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired")
     except (JWTError, ValidationError):
         raise credentials_exception
-    user = crud_users.get_user_by_email(db, email=token_data.email)
+    user = principal_cache.get(db, token_data.email)
     if user is None:
-        raise credentials_exception
+        user = crud_users.get_user_by_email(db, email=token_data.email)
+        if user is None:
+            raise credentials_exception
+        principal_cache.put(user)
     return user
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+Async counterparts of the ``crud_*`` modules.
+
+Each facade exposes the functions of one CRUD module as coroutines taking an
+``AsyncSession``. The call runs the sync implementation through
+``AsyncSession.run_sync``, so both modes share one set of queries::
+
+    quest = await async_crud_quests.get_quest(db, quest_id=42)
+
+Endpoints do not use these: ``DBRoute`` wraps a whole sync endpoint with
+``database.run_on_async_session`` instead. The facades are for coroutines
+that hold an ``AsyncSession`` of their own.
+"""
+import inspect
+from types import ModuleType
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import (
+    crud_campaigns,
+    crud_locations,
+    crud_quests,
+    crud_reference_data,
+    crud_users,
+)
+
+
+class AsyncCrud:
+    def __init__(self, module: ModuleType) -> None:
+        self._module = module
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        fn = getattr(self._module, name)
+        # Only the module's own public functions, not whatever it imported
+        if (
+            name.startswith("_")
+            or not inspect.isfunction(fn)
+            or fn.__module__ != self._module.__name__
+        ):
+            raise AttributeError(name)
+
+        async def call(db: AsyncSession, *args: Any, **kwargs: Any) -> Any:
+            return await db.run_sync(fn, *args, **kwargs)
+
+        call.__name__ = call.__qualname__ = name
+        call.__doc__ = fn.__doc__
+        return call
+
+    def __repr__(self) -> str:
+        return f"AsyncCrud({self._module.__name__})"
+
+
+async_crud_campaigns = AsyncCrud(crud_campaigns)
+async_crud_locations = AsyncCrud(crud_locations)
+async_crud_quests = AsyncCrud(crud_quests)
+async_crud_reference_data = AsyncCrud(crud_reference_data)
+async_crud_users = AsyncCrud(crud_users)
@@ -1,21 +1,33 @@
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.orm import Session, joinedload
+from typing import Optional
+from app.core.cache import response_cache
+from app.db import feed
 from app.db.models import Campaign
+from app.db.pagination import Page, paginate
 from app.db.schemas import CampaignCreate, CampaignUpdate
 
 
 def create_campaign(db: Session, campaign: CampaignCreate, author_id: int) -> Campaign:
     db_campaign = Campaign(**campaign.model_dump(), author_id=author_id)
     db.add(db_campaign)
+    db.flush()  # Feed entries need the campaign's id
+    feed.publish(db, "campaign", [db_campaign.id])  # type: ignore [list-item]
+    response_cache.invalidate_on_commit(db, "campaigns")
     return db_campaign
 
 
-def get_campaigns(db: Session, skip: int = 0, limit: int = 100) -> List[Campaign]:
-    return db.query(Campaign).offset(skip).limit(limit).all()
+def get_campaigns(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Page[Campaign]:
+    return paginate(
+        # CampaignOut embeds the author; load it with the page, not per campaign
+        db.query(Campaign).options(joinedload(Campaign.author)),
+        [Campaign.created_at, Campaign.id], limit=limit, skip=skip, cursor=cursor
+    )
 
 
 def get_campaign(db: Session, campaign_id: int) -> Campaign | None:
-    return db.query(Campaign).filter(Campaign.id == campaign_id).first()
+    return db.query(Campaign).options(joinedload(Campaign.author)).filter(Campaign.id == campaign_id).first()
 
 
 def update_campaign(db: Session, db_campaign: Campaign, campaign_data: CampaignUpdate) -> Campaign:
@@ -23,6 +35,8 @@ def update_campaign(db: Session, db_campaign: Campaign, campaign_data: CampaignU
     for key, value in update_data.items():
         setattr(db_campaign, key, value)
     db.add(db_campaign)
+    # Quests embed their campaign
+    response_cache.invalidate_on_commit(db, "campaigns", "quests", "quests:embedded")
     return db_campaign
 
 
@@ -30,5 +44,6 @@ def delete_campaign(db: Session, campaign_id: int) -> bool:
     db_campaign = get_campaign(db, campaign_id)
     if db_campaign:
         db.delete(db_campaign)
+        response_cache.invalidate_on_commit(db, "campaigns", "quests", "quests:embedded")
         return True
     return False
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Follows between users, and the feed of what the users someone follows create.
+
+The feed is precomputed per follower by ``app.db.feed``; ``get_feed`` merges
+a page of the reader's timeline with the newest items of widely followed
+authors, which are not pushed, and loads the items for that page only.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, cast
+
+from sqlalchemy import Table, delete, update
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.sql.dml import Update
+
+from app.db import feed
+from app.db.crud_quests import QUEST_OUT_OPTIONS
+from app.db.database import dialect_insert
+from app.db.models import Campaign, Follow, Quest, User
+from app.db.pagination import Page, paginate
+
+# Counter statements target the tables directly, like crud_quests'
+follows_table = cast(Table, Follow.__table__)
+users_table = cast(Table, User.__table__)
+
+
+@dataclass
+class FeedItem:
+    kind: str
+    item: Any  # A Quest or a Campaign, loaded for rendering
+
+
+def get_follow(db: Session, follower_id: int, followee_id: int) -> Optional[Follow]:
+    return (
+        db.query(Follow)
+        .options(joinedload(Follow.followee))
+        .filter(Follow.follower_id == follower_id, Follow.followee_id == followee_id)
+        .first()
+    )
+
+
+def get_following(
+    db: Session,
+    follower_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Page[Follow]:
+    return paginate(
+        db.query(Follow)
+        .options(joinedload(Follow.followee))
+        .filter(Follow.follower_id == follower_id),
+        [Follow.created_at, Follow.id],
+        limit=limit,
+        skip=skip,
+        cursor=cursor,
+    )
+
+
+def _adjust_followers(user_id: int, delta: int) -> Update:
+    return (
+        update(users_table)
+        .where(users_table.c.id == user_id)
+        .values(follower_count=users_table.c.follower_count + delta)
+    )
+
+
+def follow_user(db: Session, follower_id: int, followee_id: int) -> bool:
+    """
+    Make ``follower_id`` follow ``followee_id`` and backfill their newest
+    items into the follower's feed; False if already following. The caller
+    commits.
+    """
+    created = db.execute(
+        dialect_insert(db)(follows_table)
+        .values(follower_id=follower_id, followee_id=followee_id)
+        .on_conflict_do_nothing(index_elements=["follower_id", "followee_id"])
+        .returning(follows_table.c.id)
+    ).first()
+    if created is None:
+        return False
+    db.execute(_adjust_followers(followee_id, 1))
+    feed.backfill(db, follower_id, followee_id)
+    return True
+
+
+def unfollow_user(db: Session, follower_id: int, followee_id: int) -> bool:
+    """Unfollow, dropping the followee's items from the feed; False if not following."""
+    deleted = db.execute(
+        delete(follows_table).where(
+            follows_table.c.follower_id == follower_id,
+            follows_table.c.followee_id == followee_id,
+        )
+    ).rowcount
+    if not deleted:
+        return False
+    db.execute(_adjust_followers(followee_id, -1))
+    feed.forget_author(db, follower_id, followee_id)
+    return True
+
+
+def _load_items(db: Session, entries: List[feed.TimelineItem]) -> List[FeedItem]:
+    ids: Dict[str, List[int]] = {kind: [] for kind in feed.FEED_KINDS}
+    for entry in entries:
+        ids[entry.kind].append(entry.item_id)
+    # Items deleted or made private since they were pushed are left out
+    loaded: Dict[str, Dict[int, Any]] = {
+        "quest": (
+            {
+                int(quest.id): quest
+                for quest in db.query(Quest)
+                .options(*QUEST_OUT_OPTIONS)
+                .filter(Quest.id.in_(ids["quest"]), Quest.is_public.is_not(False))
+            }
+            if ids["quest"]
+            else {}
+        ),
+        "campaign": (
+            {
+                int(campaign.id): campaign
+                for campaign in db.query(Campaign)
+                .options(joinedload(Campaign.author))
+                .filter(
+                    Campaign.id.in_(ids["campaign"]), Campaign.is_public.is_not(False)
+                )
+            }
+            if ids["campaign"]
+            else {}
+        ),
+    }
+    return [
+        FeedItem(entry.kind, loaded[entry.kind][entry.item_id])
+        for entry in entries
+        if entry.item_id in loaded[entry.kind]
+    ]
+
+
+def get_feed(
+    db: Session, user_id: int, limit: int = 20, cursor: Optional[str] = None
+) -> Page[FeedItem]:
+    """
+    New public quests and campaigns by the users ``user_id`` follows, newest
+    first. A page may come back short when items were deleted or made
+    private after they reached the timeline.
+    """
+    after = feed.decode_feed_cursor(cursor) if cursor else None
+    sources = [feed.timeline_store.page(db, user_id, limit, cursor)]
+    pulled = feed.pulled_authors(db, user_id)
+    if pulled:
+        sources.extend(
+            feed.pull(db, kind, pulled, limit, after) for kind in feed.FEED_KINDS
+        )
+
+    entries: Dict[Any, feed.TimelineItem] = {}
+    for source in sources:
+        for entry in source.items:
+            entries.setdefault((entry.kind, entry.item_id), entry)
+    ordered = sorted(entries.values(), key=lambda entry: entry.key, reverse=True)
+    more = len(ordered) > limit or any(source.next_cursor for source in sources)
+    ordered = ordered[:limit]
+    next_cursor = feed.encode_feed_cursor(ordered[-1].key) if more and ordered else None
+    return Page(items=_load_items(db, ordered), next_cursor=next_cursor)
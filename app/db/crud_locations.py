@@ -1,12 +1,16 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Optional
+from app.core.cache import response_cache
+from app.db.geo import SpatialFilter, spatial_search
 from app.db.models import Location
+from app.db.pagination import InvalidCursorError, Page, paginate
 from app.db.schemas import LocationCreate, LocationUpdate
 
 
 def create_location(db: Session, location: LocationCreate) -> Location:
     db_location = Location(**location.model_dump())
     db.add(db_location)
+    response_cache.invalidate_on_commit(db, "locations")
     return db_location
 
 
@@ -14,8 +18,24 @@ def get_location(db: Session, location_id: int) -> Optional[Location]:
     return db.query(Location).filter(Location.id == location_id).first()
 
 
-def get_locations(db: Session, skip: int = 0, limit: int = 100) -> List[Location]:
-    return db.query(Location).offset(skip).limit(limit).all()
+def get_locations(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    spatial: Optional[SpatialFilter] = None,
+) -> Page[Location]:
+    if spatial is not None:
+        if cursor:
+            raise InvalidCursorError("Cursors cannot be combined with distance-sorted results")
+        items = spatial_search(
+            db.query(Location), spatial, skip, limit, Location.id,
+            coordinates=lambda location: (float(location.latitude), float(location.longitude)),
+        )
+        return Page(items=items)
+    return paginate(
+        db.query(Location), [Location.created_at, Location.id], limit=limit, skip=skip, cursor=cursor
+    )
 
 
 def update_location(db: Session, db_location: Location, location_in: LocationUpdate) -> Location:
@@ -23,6 +43,8 @@ def update_location(db: Session, db_location: Location, location_in: LocationUpd
     for key, value in update_data.items():
         setattr(db_location, key, value)
     db.add(db_location)
+    # Quests embed their start location and destination
+    response_cache.invalidate_on_commit(db, "locations", "quests", "quests:embedded")
     return db_location
 
 
@@ -30,5 +52,6 @@ def delete_location(db: Session, location_id: int) -> Optional[Location]:
     db_location = get_location(db, location_id)
     if db_location:
         db.delete(db_location)
+        response_cache.invalidate_on_commit(db, "locations", "quests", "quests:embedded")
         return db_location
     return None
\ No newline at end of file
@@ -1,7 +1,84 @@
-from sqlalchemy.orm import Session
-from typing import Optional
-from app.db.models import Quest, UserQuestBookmark
-from app.db.schemas import QuestCreate, QuestUpdate
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type, Union, cast
+
+from pydantic import BaseModel
+from sqlalchemy import Column, Row, Table, delete, func, insert, inspect, literal, or_, select, union_all, update
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+from sqlalchemy.sql.dml import Update
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+# What joinedload(), selectinload() and load_only() return; Load is only one kind
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+from app.core.cache import listed_quest_tag, response_cache
+from app.db import crud_tags, feed, likes as likes_buffer, trending
+from app.db.database import dialect_insert, is_postgresql
+from app.db.fieldsets import FieldSelection
+from app.db.geo import SpatialFilter, spatial_search
+from app.db.models import (
+    Base, Campaign, Difficulty, Interest, Location, Quest, QuestTag, QuestType, Tag, UserQuestBookmark,
+)
+from app.db.pagination import InvalidCursorError, Page, paginate
+from app.db.search import SEARCH_FIELDS, search_hits
+from app.db.schemas import QuestCreate, QuestImportError, QuestImportRow, QuestOut, QuestUpdate, nested_schema
+
+
+@lru_cache(maxsize=None)
+def load_options_for(
+    model: Type[Base], schema: Type[BaseModel], only: Optional[FrozenSet[str]] = None
+) -> Tuple[_AbstractLoad, ...]:
+    """
+    Derive eager-loading options from the relationships an output schema serialises.
+
+    Every schema field that names a relationship on ``model`` gets a loader:
+    many-to-one relationships are joined into the parent SELECT, collections are
+    fetched with one extra ``SELECT ... IN`` per relationship. Nested schemas are
+    followed recursively (e.g. ``QuestOut.campaign.author``), so validating the
+    result never triggers a lazy load. ``only`` limits the top-level
+    relationships loaded to those named.
+    """
+    relationships = inspect(model).relationships
+    options: List[_AbstractLoad] = []
+    for name, field in schema.model_fields.items():
+        if only is not None and name not in only:
+            continue
+        relationship = relationships.get(name)
+        nested = nested_schema(field.annotation)
+        if relationship is None or nested is None:
+            continue
+        attr = getattr(model, name)
+        loader = selectinload(attr) if relationship.uselist else joinedload(attr)
+        child: Type[Base] = relationship.mapper.class_
+        child_options = load_options_for(child, nested)
+        if child_options:
+            loader = loader.options(*child_options)
+        options.append(loader)
+    return tuple(options)
+
+
+# Loader options for anything rendered through ``QuestOut``
+QUEST_OUT_OPTIONS = load_options_for(Quest, QuestOut)
+
+
+def quest_load_options(
+    selection: Optional[FieldSelection], *columns: str, embeds: Tuple[str, ...] = ()
+) -> Tuple[_AbstractLoad, ...]:
+    """
+    Loader options for rendering ``selection`` of ``QuestOut``: only its
+    columns plus ``columns``, and only its relationships plus ``embeds``.
+    """
+    if selection is None:
+        return QUEST_OUT_OPTIONS
+    loaded = selection.fields.union(columns)
+    return (
+        load_only(*(getattr(Quest, name) for name in sorted(loaded))),
+        *load_options_for(Quest, QuestOut, selection.embeds.union(embeds)),
+    )
+
+# Counter statements target the tables directly: they return the new value
+# instead of refreshing ORM instances
+quests_table = cast(Table, Quest.__table__)
+bookmarks_table = cast(Table, UserQuestBookmark.__table__)
+
 
 def create_quest(db: Session, quest: QuestCreate, author_id: int) -> Quest:
     db_quest = Quest(
@@ -16,59 +93,332 @@ def create_quest(db: Session, quest: QuestCreate, author_id: int) -> Quest:
         interest_id=quest.interest_id,
         difficulty_id=quest.difficulty_id,
         quest_type_id=quest.quest_type_id,
+        tags=quest.tags,
+        quest_giver=quest.quest_giver,
+        companions=quest.companions,
+        lore_excerpt=quest.lore_excerpt,
+        artifacts_discovered=quest.artifacts_discovered,
+        completed=quest.completed,
+        media_urls=quest.media_urls,
         campaign_id=quest.campaign_id
     )
     db.add(db_quest)
+    crud_tags.set_quest_tags(db, db_quest)
+    db.flush()  # Feed entries need the quest's id
+    feed.publish(db, "quest", [db_quest.id])  # type: ignore [list-item]
+    response_cache.invalidate_on_commit(db, "quests")
     return db_quest
 
-def get_quest(db: Session, quest_id: int) -> Quest | None:
-    return db.query(Quest).filter(Quest.id == quest_id).first()
+# The tables an import can reference; each has an id and a name
+ReferenceModel = Union[Type[Location], Type[Interest], Type[Difficulty], Type[QuestType]]
 
-def get_quests(
+# Quest columns a bulk import row can reference by id or by name
+IMPORT_REFERENCES: Dict[str, ReferenceModel] = {
+    "start_location": Location,
+    "destination": Location,
+    "interest": Interest,
+    "difficulty": Difficulty,
+    "quest_type": QuestType,
+}
+
+def _resolve_import_references(
+    db: Session, rows: List[Tuple[int, QuestImportRow]]
+) -> Tuple[Dict[int, Dict[str, Any]], List[QuestImportError]]:
+    """
+    Map every row's references to ids with one query per referenced table.
+
+    Returns the resolved ``<reference>_id`` values per row index, and an
+    error for every row naming something missing, or a location name that
+    several locations share.
+    """
+    wanted: Dict[ReferenceModel, Tuple[set, set]] = {}
+    for _, row in rows:
+        for reference, model in IMPORT_REFERENCES.items():
+            names, ids = wanted.setdefault(model, (set(), set()))
+            if getattr(row, f"{reference}_name") is not None:
+                names.add(getattr(row, f"{reference}_name"))
+            if getattr(row, f"{reference}_id") is not None:
+                ids.add(getattr(row, f"{reference}_id"))
+
+    known_ids: Dict[ReferenceModel, set] = {}
+    ids_by_name: Dict[ReferenceModel, Dict[str, List[int]]] = {}
+    for model, (names, ids) in wanted.items():
+        known_ids[model], ids_by_name[model] = set(), {}
+        if not names and not ids:
+            continue
+        for id_, name in db.execute(
+            select(model.id, model.name).where(or_(model.name.in_(names), model.id.in_(ids)))
+        ):
+            known_ids[model].add(id_)
+            ids_by_name[model].setdefault(name, []).append(id_)
+    campaign_ids = {row.campaign_id for _, row in rows if row.campaign_id is not None}
+    if campaign_ids:
+        campaign_ids = set(db.scalars(select(Campaign.id).where(Campaign.id.in_(campaign_ids))))
+
+    resolved: Dict[int, Dict[str, Any]] = {}
+    errors: List[QuestImportError] = []
+    for index, row in rows:
+        values: Dict[str, Any] = {}
+        problems: List[str] = []
+        for reference, model in IMPORT_REFERENCES.items():
+            id_, name = getattr(row, f"{reference}_id"), getattr(row, f"{reference}_name")
+            if id_ is not None:
+                if id_ not in known_ids[model]:
+                    problems.append(f"{reference}_id: no {model.__tablename__} row with id {id_}")
+                values[f"{reference}_id"] = id_
+            elif name is not None:
+                matches = ids_by_name[model].get(name, [])
+                if len(matches) != 1:
+                    problem = "is ambiguous" if matches else "was not found"
+                    problems.append(f"{reference}_name: '{name}' {problem}")
+                values[f"{reference}_id"] = matches[0] if matches else None
+        if row.campaign_id is not None and row.campaign_id not in campaign_ids:
+            problems.append(f"campaign_id: no campaign with id {row.campaign_id}")
+        if problems:
+            errors.append(QuestImportError(row=index, errors=problems))
+        else:
+            resolved[index] = values
+    return resolved, errors
+
+def bulk_create_quests(
     db: Session,
-    skip: int = 0,
-    limit: int = 100,
+    rows: List[Tuple[int, QuestImportRow]],
+    author_id: int,
+    partial: bool = False,
+    validate_only: bool = False,
+) -> Tuple[List[int], List[QuestImportError]]:
+    """
+    Insert imported quests; return the new quest ids, and per-row errors.
+
+    References are resolved in one query per table and the quests inserted
+    with one multi-row ``INSERT ... RETURNING``, their tags linked in two more
+    statements. Unless ``partial``, any error means nothing is inserted;
+    ``validate_only`` only reports the errors. The caller commits.
+    """
+    resolved, errors = _resolve_import_references(db, rows)
+    valid = [(index, row) for index, row in rows if index in resolved]
+    if validate_only or not valid or (errors and not partial):
+        return [], errors
+
+    name_fields = {f"{reference}_name" for reference in IMPORT_REFERENCES}
+    # Returning the tags links them without relying on the order rows come
+    # back in, which would cost a statement per row on SQLite
+    created = db.execute(
+        insert(quests_table).returning(quests_table.c.id, quests_table.c.tags),
+        [
+            {**row.model_dump(exclude=name_fields), **resolved[index], "author_id": author_id}
+            for index, row in valid
+        ],
+    ).all()
+
+    tags = {quest_id: crud_tags.parse_tags(quest_tags) for quest_id, quest_tags in created}
+    tag_ids = crud_tags.ensure_tags(db, {name for names in tags.values() for name in names})
+    links = [
+        {"quest_id": quest_id, "tag_id": tag_ids[name]}
+        for quest_id, names in tags.items()
+        for name in names
+    ]
+    if links:
+        db.execute(insert(cast(Table, QuestTag.__table__)), links)
+    feed.publish(db, "quest", [quest_id for quest_id, _ in created])
+    response_cache.invalidate_on_commit(db, "quests")
+    return sorted(quest_id for quest_id, _ in created), errors
+
+def get_quest(db: Session, quest_id: int, selection: Optional[FieldSelection] = None) -> Quest | None:
+    # The ETag and Last-Modified are read from the version columns
+    options = quest_load_options(selection, "row_version", "created_at", "updated_at")
+    return db.query(Quest).options(*options).filter(Quest.id == quest_id).first()
+
+# Sort keys for ``get_quests``, each ending in the id so the order is total
+QUEST_SORTS: Dict[str, List[UnaryExpression[Any]]] = {
+    "newest": [Quest.created_at.desc(), Quest.id.desc()],
+    "popular": [Quest.likes.desc(), Quest.id.desc()],
+    "bookmarked": [Quest.bookmarks.desc(), Quest.id.desc()],
+    "trending": [Quest.trending_score.desc(), Quest.id.desc()],
+}
+
+def _quest_filters(
     is_public: Optional[bool] = None,
     difficulty_id: Optional[int] = None,
     quest_type_id: Optional[int] = None,
     interest_id: Optional[int] = None,
     author_id: Optional[int] = None,
     campaign_id: Optional[int] = None,
-    # Add other filter parameters as needed
-) -> list[Quest]:
-    query = db.query(Quest)
+    tags: Optional[List[str]] = None,
+    tag_mode: str = "any",
+) -> List[ColumnElement]:
+    conditions = []
     if is_public is not None:
-        query = query.filter(Quest.is_public == is_public)
+        conditions.append(Quest.is_public == is_public)
     if difficulty_id is not None:
-        query = query.filter(Quest.difficulty_id == difficulty_id)
+        conditions.append(Quest.difficulty_id == difficulty_id)
     if quest_type_id is not None:
-        query = query.filter(Quest.quest_type_id == quest_type_id)
+        conditions.append(Quest.quest_type_id == quest_type_id)
     if interest_id is not None:
-        query = query.filter(Quest.interest_id == interest_id)
+        conditions.append(Quest.interest_id == interest_id)
     if author_id is not None:
-        query = query.filter(Quest.author_id == author_id)
+        conditions.append(Quest.author_id == author_id)
     if campaign_id is not None:
-        query = query.filter(Quest.campaign_id == campaign_id)
+        conditions.append(Quest.campaign_id == campaign_id)
+    if tags:
+        conditions.append(crud_tags.tag_filter(tags, tag_mode))
+    return conditions
+
+def get_quests(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    is_public: Optional[bool] = None,
+    difficulty_id: Optional[int] = None,
+    quest_type_id: Optional[int] = None,
+    interest_id: Optional[int] = None,
+    author_id: Optional[int] = None,
+    campaign_id: Optional[int] = None,
+    spatial: Optional[SpatialFilter] = None,
+    tags: Optional[List[str]] = None,
+    tag_mode: str = "any",
+    sort: str = "newest",
+    selection: Optional[FieldSelection] = None,
+) -> Page[Quest]:
+    """
+    One page of quests. With a ``selection`` only its columns and
+    relationships are loaded, plus what sorting and paging need.
+    """
+    # The cursor is read from the sort columns; the distance fallback reads the start location
+    sort_columns = [cast(Column[Any], clause.element).key for clause in QUEST_SORTS[sort]]
+    options = quest_load_options(
+        selection, *sort_columns, embeds=("start_location",) if spatial is not None else ()
+    )
+    query = db.query(Quest).options(*options).filter(*_quest_filters(
+        is_public=is_public, difficulty_id=difficulty_id, quest_type_id=quest_type_id,
+        interest_id=interest_id, author_id=author_id, campaign_id=campaign_id,
+        tags=tags, tag_mode=tag_mode,
+    ))
+
+    if spatial is not None:
+        if cursor:
+            raise InvalidCursorError("Cursors cannot be combined with distance-sorted results")
+        # Spatial filters apply to where a quest starts
+        query = query.join(Location, Quest.start_location_id == Location.id)
+        items = spatial_search(
+            query, spatial, skip, limit, Quest.id,
+            coordinates=lambda quest: (quest.start_location.latitude, quest.start_location.longitude),
+        )
+        return Page(items=items)
+
+    return paginate(query, QUEST_SORTS[sort], limit=limit, skip=skip, cursor=cursor)
+
+def get_quest_facets(db: Session, **filters: Any) -> Dict[str, List[Row]]:
+    """
+    Count the quests matching ``filters`` (see ``_quest_filters``) per tag,
+    difficulty, interest and quest type.
 
-    return query.offset(skip).limit(limit).all()
+    One statement: a grouped SELECT per facet over the filtered quests,
+    combined with UNION ALL. Returns ``(id, name, count)`` rows per facet,
+    most common first.
+    """
+    filtered = (
+        select(Quest.id, Quest.difficulty_id, Quest.interest_id, Quest.quest_type_id)
+        .where(*_quest_filters(**filters))
+        .cte("filtered")
+    )
+    tag_counts = (
+        select(literal("tags").label("facet"), Tag.id, Tag.name, func.count().label("count"))
+        .select_from(QuestTag)
+        .join(filtered, filtered.c.id == QuestTag.quest_id)
+        .join(Tag, Tag.id == QuestTag.tag_id)
+        .group_by(Tag.id, Tag.name)
+    )
+    counts = [tag_counts]
+    for facet, model, key in (
+        ("difficulties", Difficulty, filtered.c.difficulty_id),
+        ("interests", Interest, filtered.c.interest_id),
+        ("quest_types", QuestType, filtered.c.quest_type_id),
+    ):
+        counts.append(
+            select(literal(facet).label("facet"), model.id, model.name, func.count().label("count"))
+            .select_from(filtered)
+            .join(model, model.id == key)
+            .group_by(model.id, model.name)
+        )
+    combined = union_all(*counts).subquery("facets")
+    rows = db.execute(
+        select(combined).order_by(combined.c.facet, combined.c["count"].desc(), combined.c.name)
+    )
+    facets: Dict[str, List[Row]] = {"tags": [], "difficulties": [], "interests": [], "quest_types": []}
+    for row in rows:
+        facets[row.facet].append(row)
+    return facets
+
+def search_quests(db: Session, q: str, limit: int = 20, cursor: Optional[str] = None) -> Page[Row]:
+    """
+    Full-text search, best matches first; see ``app.db.search``.
+
+    Each row holds the ``Quest``, its ``rank`` and the highlighted copy of
+    every field in ``SEARCH_FIELDS`` under the field's name.
+    """
+    hits = search_hits(db, q)
+    query = (
+        db.query(Quest, hits.c.rank, *(hits.c[field] for field in SEARCH_FIELDS))
+        .options(*QUEST_OUT_OPTIONS)
+        .join(hits, hits.c.id == Quest.id)
+    )
+    return paginate(
+        query, [hits.c.rank.desc(), Quest.id], limit=limit, cursor=cursor,
+        cursor_values=lambda row: (row.rank, row.Quest.id),
+    )
 
 def update_quest(db: Session, db_quest: Quest, quest_in: QuestUpdate) -> Quest:
     update_data = quest_in.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_quest, key, value)
+    if "tags" in update_data:
+        crud_tags.set_quest_tags(db, db_quest)
     db.add(db_quest)
+    response_cache.invalidate_on_commit(db, "quests", f"quest:{db_quest.id}")
     return db_quest
 
 # The original errors on lines 84, 104, 115 of your previous crud_quests.py
 # are likely resolved by this new structure, which avoids direct assignment
 # of SQLAlchemy Column objects to integer variables or using them in `max()`.
 
-def like_quest(db: Session, quest_id: int) -> Optional[Quest]:
-    db_quest = get_quest(db, quest_id)
-    if db_quest:
-        db_quest.likes += 1  # type: ignore [assignment]
-        db.add(db_quest)
-    return db_quest
+def like_quest(db: Session, quest_id: int) -> Optional[int]:
+    """
+    Add a like and return the quest's new count, or None if it does not exist.
+
+    Normally one ``UPDATE ... RETURNING``. With the like buffer enabled the
+    row is only read, without a lock, and the like is written later by
+    ``likes.flush_likes``.
+    """
+    if likes_buffer.like_buffer is not None:
+        stored: Optional[int] = db.execute(
+            select(func.coalesce(quests_table.c.likes, 0)).where(quests_table.c.id == quest_id)
+        ).scalar_one_or_none()
+        if stored is None:
+            return None
+        pending = likes_buffer.like_buffer.add(quest_id)
+        # Lists pick the like up when the buffer is flushed
+        response_cache.invalidate(f"quest:{quest_id}")
+        return stored + pending
+
+    likes: Optional[int] = db.execute(
+        update(quests_table)
+        .where(quests_table.c.id == quest_id)
+        .values(
+            likes=func.coalesce(quests_table.c.likes, 0) + 1,
+            trending_score=trending.add_event(
+                quests_table.c.trending_score, literal(trending.event_score(trending.LIKE_WEIGHT))
+            ),
+        )
+        .returning(quests_table.c.likes)
+    ).scalar_one_or_none()
+    if likes is not None:
+        # Only the lists showing the quest: a hot quest would otherwise keep
+        # evicting every cached list. Sorted lists may take until their TTL
+        # to move it between pages.
+        response_cache.invalidate_on_commit(db, f"quest:{quest_id}", listed_quest_tag(quest_id))
+    return likes
 
 def get_quest_bookmark_by_user_and_quest(db: Session, user_id: int, quest_id: int) -> Optional[UserQuestBookmark]:
     return db.query(UserQuestBookmark).filter(
@@ -76,28 +426,79 @@ def get_quest_bookmark_by_user_and_quest(db: Session, user_id: int, quest_id: in
         UserQuestBookmark.quest_id == quest_id
     ).first()
 
-def add_quest_bookmark_for_user(db: Session, user_id: int, quest_id: int) -> Optional[Quest]:
-    db_quest = get_quest(db, quest_id)
-    if db_quest:
-        # Check if already bookmarked to prevent duplicate entries (though UniqueConstraint handles this)
-        existing_bookmark = get_quest_bookmark_by_user_and_quest(db, user_id, quest_id)
-        if not existing_bookmark:
-            db_bookmark = UserQuestBookmark(user_id=user_id, quest_id=quest_id)
-            db.add(db_bookmark)
-            db_quest.bookmarks += 1  # type: ignore [assignment] # Increment denormalized count
-            db.add(db_quest)
-    return db_quest
+def _adjust_bookmarks(quest_id: int, delta: int) -> Update:
+    values = {"bookmarks": func.coalesce(quests_table.c.bookmarks, 0) + delta}
+    if delta > 0:
+        values["trending_score"] = trending.add_event(
+            quests_table.c.trending_score, literal(trending.event_score(trending.BOOKMARK_WEIGHT))
+        )
+    return (
+        update(quests_table)
+        .where(quests_table.c.id == quest_id)
+        .values(**values)
+        .returning(quests_table.c.bookmarks)
+    )
 
-def remove_quest_bookmark_for_user(db: Session, user_id: int, quest_id: int) -> Optional[Quest]:
-    db_quest = get_quest(db, quest_id)
-    if db_quest:
-        db_bookmark = get_quest_bookmark_by_user_and_quest(db, user_id, quest_id)
-        if db_bookmark:
-            db.delete(db_bookmark)
-            db_quest.bookmarks -= 1  # type: ignore [assignment] # Decrement denormalized count
-            db.add(db_quest)
-    return db_quest
+def add_quest_bookmark_for_user(db: Session, user_id: int, quest_id: int) -> Optional[int]:
+    """
+    Bookmark a quest and bump its counter; return the new count.
+
+    Returns None if the quest does not exist or the user had already
+    bookmarked it. On PostgreSQL the insert and the counter update are one
+    statement; SQLite has no data-modifying CTEs, so it takes two.
+    """
+    insert_bookmark = (
+        dialect_insert(db)(bookmarks_table)
+        .from_select(
+            ["user_id", "quest_id"],
+            select(literal(user_id), quests_table.c.id).where(quests_table.c.id == quest_id),
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "quest_id"])
+        .returning(bookmarks_table.c.quest_id)
+    )
+    count: Optional[int]
+    if is_postgresql(db):
+        inserted = insert_bookmark.cte("inserted")
+        statement = _adjust_bookmarks(quest_id, 1).where(
+            quests_table.c.id.in_(select(inserted.c.quest_id))
+        )
+        count = db.execute(statement).scalar_one_or_none()
+    else:
+        inserted_id = db.execute(insert_bookmark).scalar_one_or_none()
+        count = None if inserted_id is None else db.execute(_adjust_bookmarks(quest_id, 1)).scalar_one()
+    if count is not None:
+        # Like likes, only the lists showing the quest
+        response_cache.invalidate_on_commit(db, f"quest:{quest_id}", listed_quest_tag(quest_id))
+    return count
+
+def remove_quest_bookmark_for_user(db: Session, user_id: int, quest_id: int) -> Optional[int]:
+    """Remove a bookmark and decrement the counter; return the new count, or None if there was none."""
+    delete_bookmark = (
+        delete(bookmarks_table)
+        .where(bookmarks_table.c.user_id == user_id, bookmarks_table.c.quest_id == quest_id)
+        .returning(bookmarks_table.c.quest_id)
+    )
+    count: Optional[int]
+    if is_postgresql(db):
+        deleted = delete_bookmark.cte("deleted")
+        statement = _adjust_bookmarks(quest_id, -1).where(
+            quests_table.c.id.in_(select(deleted.c.quest_id))
+        )
+        count = db.execute(statement).scalar_one_or_none()
+    else:
+        deleted_id = db.execute(delete_bookmark).scalar_one_or_none()
+        count = None if deleted_id is None else db.execute(_adjust_bookmarks(quest_id, -1)).scalar_one()
+    if count is not None:
+        # Like likes, only the lists showing the quest
+        response_cache.invalidate_on_commit(db, f"quest:{quest_id}", listed_quest_tag(quest_id))
+    return count
 
 def get_user_bookmarked_quests(db: Session, user_id: int) -> list[Quest]:
     """Get all quests bookmarked by a specific user"""
-    return db.query(Quest).join(UserQuestBookmark).filter(UserQuestBookmark.user_id == user_id).all()
\ No newline at end of file
+    return (
+        db.query(Quest)
+        .options(*QUEST_OUT_OPTIONS)
+        .join(UserQuestBookmark)
+        .filter(UserQuestBookmark.user_id == user_id)
+        .all()
+    )
\ No newline at end of file
@@ -1,33 +1,138 @@
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from typing import List
-from app.db import models
+from app.db import models, schemas
+
+_BUMP_PENDING_KEY = "reference_data_changed"
+
 
 # Reference Data CRUD
 def get_quest_types(db: Session) -> List[models.QuestType]:
-    return db.query(models.QuestType).all()
+    return db.query(models.QuestType).order_by(models.QuestType.id).all()
 
 
 def get_difficulties(db: Session) -> List[models.Difficulty]:
-    return db.query(models.Difficulty).all()
+    return db.query(models.Difficulty).order_by(models.Difficulty.id).all()
 
 
 def get_interests(db: Session) -> List[models.Interest]:
-    return db.query(models.Interest).all()
+    return db.query(models.Interest).order_by(models.Interest.id).all()
 
 
 def create_quest_type(db: Session, name: str) -> models.QuestType:
     db_quest_type = models.QuestType(name=name)
     db.add(db_quest_type)
+    _bump_version_on_commit(db)
     return db_quest_type
 
 
 def create_difficulty(db: Session, name: str) -> models.Difficulty:
     db_difficulty = models.Difficulty(name=name)
     db.add(db_difficulty)
+    _bump_version_on_commit(db)
     return db_difficulty
 
 
 def create_interest(db: Session, name: str) -> models.Interest:
     db_interest = models.Interest(name=name)
     db.add(db_interest)
-    return db_interest
\ No newline at end of file
+    _bump_version_on_commit(db)
+    return db_interest
+
+
+# In-memory snapshot
+#
+# The reference tables only change when the seed script runs, so each process
+# keeps a serialised copy of them and serves it without touching the database.
+# ``create_*`` bump ``_version`` once their transaction commits, and the next
+# read rebuilds the snapshot. Writes made by another process (the seed script,
+# or another worker) are only picked up after a restart.
+@dataclass(frozen=True)
+class ReferenceCollection:
+    items: Sequence[BaseModel]
+    body: bytes
+    etag: str
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    version: int
+    interests: ReferenceCollection
+    difficulties: ReferenceCollection
+    quest_types: ReferenceCollection
+    combined: ReferenceCollection
+
+
+_version = 0
+_snapshot: Optional[ReferenceSnapshot] = None
+_lock = threading.Lock()
+
+_interests_adapter = TypeAdapter(List[schemas.InterestOut])
+_difficulties_adapter = TypeAdapter(List[schemas.DifficultyOut])
+_quest_types_adapter = TypeAdapter(List[schemas.QuestTypeOut])
+
+
+def _collection(items: Sequence[BaseModel], body: bytes) -> ReferenceCollection:
+    # Strong validator derived from the content, so every worker agrees on it
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return ReferenceCollection(items=tuple(items), body=body, etag=etag)
+
+
+def load_snapshot(db: Session) -> ReferenceSnapshot:
+    """Read the reference tables and replace the process-wide snapshot."""
+    global _snapshot
+    version = _version
+    interests = [schemas.InterestOut.model_validate(row) for row in get_interests(db)]
+    difficulties = [schemas.DifficultyOut.model_validate(row) for row in get_difficulties(db)]
+    quest_types = [schemas.QuestTypeOut.model_validate(row) for row in get_quest_types(db)]
+    combined = schemas.ReferenceDataOut(
+        interests=interests, difficulties=difficulties, quest_types=quest_types
+    )
+    _snapshot = ReferenceSnapshot(
+        version=version,
+        interests=_collection(interests, _interests_adapter.dump_json(interests)),
+        difficulties=_collection(difficulties, _difficulties_adapter.dump_json(difficulties)),
+        quest_types=_collection(quest_types, _quest_types_adapter.dump_json(quest_types)),
+        combined=_collection([combined], combined.model_dump_json().encode()),
+    )
+    return _snapshot
+
+
+def get_snapshot(db: Session) -> ReferenceSnapshot:
+    """Return the current snapshot, rebuilding it if reference data has changed."""
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == _version:
+        return snapshot
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is not None and snapshot.version == _version:
+            return snapshot
+        return load_snapshot(db)
+
+
+def invalidate_snapshot() -> None:
+    """Force the next read to reload the reference tables."""
+    global _version
+    with _lock:
+        _version += 1
+
+
+def _bump_version_on_commit(db: Session) -> None:
+    db.info[_BUMP_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_version(session: Session) -> None:
+    if session.info.pop(_BUMP_PENDING_KEY, False):
+        invalidate_snapshot()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_version(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_BUMP_PENDING_KEY, None)
@@ -0,0 +1,118 @@
+"""
+Normalised quest tags.
+
+Quests keep their free-form, comma-separated ``tags`` string as written by
+the author. Each tag in it is also stored once in ``tags`` and linked to the
+quest through ``quest_tags``, so filtering and counting by tag uses indexes
+instead of ``LIKE`` scans. Tag names are trimmed and lower-cased.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, cast
+
+from sqlalchemy import String, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.database import dialect_insert
+from app.db.models import Quest, QuestTag, Tag
+
+MAX_TAG_LENGTH = cast(String, Tag.__table__.c.name.type).length
+BACKFILL_BATCH_SIZE = 1000
+TAG_MODES = ("any", "all")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def parse_tags(value: Optional[str]) -> List[str]:
+    """Split a comma-separated tag string into unique, normalised names, in order."""
+    names: Dict[str, None] = {}
+    for raw in (value or "").split(","):
+        name = _WHITESPACE.sub(" ", raw).strip().lower()[:MAX_TAG_LENGTH]
+        if name:
+            names[name] = None
+    return list(names)
+
+
+def ensure_tags(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """Create any missing tags; return the id of every tag in ``names``."""
+    names = list(names)
+    if not names:
+        return {}
+    db.execute(
+        dialect_insert(db)(Tag.__table__)
+        # Sorted, so concurrent inserts take the unique index locks in the same order
+        .values([{"name": name} for name in sorted(names)])
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    rows = db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names)))
+    return {name: tag_id for name, tag_id in rows}
+
+
+def set_quest_tags(db: Session, quest: Quest) -> None:
+    """Point ``quest.normalized_tags`` at the tags in its ``tags`` string."""
+    names = parse_tags(quest.tags)  # type: ignore [arg-type]
+    ids = ensure_tags(db, names)
+    tags: Dict[str, Tag] = {
+        name: tag for name, tag in db.execute(select(Tag.name, Tag).where(Tag.id.in_(ids.values())))
+    }
+    quest.normalized_tags = [tags[name] for name in names]
+
+
+def backfill_quest_tags(db: Session, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    Link every quest to the tags parsed from its ``tags`` string.
+
+    Works in batches of ``batch_size`` quests, committing after each, and
+    only adds missing links, so it can be re-run or resumed. Returns the
+    number of links added.
+    """
+    added = 0
+    last_id = 0
+    while True:
+        batch = db.execute(
+            select(Quest.id, Quest.tags)
+            .where(Quest.id > last_id, Quest.tags.is_not(None))
+            .order_by(Quest.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            return added
+        last_id = batch[-1].id
+
+        parsed = {quest_id: parse_tags(tags) for quest_id, tags in batch}
+        ids = ensure_tags(db, {name for names in parsed.values() for name in names})
+        links = [
+            {"quest_id": quest_id, "tag_id": ids[name]}
+            for quest_id, names in parsed.items()
+            for name in names
+        ]
+        if links:
+            # Sent as an executemany, so the statement compiles once and is cached
+            result = db.execute(
+                dialect_insert(db)(QuestTag.__table__)
+                .on_conflict_do_nothing(index_elements=["quest_id", "tag_id"]),
+                links,
+            )
+            added += max(result.rowcount, 0)
+        db.commit()
+
+
+def tag_filter(names: List[str], mode: str = "any") -> ColumnElement:
+    """
+    Build a ``Quest.id IN (...)`` filter for quests tagged with ``names``.
+
+    ``mode="any"`` matches quests with at least one of the tags, ``"all"``
+    only quests with every one of them.
+    """
+    if mode not in TAG_MODES:
+        raise ValueError(f"Unknown tag mode '{mode}'")
+    tagged = (
+        select(QuestTag.quest_id)
+        .join(Tag, Tag.id == QuestTag.tag_id)
+        .where(Tag.name.in_(names))
+    )
+    if mode == "all":
+        tagged = tagged.group_by(QuestTag.quest_id).having(
+            func.count(QuestTag.tag_id) == len(set(names))
+        )
+    return Quest.id.in_(tagged)
@@ -1,8 +1,12 @@
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
+from app.core.cache import response_cache
 from app.core.hashing import get_password_hash, verify_password
+from app.core.principal_cache import principal_cache
 from app.db import models, schemas
+from app.db.crud_quests import QUEST_OUT_OPTIONS
+from app.db.pagination import Page, paginate
 
 
 def get_user(db: Session, user_id: int) -> Optional[models.User]:
@@ -13,8 +17,16 @@ def get_user_by_email(db: Session, email: str) -> Optional[models.User]:
     return db.query(models.User).filter(models.User.email == email).first()
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[models.User]:
-    return db.query(models.User).offset(skip).limit(limit).all()
+def get_users(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Page[models.User]:
+    return paginate(
+        db.query(models.User),
+        [models.User.created_at, models.User.id],
+        limit=limit,
+        skip=skip,
+        cursor=cursor,
+    )
 
 
 def create_user(db: Session, user: schemas.UserCreate) -> models.User:
@@ -41,6 +53,18 @@ def update_user(db: Session, db_user: models.User, user_in: schemas.UserUpdate)
         setattr(db_user, key, value)
 
     db.add(db_user)
+    # Quests and campaigns embed their author
+    response_cache.invalidate_on_commit(db, "quests", "quests:embedded", "campaigns")
+    principal_cache.invalidate_on_commit(db, db_user.id)  # type: ignore [arg-type]
+    return db_user
+
+
+def deactivate_user(db: Session, db_user: models.User) -> models.User:
+    db_user.is_active = False  # type: ignore [assignment]
+    db.add(db_user)
+    # Embedded authors show is_active, and cached principals must not outlive it
+    response_cache.invalidate_on_commit(db, "quests", "quests:embedded", "campaigns")
+    principal_cache.invalidate_on_commit(db, db_user.id)  # type: ignore [arg-type]
     return db_user
 
 
@@ -54,4 +78,10 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[models
 
 
 def get_bookmarked_quests_by_user(db: Session, user_id: int) -> List[models.Quest]:
-    return db.query(models.Quest).join(models.UserQuestBookmark).filter(models.UserQuestBookmark.user_id == user_id).all()
\ No newline at end of file
+    return (
+        db.query(models.Quest)
+        .options(*QUEST_OUT_OPTIONS)
+        .join(models.UserQuestBookmark)
+        .filter(models.UserQuestBookmark.user_id == user_id)
+        .all()
+    )
\ No newline at end of file
@@ -1,19 +1,135 @@
+import functools
+import inspect
+from fastapi import Depends
+from fastapi.params import Depends as DependsParam
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncGenerator, Callable, Generator, Optional, TypeVar
 
 from app.core.config import settings
+from app.db.pool import engine_options
 
-engine = create_engine(str(settings.DATABASE_URL))
+F = TypeVar("F", bound=Callable[..., Any])
+
+engine = create_engine(
+    str(settings.DATABASE_URL), **engine_options(str(settings.DATABASE_URL))
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # The declarative_base() is no longer needed here. The `Base` class is defined
 # in `app.db.models` and serves as the single source of truth for your models.
 
+# Async drivers for each sync URL scheme the app supports
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """Rewrite ``url`` to use the async driver for its backend."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+async_engine = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+if settings.DATABASE_ASYNC:
+    _async_url = async_database_url(str(settings.DATABASE_URL))
+    async_engine = create_async_engine(_async_url, **engine_options(_async_url, async_=True))
+    # Objects are used after commit outside the greenlet that loaded them, where
+    # an expired attribute could not be refreshed
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+def is_postgresql(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def dialect_insert(db: Session) -> Any:
+    """``insert`` with ``ON CONFLICT`` support for the session's database."""
+    return postgresql.insert if is_postgresql(db) else sqlite.insert
+
 
 def get_db() -> Generator[Session, None, None]:
     db: Session = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    if AsyncSessionLocal is None:
+        raise RuntimeError("get_async_db requires DATABASE_ASYNC to be enabled")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def run_on_async_session(fn: F) -> F:
+    """
+    Turn a sync callable that depends on ``get_db`` into a coroutine that
+    depends on ``get_async_db`` instead.
+
+    The body of ``fn`` runs through ``AsyncSession.run_sync``: it still sees a
+    regular ``Session``, so the ``crud_*`` modules work unchanged, but every
+    database round-trip awaits on the event loop instead of holding one of
+    Starlette's threadpool workers for the whole request.
+    """
+    signature = inspect.signature(fn)
+    db_params = [
+        name for name, param in signature.parameters.items()
+        if isinstance(param.default, DependsParam) and param.default.dependency is get_db
+    ]
+    if not db_params:
+        return fn
+    (db_param,) = db_params
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        async_db: AsyncSession = kwargs.pop(db_param)
+        return await async_db.run_sync(
+            lambda session: fn(*args, **kwargs, **{db_param: session})
+        )
+
+    wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=[
+            param.replace(annotation=AsyncSession, default=Depends(get_async_db))
+            if name == db_param else param
+            for name, param in signature.parameters.items()
+        ]
+    )
+    return wrapper  # type: ignore[return-value]
+
+
+def off_loop(fn: F) -> F:
+    """
+    Run ``fn`` on a threadpool worker when called from inside ``run_sync``.
+
+    Sync code running through ``run_on_async_session`` shares the event loop
+    thread, so a blocking call there stalls every other request. Here the
+    greenlet waits on the worker instead; elsewhere ``fn`` is called directly.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if in_greenlet():
+            return await_only(run_in_threadpool(fn, *args, **kwargs))
+        return fn(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def db_mode(fn: F) -> F:
+    """Apply ``run_on_async_session`` when ``DATABASE_ASYNC`` is enabled."""
+    return run_on_async_session(fn) if settings.DATABASE_ASYNC else fn
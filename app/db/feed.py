@@ -0,0 +1,458 @@
+"""
+Fan-out-on-write timelines behind ``GET /users/me/feed/``.
+
+When a public quest or campaign is created, an entry (kind, item id, author,
+creation time) is pushed into the timeline of every follower of its author,
+so reading a feed is one range read of the reader's own timeline instead of
+a merge over everyone they follow. With ``REDIS_URL`` set, timelines are
+Redis sorted sets written once the transaction commits; otherwise they are
+rows of ``feed_entries`` written in the same transaction. Either keeps about
+the newest ``FEED_MAX_ENTRIES`` entries per user: Redis trims a timeline as
+it is written, and ``run_trimmer`` trims the table every
+``FEED_TRIM_INTERVAL_SECONDS``, so reading a feed never writes.
+
+Authors with at least ``FEED_FANOUT_MAX_FOLLOWERS`` followers are not pushed,
+as one quest would write that many timelines. ``crud_follows.get_feed`` reads
+their newest items with ``pull`` when a feed is requested and merges them in,
+one query per kind for all such authors, so a page costs the same number of
+queries however many users the reader follows. An author who crosses the
+threshold keeps the entries already pushed (the merge drops duplicates); one
+who drops below it is pushed again from their next item.
+
+Following someone backfills their newest items into the follower's
+timeline; unfollowing removes them.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from sqlalchemy import Integer, String, delete, event, func, literal, select
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.db.database import dialect_insert, off_loop
+from app.db.models import Campaign, FeedEntry, Follow, Quest, User
+from app.db.pagination import (
+    InvalidCursorError,
+    Page,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+
+logger = logging.getLogger(__name__)
+
+# Kinds of feed items, and the tables they come from
+FeedModel = Union[Type[Quest], Type[Campaign]]
+FEED_KINDS: Dict[str, FeedModel] = {"quest": Quest, "campaign": Campaign}
+
+# Feeds are ordered newest first by (created_at, kind, item_id)
+FeedKey = Tuple[datetime, str, int]
+FEED_ORDER = (FeedEntry.created_at, FeedEntry.kind, FeedEntry.item_id)
+
+_PENDING_WRITES_KEY = "feed_pending_writes"
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Larger than any id: a cursor that keeps every item of its instant
+_MAX_ID = 2**62
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite returns naive timestamps, which are UTC
+    return (
+        value.replace(tzinfo=timezone.utc)
+        if value.tzinfo is None
+        else value.astimezone(timezone.utc)
+    )
+
+
+@dataclass(frozen=True)
+class TimelineItem:
+    kind: str
+    item_id: int
+    author_id: int
+    created_at: datetime
+
+    @property
+    def key(self) -> FeedKey:
+        return (as_utc(self.created_at), self.kind, self.item_id)
+
+
+def encode_feed_cursor(key: FeedKey) -> str:
+    return encode_cursor(list(key))
+
+
+def decode_feed_cursor(cursor: str) -> FeedKey:
+    created_at, kind, item_id = decode_cursor(cursor, FEED_ORDER)
+    if (
+        not isinstance(created_at, datetime)
+        or kind not in FEED_KINDS
+        or not isinstance(item_id, int)
+    ):
+        raise InvalidCursorError("Cursor does not match this listing")
+    return as_utc(created_at), kind, item_id
+
+
+def _is_public(model: FeedModel) -> Any:
+    return model.is_public.is_not(False)
+
+
+def _pushed(query: Select, model: FeedModel) -> Select:
+    """Limit ``query`` to fanned-out items: public, by authors under the cap."""
+    return query.join(User, User.id == model.author_id).where(
+        _is_public(model), User.follower_count < settings.FEED_FANOUT_MAX_FOLLOWERS
+    )
+
+
+def fanout_entries(kind: str, item_ids: Sequence[int]) -> Select:
+    """Timeline rows for new items: one per item and follower of its author."""
+    model = FEED_KINDS[kind]
+    query = (
+        select(
+            Follow.follower_id,
+            literal(kind, String).label("kind"),
+            model.id.label("item_id"),
+            model.author_id,
+            model.created_at,
+        )
+        .join(model, model.author_id == Follow.followee_id)
+        .where(model.id.in_(item_ids))
+    )
+    return _pushed(query, model)
+
+
+def backfill_entries(kind: str, follower_id: int, author_id: int, limit: int) -> Select:
+    """Timeline rows for ``author_id``'s newest items, for a new follower."""
+    model = FEED_KINDS[kind]
+    query = select(
+        literal(follower_id, Integer).label("follower_id"),
+        literal(kind, String).label("kind"),
+        model.id.label("item_id"),
+        model.author_id,
+        model.created_at,
+    ).where(model.author_id == author_id)
+    return (
+        _pushed(query, model)
+        .order_by(model.created_at.desc(), model.id.desc())
+        .limit(limit)
+    )
+
+
+def _after_commit(db: Session, write: Callable[[], None]) -> None:
+    db.info.setdefault(_PENDING_WRITES_KEY, []).append(write)
+
+
+class TimelineStore(ABC):
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+
+    @abstractmethod
+    def add(self, db: Session, entries: Select) -> None:
+        """Add the rows ``entries`` selects (see ``fanout_entries``) to timelines."""
+
+    @abstractmethod
+    def remove_author(self, db: Session, follower_id: int, author_id: int) -> None:
+        """Take ``author_id``'s items out of ``follower_id``'s timeline."""
+
+    @abstractmethod
+    def page(
+        self, db: Session, follower_id: int, limit: int, cursor: Optional[str]
+    ) -> Page[TimelineItem]:
+        """Up to ``limit`` entries of a timeline, newest first, after ``cursor``."""
+
+    def trim(self, db: Session) -> int:
+        """Drop entries beyond ``max_entries`` per timeline; return how many went."""
+        return 0
+
+
+class TableTimelineStore(TimelineStore):
+    """
+    Timelines in ``feed_entries``, written in the caller's transaction.
+
+    Timelines grow past ``max_entries`` until ``trim`` runs; see ``run_trimmer``.
+    """
+
+    def add(self, db: Session, entries: Select) -> None:
+        columns = ["follower_id", "kind", "item_id", "author_id", "created_at"]
+        # A follow's backfill may race the fan-out of the same item
+        db.execute(
+            dialect_insert(db)(FeedEntry.__table__)
+            .from_select(columns, entries)
+            .on_conflict_do_nothing()
+        )
+
+    def remove_author(self, db: Session, follower_id: int, author_id: int) -> None:
+        db.execute(
+            delete(FeedEntry).where(
+                FeedEntry.follower_id == follower_id, FeedEntry.author_id == author_id
+            )
+        )
+
+    def trim(self, db: Session) -> int:
+        """Trim every timeline over ``max_entries``; the caller commits."""
+        over = (
+            select(FeedEntry.follower_id)
+            .group_by(FeedEntry.follower_id)
+            .having(func.count() > self.max_entries)
+        )
+        # Correlated with the DELETE: each timeline's own oldest kept entry
+        kept = aliased(FeedEntry)
+        oldest_kept = (
+            select(kept.created_at)
+            .where(kept.follower_id == FeedEntry.follower_id)
+            .order_by(kept.created_at.desc(), kept.kind.desc(), kept.item_id.desc())
+            .offset(self.max_entries - 1)
+            .limit(1)
+            .scalar_subquery()
+        )
+        # Entries sharing the oldest kept instant stay
+        result = db.execute(
+            delete(FeedEntry).where(
+                FeedEntry.follower_id.in_(over), FeedEntry.created_at < oldest_kept
+            )
+        )
+        return max(result.rowcount, 0)
+
+    def page(
+        self, db: Session, follower_id: int, limit: int, cursor: Optional[str]
+    ) -> Page[TimelineItem]:
+        query = db.query(
+            FeedEntry.kind, FeedEntry.item_id, FeedEntry.author_id, FeedEntry.created_at
+        ).filter(FeedEntry.follower_id == follower_id)
+        page = paginate(
+            query, [column.desc() for column in FEED_ORDER], limit=limit, cursor=cursor
+        )
+        return Page(
+            items=[TimelineItem(*row) for row in page.items],
+            next_cursor=page.next_cursor,
+        )
+
+
+class RedisTimelineStore(TimelineStore):
+    """
+    One sorted set per follower, scored by creation time in microseconds.
+
+    Members are ``kind:item_id:author_id`` with the id zero-padded, so Redis
+    orders entries of the same instant the way feeds do. Writes wait until
+    the transaction commits, so a rolled-back quest never reaches a feed.
+    """
+
+    def __init__(
+        self, client: Any, max_entries: int, prefix: str = "advguild:feed:"
+    ) -> None:
+        super().__init__(max_entries)
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, max_entries: int) -> "RedisTimelineStore":
+        import redis
+
+        return cls(
+            redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5),
+            max_entries,
+        )
+
+    def _key(self, follower_id: int) -> str:
+        return f"{self.prefix}{follower_id}"
+
+    @staticmethod
+    def _score(created_at: datetime) -> int:
+        # Whole microseconds stay exact in a sorted set's double score
+        return (as_utc(created_at) - _EPOCH) // timedelta(microseconds=1)
+
+    @staticmethod
+    def _member(kind: str, item_id: int, author_id: int) -> str:
+        return f"{kind}:{item_id:020d}:{author_id}"
+
+    @staticmethod
+    def _item(member: bytes, score: float) -> TimelineItem:
+        kind, item_id, author_id = member.decode().split(":")
+        return TimelineItem(
+            kind,
+            int(item_id),
+            int(author_id),
+            _EPOCH + timedelta(microseconds=int(score)),
+        )
+
+    def add(self, db: Session, entries: Select) -> None:
+        timelines: Dict[int, Dict[str, int]] = {}
+        for follower_id, kind, item_id, author_id, created_at in db.execute(entries):
+            timelines.setdefault(follower_id, {})[
+                self._member(kind, item_id, author_id)
+            ] = self._score(created_at)
+        if timelines:
+            _after_commit(db, lambda: self._add(timelines))
+
+    @off_loop
+    def _add(self, timelines: Dict[int, Dict[str, int]]) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for follower_id, members in timelines.items():
+            key = self._key(follower_id)
+            pipe.zadd(key, members)
+            pipe.zremrangebyrank(key, 0, -self.max_entries - 1)
+        pipe.execute()
+
+    def remove_author(self, db: Session, follower_id: int, author_id: int) -> None:
+        _after_commit(db, lambda: self._remove_author(follower_id, author_id))
+
+    @off_loop
+    def _remove_author(self, follower_id: int, author_id: int) -> None:
+        key = self._key(follower_id)
+        suffix = f":{author_id}".encode()
+        # A timeline holds at most max_entries members
+        members = [
+            member
+            for member in self.client.zrange(key, 0, -1)
+            if member.endswith(suffix)
+        ]
+        if members:
+            self.client.zrem(key, *members)
+
+    @off_loop
+    def page(
+        self, db: Session, follower_id: int, limit: int, cursor: Optional[str]
+    ) -> Page[TimelineItem]:
+        key = self._key(follower_id)
+        if cursor is None:
+            newest = self.client.zrevrange(key, 0, limit, withscores=True)
+            items = [self._item(member, score) for member, score in newest]
+        else:
+            after = decode_feed_cursor(cursor)
+            score = self._score(after[0])
+            # Entries of the cursor's own instant may sort on either side of it
+            ties = self.client.zcount(key, score, score)
+            raw = self.client.zrevrangebyscore(
+                key, score, "-inf", start=0, num=limit + 1 + ties, withscores=True
+            )
+            items = [
+                item
+                for item in (self._item(member, score) for member, score in raw)
+                if item.key < after
+            ]
+        if len(items) <= limit:
+            return Page(items=items)
+        items = items[:limit]
+        return Page(items=items, next_cursor=encode_feed_cursor(items[-1].key))
+
+
+def _store_from_settings() -> TimelineStore:
+    if settings.REDIS_URL:
+        return RedisTimelineStore.from_url(
+            settings.REDIS_URL, settings.FEED_MAX_ENTRIES
+        )
+    return TableTimelineStore(settings.FEED_MAX_ENTRIES)
+
+
+timeline_store = _store_from_settings()
+
+
+def publish(db: Session, kind: str, item_ids: Sequence[int]) -> None:
+    """Push new items into their authors' followers' timelines. The caller commits."""
+    if item_ids:
+        timeline_store.add(db, fanout_entries(kind, item_ids))
+
+
+def backfill(db: Session, follower_id: int, author_id: int) -> None:
+    for kind in FEED_KINDS:
+        timeline_store.add(
+            db,
+            backfill_entries(kind, follower_id, author_id, timeline_store.max_entries),
+        )
+
+
+def forget_author(db: Session, follower_id: int, author_id: int) -> None:
+    timeline_store.remove_author(db, follower_id, author_id)
+
+
+def trim_timelines(db: Session) -> int:
+    """Trim timelines to ``max_entries``; return how many entries were dropped."""
+    trimmed = timeline_store.trim(db)
+    db.commit()
+    return trimmed
+
+
+async def run_trimmer(session_factory: Callable[[], Session], interval: float) -> None:
+    """Trim the timelines every ``interval`` seconds until cancelled."""
+
+    def trim() -> None:
+        with session_factory() as db:
+            trim_timelines(db)
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(trim)
+        except Exception:
+            logger.exception("Trimming feed timelines failed; will retry")
+
+
+def pulled_authors(db: Session, follower_id: int) -> List[int]:
+    """Users ``follower_id`` follows whose items are read at feed time, not pushed."""
+    return list(
+        db.scalars(
+            select(Follow.followee_id)
+            .join(User, User.id == Follow.followee_id)
+            .where(
+                Follow.follower_id == follower_id,
+                User.follower_count >= settings.FEED_FANOUT_MAX_FOLLOWERS,
+            )
+        )
+    )
+
+
+def _kind_cursor(kind: str, after: Optional[FeedKey]) -> Optional[str]:
+    """A (created_at, id) cursor on one kind's table matching feed cursor ``after``."""
+    if after is None:
+        return None
+    created_at, after_kind, item_id = after
+    if kind != after_kind:
+        # Items of another kind at the cursor's instant all sort before or all after it
+        item_id = _MAX_ID if kind < after_kind else 0
+    return encode_cursor([created_at, item_id])
+
+
+def pull(
+    db: Session,
+    kind: str,
+    author_ids: Sequence[int],
+    limit: int,
+    after: Optional[FeedKey],
+) -> Page[TimelineItem]:
+    """The newest public items of ``author_ids``, as a timeline page would hold them."""
+    model = FEED_KINDS[kind]
+    query = db.query(model.id, model.author_id, model.created_at).filter(
+        model.author_id.in_(author_ids), _is_public(model)
+    )
+    page = paginate(
+        query,
+        [model.created_at.desc(), model.id.desc()],
+        limit=limit,
+        cursor=_kind_cursor(kind, after),
+    )
+    return Page(
+        items=[
+            TimelineItem(kind, item_id, author_id, created_at)
+            for item_id, author_id, created_at in page.items
+        ],
+        next_cursor=page.next_cursor,
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _run_committed_writes(session: Session) -> None:
+    for write in session.info.pop(_PENDING_WRITES_KEY, ()):
+        try:
+            write()
+        except Exception:
+            # The items are committed; a missed write only leaves them out of some feeds
+            logger.warning("Writing feed timelines failed", exc_info=True)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_writes(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_WRITES_KEY, None)
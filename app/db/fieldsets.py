@@ -0,0 +1,80 @@
+"""
+Sparse fieldsets: the ``fields=`` and ``embed=`` query parameters.
+
+A map pin or a list card needs a quest's id, name and start location, not
+the full ``QuestOut`` with its author, both locations, campaign and reference
+objects. A ``FieldSelection`` names the scalar fields and the embedded
+relationships to render. The names allowed are those of the output schema
+that map to columns and relationships of the model, and the same selection
+narrows the SELECT (``load_only``) and the eager loads, not just the JSON.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+
+from app.db.models import Base
+from app.db.schemas import nested_schema
+
+
+class InvalidFieldSelectionError(ValueError):
+    """Raised when ``fields`` or ``embed`` names something the schema does not have."""
+
+
+@lru_cache(maxsize=None)
+def selectable(model: Type[Base], schema: Type[BaseModel]) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """The scalar fields and the embeddable relationships of ``schema`` over ``model``."""
+    mapper = inspect(model)
+    columns, relationships = set(mapper.column_attrs.keys()), set(mapper.relationships.keys())
+    scalars, embeds = set(), set()
+    for name, field in schema.model_fields.items():
+        if nested_schema(field.annotation) is None:
+            if name in columns:
+                scalars.add(name)
+        elif name in relationships:
+            embeds.add(name)
+    return frozenset(scalars), frozenset(embeds)
+
+
+def _parse_names(value: str, allowed: FrozenSet[str], param: str) -> FrozenSet[str]:
+    names = frozenset(name.strip() for name in value.split(",") if name.strip())
+    unknown = names - allowed
+    if unknown:
+        raise InvalidFieldSelectionError(
+            f"Unknown '{param}' value(s): {', '.join(sorted(unknown))}; expected any of {', '.join(sorted(allowed))}"
+        )
+    return names
+
+
+@dataclass(frozen=True)
+class FieldSelection:
+    fields: FrozenSet[str]  # Scalar fields, always including ``id``
+    embeds: FrozenSet[str]  # Relationships rendered in full
+
+    @property
+    def keys(self) -> FrozenSet[str]:
+        return self.fields | self.embeds
+
+    @classmethod
+    def from_params(
+        cls, model: Type[Base], schema: Type[BaseModel], fields: Optional[str], embed: Optional[str]
+    ) -> Optional["FieldSelection"]:
+        """
+        Parse the query parameters; ``None`` when neither is given (render everything).
+
+        Without ``fields`` every scalar field is rendered. Without ``embed``
+        every relationship is embedded, unless ``fields`` is given: a client
+        asking for particular fields gets only the relationships it names.
+        """
+        if fields is None and embed is None:
+            return None
+        scalars, embeds = selectable(model, schema)
+        return cls(
+            fields=(_parse_names(fields, scalars, "fields") if fields is not None else scalars) | {"id"},
+            embeds=(
+                _parse_names(embed, embeds, "embed") if embed is not None
+                else frozenset() if fields is not None else embeds
+            ),
+        )
@@ -0,0 +1,267 @@
+"""
+Radius and bounding-box search over locations.
+
+On PostgreSQL every location carries a generated ``geog`` geography column
+with a GiST index (see the DDL hooks below), so the filters and the distance
+ordering run inside the database. SQLite has no spatial types; there the
+search is narrowed with the ``(latitude, longitude)`` index to the bounding
+box of the search area, and the exact great-circle filter and distance sort
+are applied in Python to that candidate set.
+"""
+import math
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from geoalchemy2 import Geography
+from sqlalchemy import DDL, event, func, literal_column
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.models import Base, Location
+
+T = TypeVar("T")
+
+EARTH_RADIUS_KM = 6371.0088
+# Half the Earth's circumference; no two points are further apart than this
+MAX_RADIUS_KM = 20037.5
+# Nearest-first searches without a radius start from this ring and widen it
+FIRST_RING_KM = 25.0
+RING_GROWTH = 4
+
+_POINT = Geography(geometry_type="POINT", srid=4326)
+
+# PostGIS must be enabled before the generated column can be created. The
+# column is added outside the ORM model so SQLite can create the same tables;
+# migration 0006 adds the same column and index to existing databases.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS postgis").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Location.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE locations ADD COLUMN IF NOT EXISTS geog geography(Point, 4326) "
+        "GENERATED ALWAYS AS "
+        "(ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Location.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_locations_geog ON locations USING GIST (geog)"
+    ).execute_if(dialect="postgresql"),
+)
+
+
+class InvalidSpatialFilterError(ValueError):
+    """Raised when ``near``/``radius_km``/``bbox`` query parameters are malformed."""
+
+
+@dataclass(frozen=True)
+class GeoPoint:
+    latitude: float
+    longitude: float
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    min_longitude: float
+    min_latitude: float
+    max_longitude: float
+    max_latitude: float
+
+    @property
+    def center(self) -> GeoPoint:
+        return GeoPoint(
+            (self.min_latitude + self.max_latitude) / 2,
+            (self.min_longitude + self.max_longitude) / 2,
+        )
+
+
+def _parse_floats(value: str, count: int, name: str) -> List[float]:
+    parts = value.split(",")
+    if len(parts) != count:
+        raise InvalidSpatialFilterError(f"'{name}' must have {count} comma-separated numbers")
+    try:
+        numbers = [float(part) for part in parts]
+    except ValueError:
+        raise InvalidSpatialFilterError(f"'{name}' must have {count} comma-separated numbers")
+    if not all(math.isfinite(number) for number in numbers):
+        raise InvalidSpatialFilterError(f"'{name}' must contain finite numbers")
+    return numbers
+
+
+def _check_coordinate(latitude: float, longitude: float, name: str) -> None:
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        raise InvalidSpatialFilterError(f"'{name}' is outside the valid latitude/longitude range")
+
+
+@dataclass(frozen=True)
+class SpatialFilter:
+    near: Optional[GeoPoint] = None
+    radius_km: Optional[float] = None
+    bbox: Optional[BoundingBox] = None
+
+    @classmethod
+    def from_params(
+        cls, near: Optional[str], radius_km: Optional[float], bbox: Optional[str]
+    ) -> Optional["SpatialFilter"]:
+        """Parse ``near=lat,lon``, ``radius_km=`` and ``bbox=min_lon,min_lat,max_lon,max_lat``."""
+        if near is None and bbox is None:
+            if radius_km is not None:
+                raise InvalidSpatialFilterError("'radius_km' requires 'near'")
+            return None
+
+        point = None
+        if near is not None:
+            latitude, longitude = _parse_floats(near, 2, "near")
+            _check_coordinate(latitude, longitude, "near")
+            point = GeoPoint(latitude, longitude)
+        elif radius_km is not None:
+            raise InvalidSpatialFilterError("'radius_km' requires 'near'")
+
+        box = None
+        if bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = _parse_floats(bbox, 4, "bbox")
+            _check_coordinate(min_lat, min_lon, "bbox")
+            _check_coordinate(max_lat, max_lon, "bbox")
+            if min_lat > max_lat or min_lon > max_lon:
+                raise InvalidSpatialFilterError("'bbox' minimums must not exceed its maximums")
+            box = BoundingBox(min_lon, min_lat, max_lon, max_lat)
+
+        return cls(near=point, radius_km=radius_km, bbox=box)
+
+    @property
+    def origin(self) -> GeoPoint:
+        """The point results are sorted by distance from."""
+        if self.near is not None:
+            return self.near
+        assert self.bbox is not None
+        return self.bbox.center
+
+
+def haversine_km(a: GeoPoint, b: GeoPoint) -> float:
+    lat1, lat2 = math.radians(a.latitude), math.radians(b.latitude)
+    d_lat = lat2 - lat1
+    d_lon = math.radians(b.longitude - a.longitude)
+    h = math.sin(d_lat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(d_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def radius_bounding_box(center: GeoPoint, radius_km: float) -> BoundingBox:
+    """Smallest latitude/longitude box containing every point within ``radius_km``."""
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = center.latitude - d_lat, center.latitude + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        # The circle covers a pole, so it spans every longitude
+        return BoundingBox(-180.0, max(min_lat, -90.0), 180.0, min(max_lat, 90.0))
+
+    ratio = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(center.latitude))
+    d_lon = math.degrees(math.asin(min(1.0, ratio)))
+    min_lon, max_lon = center.longitude - d_lon, center.longitude + d_lon
+    if min_lon < -180 or max_lon > 180:
+        # Crossing the antimeridian; fall back to the full longitude band
+        min_lon, max_lon = -180.0, 180.0
+    return BoundingBox(min_lon, min_lat, max_lon, max_lat)
+
+
+def _geog_point(point: GeoPoint) -> ColumnElement:
+    return func.ST_SetSRID(func.ST_MakePoint(point.longitude, point.latitude), 4326).cast(_POINT)
+
+
+def _postgis_search(
+    query: "Query[T]", spatial: SpatialFilter, skip: int, limit: int, tiebreaker: ColumnElement
+) -> List[T]:
+    geog = literal_column("locations.geog", type_=_POINT)
+    if spatial.near is not None and spatial.radius_km is not None:
+        query = query.filter(
+            func.ST_DWithin(geog, _geog_point(spatial.near), spatial.radius_km * 1000)
+        )
+    if spatial.bbox is not None:
+        box = spatial.bbox
+        envelope = func.ST_MakeEnvelope(
+            box.min_longitude, box.min_latitude, box.max_longitude, box.max_latitude, 4326
+        ).cast(_POINT)
+        query = query.filter(geog.op("&&")(envelope))
+    # ``<->`` on geography is index-assisted nearest-neighbour ordering
+    distance = geog.op("<->")(_geog_point(spatial.origin))
+    return query.order_by(distance, tiebreaker).offset(skip).limit(limit).all()
+
+
+def _within_radius(
+    query: "Query[T]",
+    origin: GeoPoint,
+    radius_km: float,
+    tiebreaker: ColumnElement,
+    coordinates: Callable[[T], Tuple[float, float]],
+) -> List[Tuple[float, T]]:
+    """Rows within ``radius_km`` of ``origin`` with their distance, nearest first."""
+    box = radius_bounding_box(origin, radius_km)
+    candidates = query.filter(
+        Location.latitude.between(box.min_latitude, box.max_latitude),
+        Location.longitude.between(box.min_longitude, box.max_longitude),
+    ).order_by(tiebreaker)
+    matches = []
+    for row in candidates:
+        latitude, longitude = coordinates(row)
+        distance = haversine_km(origin, GeoPoint(latitude, longitude))
+        if distance <= radius_km:
+            matches.append((distance, row))
+    matches.sort(key=lambda match: match[0])
+    return matches
+
+
+def _fallback_search(
+    query: "Query[T]",
+    spatial: SpatialFilter,
+    skip: int,
+    limit: int,
+    tiebreaker: ColumnElement,
+    coordinates: Callable[[T], Tuple[float, float]],
+) -> List[T]:
+    if spatial.bbox is not None:
+        box = spatial.bbox
+        query = query.filter(
+            Location.latitude.between(box.min_latitude, box.max_latitude),
+            Location.longitude.between(box.min_longitude, box.max_longitude),
+        )
+
+    origin = spatial.origin
+    if spatial.radius_km is not None:
+        matches = _within_radius(query, origin, spatial.radius_km, tiebreaker, coordinates)
+    else:
+        # Without a radius, widen a ring around the origin until it holds the
+        # page: the nearest rows are then all inside it, and each step reads
+        # only the rows in its bounding box through the (latitude, longitude)
+        # index instead of every location
+        radius_km = FIRST_RING_KM
+        while True:
+            matches = _within_radius(query, origin, radius_km, tiebreaker, coordinates)
+            if len(matches) >= skip + limit or radius_km >= MAX_RADIUS_KM:
+                break
+            radius_km = min(radius_km * RING_GROWTH, MAX_RADIUS_KM)
+    return [row for _, row in matches[skip:skip + limit]]
+
+
+def spatial_search(
+    query: "Query[T]",
+    spatial: SpatialFilter,
+    skip: int,
+    limit: int,
+    tiebreaker: ColumnElement,
+    coordinates: Callable[[T], Tuple[float, float]],
+) -> List[T]:
+    """
+    Apply ``spatial`` to ``query`` and return one page sorted by distance.
+
+    ``query`` must already select from (or join) the ``locations`` table the
+    filter applies to. ``tiebreaker`` orders rows at equal distance, and
+    ``coordinates`` maps a result row to the latitude and longitude of that
+    location for the SQLite fallback.
+    """
+    if query.session.get_bind().dialect.name == "postgresql":
+        return _postgis_search(query, spatial, skip, limit, tiebreaker)
+    return _fallback_search(query, spatial, skip, limit, tiebreaker, coordinates)
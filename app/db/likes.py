@@ -0,0 +1,255 @@
+"""
+Write-behind buffering for quest likes.
+
+With ``LIKE_BUFFER_ENABLED`` a like only increments a counter in memory (or
+in Redis when ``REDIS_URL`` is set, shared by all workers) instead of taking
+the quest row's lock. A background task started in ``app.main``'s lifespan
+calls ``flush_likes`` every ``LIKE_FLUSH_INTERVAL_SECONDS`` and applies all
+accumulated deltas with one multi-row ``UPDATE``; shutdown flushes whatever
+is left. Quests are rendered with ``pending_likes`` added to the stored count
+(see ``app.api.serialization``) so readers see likes before they are flushed.
+
+A flush first moves the pending deltas aside (``begin_flush``), so likes
+arriving meanwhile accumulate separately, and puts them back if the UPDATE
+fails. A worker that dies mid-flush loses the deltas it had taken.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, cast
+
+from sqlalchemy import Table, case, func, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import listed_quest_tag, response_cache
+from app.core.config import settings
+from app.db import trending
+from app.db.database import off_loop
+from app.db.models import Quest
+
+logger = logging.getLogger(__name__)
+
+quests_table = cast(Table, Quest.__table__)
+# Keeps the CASE expression, and the statement, to a sensible size
+FLUSH_BATCH_SIZE = 500
+
+
+class LikeBuffer(ABC):
+    @abstractmethod
+    def add(self, quest_id: int, count: int = 1) -> int:
+        """Record ``count`` likes; return the quest's total pending likes."""
+
+    @abstractmethod
+    def pending(self, quest_id: int) -> int:
+        """Likes recorded for ``quest_id`` that are not yet in the database."""
+
+    @abstractmethod
+    def begin_flush(self) -> Dict[int, int]:
+        """Take the pending deltas for writing; later likes accumulate separately."""
+
+    @abstractmethod
+    def end_flush(self, committed: bool) -> None:
+        """Forget the deltas ``begin_flush`` took, or restore them if not committed."""
+
+
+class MemoryLikeBuffer(LikeBuffer):
+    """Per-process buffer; each worker flushes its own likes."""
+
+    def __init__(self) -> None:
+        self._pending: Dict[int, int] = {}
+        self._flushing: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, quest_id: int, count: int = 1) -> int:
+        with self._lock:
+            self._pending[quest_id] = self._pending.get(quest_id, 0) + count
+            return self._pending[quest_id] + self._flushing.get(quest_id, 0)
+
+    def pending(self, quest_id: int) -> int:
+        with self._lock:
+            return self._pending.get(quest_id, 0) + self._flushing.get(quest_id, 0)
+
+    def begin_flush(self) -> Dict[int, int]:
+        with self._lock:
+            self._flushing, self._pending = self._pending, {}
+            return dict(self._flushing)
+
+    def end_flush(self, committed: bool) -> None:
+        with self._lock:
+            if not committed:
+                for quest_id, count in self._flushing.items():
+                    self._pending[quest_id] = self._pending.get(quest_id, 0) + count
+            self._flushing = {}
+
+
+class RedisLikeBuffer(LikeBuffer):
+    """
+    Buffer shared by all workers in one Redis hash of quest id -> delta.
+
+    ``pending`` reads a local copy of the hash refreshed at most every
+    ``snapshot_ttl`` seconds, so rendering a page of quests costs at most one
+    round-trip rather than one per quest.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        key: str = "advguild:likes:pending",
+        snapshot_ttl: float = 0.5,
+    ) -> None:
+        self.client = client
+        self.key = key
+        self.snapshot_ttl = snapshot_ttl
+        self._flushing_key: Optional[str] = None
+        self._flushing: Dict[int, int] = {}
+        self._snapshot: Dict[int, int] = {}
+        self._snapshot_at = float("-inf")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisLikeBuffer":
+        import redis
+
+        return cls(
+            redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        )
+
+    @staticmethod
+    def _decode(raw: Dict[Any, Any]) -> Dict[int, int]:
+        return {int(quest_id): int(count) for quest_id, count in raw.items()}
+
+    @off_loop
+    def add(self, quest_id: int, count: int = 1) -> int:
+        total = int(self.client.hincrby(self.key, quest_id, count))
+        with self._lock:
+            self._snapshot[quest_id] = total
+            return total + self._flushing.get(quest_id, 0)
+
+    @off_loop
+    def pending(self, quest_id: int) -> int:
+        with self._lock:
+            if time.monotonic() - self._snapshot_at > self.snapshot_ttl:
+                try:
+                    self._snapshot = self._decode(self.client.hgetall(self.key))
+                except Exception:
+                    logger.warning("Reading pending likes failed", exc_info=True)
+                self._snapshot_at = time.monotonic()
+            return self._snapshot.get(quest_id, 0) + self._flushing.get(quest_id, 0)
+
+    @off_loop
+    def begin_flush(self) -> Dict[int, int]:
+        import redis
+
+        flushing_key = f"{self.key}:flushing:{uuid.uuid4().hex}"
+        try:
+            # Atomic hand-over: likes after this point land in a fresh hash
+            self.client.rename(self.key, flushing_key)
+        except redis.ResponseError:
+            return {}  # Nothing pending
+        deltas = self._decode(self.client.hgetall(flushing_key))
+        with self._lock:
+            self._flushing_key, self._flushing = flushing_key, deltas
+            self._snapshot_at = float("-inf")
+        return dict(deltas)
+
+    @off_loop
+    def end_flush(self, committed: bool) -> None:
+        with self._lock:
+            flushing_key, deltas = self._flushing_key, self._flushing
+            self._flushing_key, self._flushing = None, {}
+        if flushing_key is None:
+            return
+        pipe = self.client.pipeline()
+        if not committed:
+            for quest_id, count in deltas.items():
+                pipe.hincrby(self.key, quest_id, count)
+        pipe.delete(flushing_key)
+        pipe.execute()
+
+
+def _buffer_from_settings() -> Optional[LikeBuffer]:
+    if not settings.LIKE_BUFFER_ENABLED:
+        return None
+    if settings.REDIS_URL:
+        return RedisLikeBuffer.from_url(settings.REDIS_URL)
+    return MemoryLikeBuffer()
+
+
+like_buffer = _buffer_from_settings()
+
+
+def pending_likes(quest_id: int) -> int:
+    return like_buffer.pending(quest_id) if like_buffer is not None else 0
+
+
+def _apply_deltas(db: Session, deltas: Dict[int, int]) -> None:
+    items = list(deltas.items())
+    for start in range(0, len(items), FLUSH_BATCH_SIZE):
+        batch = dict(items[start : start + FLUSH_BATCH_SIZE])
+        # All of a quest's buffered likes count as one event at flush time
+        scores = {
+            quest_id: trending.event_score(count * trending.LIKE_WEIGHT)
+            for quest_id, count in batch.items()
+        }
+        values = {
+            "likes": func.coalesce(quests_table.c.likes, 0)
+            + case(batch, value=quests_table.c.id, else_=0),
+            "trending_score": trending.add_event(
+                quests_table.c.trending_score, case(scores, value=quests_table.c.id)
+            ),
+        }
+        db.execute(
+            update(quests_table).where(quests_table.c.id.in_(batch)).values(**values)
+        )
+
+
+def flush_likes(db: Session, buffer: Optional[LikeBuffer] = None) -> int:
+    """Write the buffered deltas to ``quests.likes``; return how many quests changed."""
+    buffer = buffer or like_buffer
+    if buffer is None:
+        return 0
+    deltas = buffer.begin_flush()
+    if not deltas:
+        buffer.end_flush(committed=True)
+        return 0
+    try:
+        _apply_deltas(db, deltas)
+        # Only the lists showing these quests; see crud_quests.like_quest
+        response_cache.invalidate_on_commit(
+            db,
+            *(
+                tag
+                for quest_id in deltas
+                for tag in (f"quest:{quest_id}", listed_quest_tag(quest_id))
+            ),
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        buffer.end_flush(committed=False)
+        raise
+    buffer.end_flush(committed=True)
+    return len(deltas)
+
+
+async def run_flusher(session_factory: Callable[[], Session], interval: float) -> None:
+    """Flush every ``interval`` seconds until cancelled, then flush once more."""
+
+    def flush() -> None:
+        with session_factory() as db:
+            flush_likes(db)
+
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(flush)
+            except Exception:
+                logger.exception("Flushing buffered likes failed; will retry")
+    except asyncio.CancelledError:
+        await asyncio.to_thread(flush)
+        raise
@@ -1,12 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy.orm import DeclarativeBase, relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 class Base(DeclarativeBase):
     pass
 
 
+def _row_version() -> Column:
+    # Incremented by every UPDATE, Core statements included; entity ETags are built from it
+    return Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("row_version + 1"))
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -19,6 +24,9 @@ class User(Base):
     guild_rank = Column(String(50), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    row_version = _row_version()
+    # Maintained by ``crud_follows``; decides whether ``app.db.feed`` fans this user's items out
+    follower_count = Column(Integer, default=0, server_default="0", nullable=False)
 
     # Relationships
     authored_quests = relationship("Quest", back_populates="author", foreign_keys="Quest.author_id")
@@ -68,12 +76,18 @@ class Location(Base):
     city = Column(String(100), nullable=True)
     country = Column(String(100), nullable=True)
     description = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    row_version = _row_version()
 
     # Relationships
     start_quests = relationship("Quest", back_populates="start_location", foreign_keys="Quest.start_location_id")
     destination_quests = relationship("Quest", back_populates="destination", foreign_keys="Quest.destination_id")
     quest_log_entries = relationship("QuestLogEntry", back_populates="location")
 
+    # Narrows radius/bounding-box searches on databases without PostGIS
+    __table_args__ = (Index("ix_locations_latitude_longitude", "latitude", "longitude"),)
+
 
 class Campaign(Base):
     __tablename__ = "campaigns"
@@ -85,11 +99,15 @@ class Campaign(Base):
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    row_version = _row_version()
 
     # Relationships
     author = relationship("User", back_populates="authored_campaigns")
     quests = relationship("Quest", back_populates="campaign")
 
+    # Feeds pull the newest campaigns of widely followed authors
+    __table_args__ = (Index("ix_campaigns_author_id_created_at_id", "author_id", "created_at", "id"),)
+
 
 class Quest(Base):
     __tablename__ = "quests"
@@ -113,11 +131,15 @@ class Quest(Base):
     completed = Column(Boolean, default=False)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     media_urls = Column(JSON, nullable=True)  # Array of strings
-    likes = Column(Integer, default=0)
-    bookmarks = Column(Integer, default=0)
+    # Sort keys for sort=popular/bookmarked: a NULL would fall out of keyset pages
+    likes = Column(Integer, default=0, server_default="0", nullable=False)
+    bookmarks = Column(Integer, default=0, server_default="0", nullable=False)
+    # Log-space, time-decayed engagement; maintained by ``app.db.trending``
+    trending_score = Column(Float, default=0.0, server_default="0", nullable=False)
     campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    row_version = _row_version()
 
     # Relationships
     author = relationship("User", back_populates="authored_quests", foreign_keys=[author_id])
@@ -129,6 +151,29 @@ class Quest(Base):
     campaign = relationship("Campaign", back_populates="quests")
     # user_bookmarks relationship will be added below
     comments = relationship("Comment", back_populates="quest")
+    # Parsed from ``tags`` by ``crud_tags.set_quest_tags``; indexed for filtering and facets
+    normalized_tags = relationship("Tag", secondary="quest_tags", back_populates="quests")
+
+    # Listings sort on (created_at, id) after filtering on one of these columns;
+    # see alembic/versions/
+    __table_args__ = (
+        Index("ix_quests_created_at_id", "created_at", "id"),
+        Index(
+            "ix_quests_public_created_at_id", "created_at", "id",
+            postgresql_where=text("is_public = true"), sqlite_where=text("is_public = 1"),
+        ),
+        Index("ix_quests_author_id_created_at_id", "author_id", "created_at", "id"),
+        Index("ix_quests_campaign_id_created_at_id", "campaign_id", "created_at", "id"),
+        Index("ix_quests_difficulty_id_created_at_id", "difficulty_id", "created_at", "id"),
+        Index("ix_quests_interest_id_created_at_id", "interest_id", "created_at", "id"),
+        Index("ix_quests_quest_type_id_created_at_id", "quest_type_id", "created_at", "id"),
+        # sort=popular|bookmarked|trending
+        Index("ix_quests_likes_id", "likes", "id"),
+        Index("ix_quests_bookmarks_id", "bookmarks", "id"),
+        Index("ix_quests_trending_score_id", "trending_score", "id"),
+        Index("ix_quests_start_location_id", "start_location_id"),
+        Index("ix_quests_destination_id", "destination_id"),
+    )
 
 
 class Follow(Base):
@@ -143,6 +188,30 @@ class Follow(Base):
     follower = relationship("User", foreign_keys=[follower_id], back_populates="following")
     followee = relationship("User", foreign_keys=[followee_id], back_populates="followers")
 
+    # One follow per pair; the second index finds an author's followers for fan-out
+    __table_args__ = (
+        Index("ix_follows_follower_id_followee_id", "follower_id", "followee_id", unique=True),
+        Index("ix_follows_followee_id", "followee_id"),
+    )
+
+
+class FeedEntry(Base):
+    """An item in a follower's timeline; see ``app.db.feed``."""
+
+    __tablename__ = "feed_entries"
+
+    follower_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    kind = Column(String(20), primary_key=True)  # "quest" or "campaign"
+    item_id = Column(Integer, primary_key=True)
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # The item's creation time, copied so a timeline page reads one index range
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_feed_entries_follower_id_created_at", "follower_id", "created_at", "kind", "item_id"),
+        Index("ix_feed_entries_follower_id_author_id", "follower_id", "author_id"),
+    )
+
 
 class Comment(Base):
     __tablename__ = "comments"
@@ -171,7 +240,10 @@ class UserQuestBookmark(Base):
     quest = relationship("Quest", back_populates="user_bookmarks")
 
     # Add unique constraint to ensure a user can bookmark a quest only once
-    __table_args__ = (UniqueConstraint('user_id', 'quest_id', name='uq_user_quest_bookmark'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'quest_id', name='uq_user_quest_bookmark'),
+        Index("ix_user_quest_bookmarks_quest_id", "quest_id"),
+    )
 
 
 class Achievement(Base):
@@ -195,6 +267,25 @@ class QuestLogEntry(Base):
     location = relationship("Location", back_populates="quest_log_entries")
 
 
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, nullable=False)
+
+    quests = relationship("Quest", secondary="quest_tags", back_populates="normalized_tags")
+
+
+class QuestTag(Base):
+    __tablename__ = "quest_tags"
+
+    quest_id = Column(Integer, ForeignKey("quests.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+
+    # The primary key serves lookups by quest; this one finds the quests with a tag
+    __table_args__ = (Index("ix_quest_tags_tag_id_quest_id", "tag_id", "quest_id"),)
+
+
 # Update User and Quest models with relationships to UserQuestBookmark
 User.quest_bookmarks = relationship("UserQuestBookmark", back_populates="user", cascade="all, delete-orphan")
 Quest.user_bookmarks = relationship("UserQuestBookmark", back_populates="quest", cascade="all, delete-orphan")
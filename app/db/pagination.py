@@ -0,0 +1,181 @@
+"""
+Keyset (cursor) pagination shared by the CRUD modules.
+
+Offset pagination makes the database walk and discard every skipped row, and
+pages drift when rows are inserted while a client is paging. Keyset pagination
+instead remembers the sort key of the last row returned and asks for the rows
+that sort after it, which an index on the sort key answers directly.
+
+Cursors are opaque to clients: a URL-safe base64 encoding of the sort key
+values of the last row on the page.
+"""
+import base64
+import binascii
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar, cast
+
+from sqlalchemy import DateTime, Integer, Numeric, String, and_, func, or_
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+
+T = TypeVar("T")
+
+# Response header list endpoints use to hand out the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client supplies a cursor that cannot be decoded."""
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def _split_order(order_by: Sequence[ColumnElement]) -> List[Tuple[ColumnElement, bool]]:
+    """Turn ``[Model.a, Model.b.desc()]`` into ``[(Model.a, False), (Model.b, True)]``."""
+    keys = []
+    for clause in order_by:
+        if isinstance(clause, UnaryExpression) and clause.modifier in (
+            operators.desc_op,
+            operators.asc_op,
+        ):
+            keys.append((cast(ColumnElement, clause.element), clause.modifier is operators.desc_op))
+        else:
+            keys.append((clause, False))
+    return keys
+
+
+def _is_datetime(column: ColumnElement) -> bool:
+    return isinstance(column.type, DateTime)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[ColumnElement]) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise InvalidCursorError("Cursor does not match this listing")
+
+    return [_cursor_value(column, value) for column, value in zip(columns, payload)]
+
+
+def _cursor_value(column: ColumnElement, value: Any) -> Any:
+    """
+    Check a decoded cursor value against the type of its sort column, so a
+    tampered cursor is rejected here rather than compared against the column
+    in whatever way the database coerces it.
+    """
+    if value is None:
+        if getattr(column, "nullable", True):
+            return None
+        raise InvalidCursorError("Cursor does not match this listing")
+    if _is_datetime(column):
+        if not isinstance(value, str):
+            raise InvalidCursorError("Cursor does not match this listing")
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError as exc:
+            raise InvalidCursorError("Malformed cursor") from exc
+    # bool is an int subclass, and JSON allows NaN and Infinity
+    if isinstance(value, bool) or (isinstance(value, float) and not math.isfinite(value)):
+        raise InvalidCursorError("Cursor does not match this listing")
+    if isinstance(column.type, Integer):
+        expected: Tuple[type, ...] = (int,)
+    elif isinstance(column.type, Numeric):
+        expected = (int, float)
+    elif isinstance(column.type, String):
+        expected = (str,)
+    else:
+        # Computed sort keys, such as search ranks, have no declared type
+        expected = (int, float, str)
+    if not isinstance(value, expected):
+        raise InvalidCursorError("Cursor does not match this listing")
+    return value
+
+
+def _comparable(column: ColumnElement, dialect_name: str) -> ColumnElement:
+    # SQLite stores timestamps as text, and ``CURRENT_TIMESTAMP`` defaults have no
+    # fractional seconds while bound datetimes always do, so compare them as
+    # Julian day numbers instead of strings.
+    if dialect_name == "sqlite" and _is_datetime(column):
+        return func.julianday(column)
+    return column
+
+
+def _comparable_value(value: Any, dialect_name: str) -> Any:
+    if dialect_name == "sqlite" and isinstance(value, datetime):
+        return func.julianday(value.strftime("%Y-%m-%d %H:%M:%S.%f"))
+    return value
+
+
+def _after(
+    keys: List[Tuple[ColumnElement, bool]], values: List[Any], dialect_name: str
+) -> ColumnElement:
+    """
+    Build the predicate selecting rows that sort strictly after ``values``.
+
+    For keys ``(a, b, c)`` this expands to
+    ``a > :a OR (a = :a AND b > :b) OR (a = :a AND b = :b AND c > :c)``, with
+    ``<`` for descending keys, so mixed sort directions work too.
+    """
+    columns = [_comparable(column, dialect_name) for column, _ in keys]
+    bound = [_comparable_value(value, dialect_name) for value in values]
+    clauses = []
+    for i, (_, descending) in enumerate(keys):
+        step = columns[i] < bound[i] if descending else columns[i] > bound[i]
+        clauses.append(and_(*(columns[j] == bound[j] for j in range(i)), step))
+    return or_(*clauses)
+
+
+def paginate(
+    query: "Query[T]",
+    order_by: Sequence[ColumnElement],
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    cursor_values: Optional[Callable[[T], Sequence[Any]]] = None,
+) -> Page[T]:
+    """
+    Order ``query`` by ``order_by`` and return one page of results.
+
+    ``order_by`` must end in a unique column (normally the primary key) so the
+    ordering is total. When ``cursor`` is given the page starts right after the
+    row it was issued for; ``skip`` is still honoured for offset-style clients.
+    ``next_cursor`` is ``None`` on the last page.
+
+    The cursor is read from the last row's attributes named after the
+    ``order_by`` columns; pass ``cursor_values`` to extract the values when the
+    rows are tuples or sort on computed expressions.
+    """
+    keys = _split_order(order_by)
+    if cursor:
+        dialect_name = query.session.get_bind().dialect.name
+        values = decode_cursor(cursor, [column for column, _ in keys])
+        query = query.filter(_after(keys, values, dialect_name))
+
+    rows = query.order_by(*order_by).offset(skip).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return Page(items=rows)
+
+    rows = rows[:limit]
+    last = rows[-1]
+    if cursor_values is not None:
+        values = list(cursor_values(last))
+    else:
+        values = [getattr(last, str(column.key)) for column, _ in keys]
+    return Page(items=rows, next_cursor=encode_cursor(values))
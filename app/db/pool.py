@@ -0,0 +1,110 @@
+"""
+Connection-pool configuration and per-worker pool statistics.
+
+``engine_options`` turns the ``DB_POOL_*`` settings into ``create_engine``
+keyword arguments. The pool classes it selects record how long each checkout
+waited for a connection, which together with the pool's own counters is what
+``pool_status`` reports. The numbers are per process: with several workers,
+each reports its own pool.
+"""
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+
+@dataclass
+class PoolWaitStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+class _WaitTimingMixin:
+    """Time ``_do_get``, i.e. how long a checkout took to obtain a connection."""
+
+    wait_stats: PoolWaitStats
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+        self._wait_stats_lock = threading.Lock()
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            with self._wait_stats_lock:
+                self.wait_stats.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        with self._wait_stats_lock:
+            stats = self.wait_stats
+            stats.checkouts += 1
+            stats.wait_seconds_total += waited
+            stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+        return connection
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def engine_options(url: str, async_: bool = False) -> Dict[str, Any]:
+    """``create_engine`` keyword arguments for ``url`` from the pool settings."""
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    # In-memory SQLite is bound to a single connection; there is nothing to size
+    if _is_memory_sqlite(url):
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if async_ else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+    if timeout and make_url(url).get_backend_name() == "postgresql":
+        if async_:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """Current occupancy and checkout wait times of ``engine``'s pool."""
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # Counts down from -size until the base pool is exhausted
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, _WaitTimingMixin):
+        stats = asdict(pool.wait_stats)
+        checkouts = stats["checkouts"]
+        stats["wait_seconds_avg"] = stats["wait_seconds_total"] / checkouts if checkouts else 0.0
+        status["wait"] = stats
+    return status
@@ -0,0 +1,94 @@
+"""
+Per-request SQL statement counts and timings, and the slow-query log.
+
+Cursor-execute hooks on every ``Engine`` time each statement. Inside
+``track_queries()`` (entered per request by ``QueryStatsMiddleware``) the
+statements are added to that block's ``QueryStats``: how many ran, the total
+time spent in the database and the slowest one. The stats live in a context
+variable, which Starlette copies into the threadpool that runs sync
+endpoints, so sync and async endpoints are both covered.
+
+Independently of any request, a statement slower than
+``SLOW_QUERY_THRESHOLD_MS`` is logged to ``app.db.slow_queries`` with its
+parameters reduced to their types, so no user data reaches the logs.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+slow_query_logger = logging.getLogger("app.db.slow_queries")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds, self.slowest_statement = seconds, statement
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements executed in this block (and threads it hands work to)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Replace every bound value with its type name, keeping the shape."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: the first row is representative
+            return [redact_parameters(parameters[0]), f"... {len(parameters)} rows"]
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    # Kept on the execution context, so a failed statement leaves nothing behind
+    context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    elapsed = time.perf_counter() - context._query_started
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    threshold_ms = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold_ms is not None and elapsed * 1000 >= threshold_ms:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms): %s",
+            elapsed * 1000,
+            statement,
+            extra={
+                "duration_ms": round(elapsed * 1000, 2),
+                "statement": statement,
+                "parameters": redact_parameters(parameters),
+                "executemany": executemany,
+            },
+        )
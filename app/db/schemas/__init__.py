@@ -1,10 +1,23 @@
 from .achievement import AchievementBase, AchievementOut
-from .base import BaseOutputSchema
+from .base import BaseOutputSchema, nested_schema
 from .campaign import CampaignBase, CampaignCreate, CampaignOut, CampaignUpdate
 from .comment import CommentBase, CommentCreate, CommentOut
+from .feed import FeedItemOut
 from .follow import FollowCreate, FollowOut
 from .location import LocationBase, LocationCreate, LocationOut, LocationUpdate
-from .quest import QuestBase, QuestCreate, QuestListResponse, QuestOut, QuestUpdate
+from .quest import (
+    FacetCount,
+    QuestBase,
+    QuestCreate,
+    QuestFacets,
+    QuestImportError,
+    QuestImportResult,
+    QuestImportRow,
+    QuestListResponse,
+    QuestOut,
+    QuestSearchHit,
+    QuestUpdate,
+)
 from .quest_log_entry import (
     QuestLogEntryBase,
     QuestLogEntryCreate,
@@ -17,6 +30,7 @@ from .reference import (
     InterestOut,
     QuestTypeBase,
     QuestTypeOut,
+    ReferenceDataOut,
 )
 from .token import Token, TokenData
 from .user import UserBase, UserCreate, UserLogin, UserOut, UserResponse, UserUpdate
@@ -25,6 +39,7 @@ __all__ = [
     "AchievementBase",
     "AchievementOut",
     "BaseOutputSchema",
+    "nested_schema",
     "CampaignBase",
     "CampaignCreate",
     "CampaignUpdate",
@@ -34,6 +49,8 @@ __all__ = [
     "CommentOut",
     "DifficultyBase",
     "DifficultyOut",
+    "FacetCount",
+    "FeedItemOut",
     "FollowCreate",
     "FollowOut",
     "InterestBase",
@@ -46,12 +63,18 @@ __all__ = [
     "QuestCreate",
     "QuestUpdate",
     "QuestOut",
+    "QuestFacets",
+    "QuestImportError",
+    "QuestImportResult",
+    "QuestImportRow",
     "QuestListResponse",
+    "QuestSearchHit",
     "QuestLogEntryBase",
     "QuestLogEntryCreate",
     "QuestLogEntryOut",
     "QuestTypeBase",
     "QuestTypeOut",
+    "ReferenceDataOut",
     "Token",
     "TokenData",
     "UserBase",
@@ -1,7 +1,21 @@
+from typing import Any, Optional, Type, get_args, get_origin
+
 from pydantic import BaseModel, ConfigDict
 
 
 # Base class for all output schemas
 class BaseOutputSchema(BaseModel):
     # Pydantic V2 uses model_config instead of class Config
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+def nested_schema(annotation: Any) -> Optional[Type[BaseModel]]:
+    """Return the Pydantic model wrapped by ``Optional[...]``/``List[...]``, if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    if get_origin(annotation) is not None:
+        for arg in get_args(annotation):
+            nested = nested_schema(arg)
+            if nested is not None:
+                return nested
+    return None
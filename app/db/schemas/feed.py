@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+from .campaign import CampaignOut
+from .quest import QuestOut
+
+
+# Feed Schemas
+class FeedItemOut(BaseModel):
+    """A new quest or campaign by a followed user; the field named by ``type`` is set."""
+
+    type: Literal["quest", "campaign"]
+    id: int
+    created_at: datetime
+    quest: Optional[QuestOut] = None
+    campaign: Optional[CampaignOut] = None
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, model_validator
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from .base import BaseOutputSchema
@@ -35,6 +35,56 @@ class QuestCreate(QuestBase):
     pass
 
 
+class QuestImportRow(BaseModel):
+    """
+    One quest in a bulk import: the fields of ``QuestCreate``, except that
+    locations, interest, difficulty and quest type may be given by name
+    instead of id, as in ``data/sample_data.json``.
+    """
+    name: str
+    synopsis: str
+    start_location_id: Optional[int] = None
+    start_location_name: Optional[str] = None
+    destination_id: Optional[int] = None
+    destination_name: Optional[str] = None
+    interest_id: Optional[int] = None
+    interest_name: Optional[str] = None
+    itinerary: str
+    difficulty_id: Optional[int] = None
+    difficulty_name: Optional[str] = None
+    is_public: bool = True
+    quest_type_id: Optional[int] = None
+    quest_type_name: Optional[str] = None
+    tags: Optional[str] = None
+    quest_giver: Optional[str] = None
+    reward: Optional[str] = None
+    companions: Optional[str] = None
+    lore_excerpt: Optional[str] = None
+    artifacts_discovered: Optional[str] = None
+    completed: bool = False
+    media_urls: Optional[List[str]] = None
+    campaign_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def _require_references(self) -> "QuestImportRow":
+        for reference in ("start_location", "interest", "difficulty", "quest_type"):
+            if getattr(self, f"{reference}_id") is None and getattr(self, f"{reference}_name") is None:
+                raise ValueError(f"{reference}_id or {reference}_name is required")
+        return self
+
+
+class QuestImportError(BaseModel):
+    row: int  # Position in the array or NDJSON stream, from 0
+    errors: List[str]
+
+
+class QuestImportResult(BaseModel):
+    committed: bool
+    created: int
+    quest_ids: List[int] = []  # Ascending; rows are created in order
+    errors: List[QuestImportError] = []
+
+
 class QuestUpdate(BaseModel):
     name: Optional[str] = None
     synopsis: Optional[str] = None
@@ -66,6 +116,8 @@ class QuestOut(BaseModel):
     difficulty_id: Optional[int] = None
     quest_type_id: Optional[int] = None
     author_id: int
+    likes: int = 0
+    bookmarks: int = 0
     created_at: datetime
     updated_at: Optional[datetime] = None
     author: Optional[UserOut] = None
@@ -79,6 +131,28 @@ class QuestOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class QuestSearchHit(BaseModel):
+    quest: QuestOut
+    rank: float
+    # Matched fields as escaped HTML, the matching words wrapped in <mark></mark>
+    highlights: Dict[str, str] = {}
+
+
+class FacetCount(BaseModel):
+    id: int
+    name: str
+    count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class QuestFacets(BaseModel):
+    tags: List[FacetCount] = []
+    difficulties: List[FacetCount] = []
+    interests: List[FacetCount] = []
+    quest_types: List[FacetCount] = []
+
+
 class QuestListResponse(BaseModel):
     quests: List[QuestOut]
     total: int
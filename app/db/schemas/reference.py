@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic import BaseModel
 
 from .base import BaseOutputSchema
@@ -25,4 +27,10 @@ class InterestBase(BaseModel):
 
 
 class InterestOut(InterestBase, BaseOutputSchema):
-    id: int
\ No newline at end of file
+    id: int
+
+
+class ReferenceDataOut(BaseModel):
+    interests: List[InterestOut]
+    difficulties: List[DifficultyOut]
+    quest_types: List[QuestTypeOut]
@@ -0,0 +1,169 @@
+"""
+Ranked full-text search over quests.
+
+On PostgreSQL every quest carries a generated ``search_vector`` tsvector
+column with a GIN index (see the DDL hooks below). Fields are weighted so a
+match in the name outranks one in the tags, then the synopsis, then the lore
+excerpt and quest giver. Queries are parsed with ``websearch_to_tsquery``,
+ranked with ``ts_rank_cd`` and highlighted with ``ts_headline``.
+
+SQLite uses an FTS5 table over the same columns, kept in step with
+``quests`` by triggers. There every word of the query must match (the last
+one as a prefix), ranking is ``bm25`` with the same field weights and
+highlights come from ``highlight()``.
+
+Neither escapes the text around a match, so the databases mark matches with
+control characters and ``highlights_from`` HTML-escapes the field before
+turning those into ``<mark>`` tags.
+
+Both produce a subquery of matching quest ids with a ``rank`` where higher is
+better, plus one highlighted copy of each searchable field.
+"""
+import html
+import re
+from typing import Any, Dict, List
+
+from sqlalchemy import DDL, Float, Text, column, event, func, literal_column, select, table
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, Subquery
+
+from app.db.models import Quest
+
+# Searchable fields, strongest first, with their weights in each database
+SEARCH_FIELDS = ("name", "tags", "synopsis", "lore_excerpt", "quest_giver")
+_TSVECTOR_WEIGHTS = {"name": "A", "tags": "B", "synopsis": "C", "lore_excerpt": "D", "quest_giver": "D"}
+_BM25_WEIGHTS = {"name": 10.0, "tags": 5.0, "synopsis": 2.0, "lore_excerpt": 1.0, "quest_giver": 1.0}
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+# What the databases wrap matches in: quest text has no reason to contain
+# them, and they survive html.escape() unchanged
+_MATCH_START = "\x02"
+_MATCH_STOP = "\x03"
+_HEADLINE_OPTIONS = f"StartSel={_MATCH_START}, StopSel={_MATCH_STOP}, MaxFragments=2"
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Fresh databases get the search index from these DDL hooks and existing ones
+# from migration 0007; keep the two in step
+_search_vector = " || ".join(
+    f"setweight(to_tsvector('english', coalesce({field}, '')), '{weight}')"
+    for field, weight in _TSVECTOR_WEIGHTS.items()
+)
+event.listen(
+    Quest.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE quests ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({_search_vector}) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Quest.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_quests_search_vector ON quests USING GIN (search_vector)"
+    ).execute_if(dialect="postgresql"),
+)
+
+# External-content FTS5 table: the index only, the text stays in ``quests``
+_fields = ", ".join(SEARCH_FIELDS)
+_new = ", ".join(f"new.{field}" for field in SEARCH_FIELDS)
+_old = ", ".join(f"old.{field}" for field in SEARCH_FIELDS)
+_SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS quests_fts USING fts5({_fields}, "
+    "content='quests', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS quests_fts_insert AFTER INSERT ON quests BEGIN "
+    f"INSERT INTO quests_fts(rowid, {_fields}) VALUES (new.id, {_new}); END",
+    "CREATE TRIGGER IF NOT EXISTS quests_fts_delete AFTER DELETE ON quests BEGIN "
+    f"INSERT INTO quests_fts(quests_fts, rowid, {_fields}) VALUES ('delete', old.id, {_old}); END",
+    f"CREATE TRIGGER IF NOT EXISTS quests_fts_update AFTER UPDATE OF {_fields} ON quests BEGIN "
+    f"INSERT INTO quests_fts(quests_fts, rowid, {_fields}) VALUES ('delete', old.id, {_old}); "
+    f"INSERT INTO quests_fts(rowid, {_fields}) VALUES (new.id, {_new}); END",
+]
+for statement in _SQLITE_DDL:
+    event.listen(Quest.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+# The triggers go with ``quests``; the index table would otherwise outlive it
+event.listen(
+    Quest.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS quests_fts").execute_if(dialect="sqlite"),
+)
+
+_quests_fts = table("quests_fts", *(column(field, Text) for field in SEARCH_FIELDS))
+
+
+class InvalidSearchQueryError(ValueError):
+    """Raised when a search query contains nothing that can be searched for."""
+
+
+def _fts5_query(q: str) -> str:
+    """Quote each word so user input cannot use (or break) FTS5 query syntax."""
+    words = _WORD.findall(q)
+    if not words:
+        raise InvalidSearchQueryError("Search query must contain at least one word")
+    terms = [f'"{word}"' for word in words]
+    # Match partly typed last words, e.g. "drag" finds "dragon"
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _postgresql_hits(q: str) -> Subquery:
+    if not _WORD.search(q):
+        raise InvalidSearchQueryError("Search query must contain at least one word")
+    query = func.websearch_to_tsquery("english", q)
+    search_vector: ColumnElement[Any] = literal_column("quests.search_vector")
+    quests = Quest.__table__
+    highlights = [
+        func.ts_headline("english", quests.c[field], query, _HEADLINE_OPTIONS).label(field)
+        for field in SEARCH_FIELDS
+    ]
+    return (
+        select(quests.c.id, func.ts_rank_cd(search_vector, query).cast(Float).label("rank"), *highlights)
+        .where(search_vector.op("@@")(query))
+        .subquery("hits")
+    )
+
+
+def _sqlite_hits(q: str) -> Subquery:
+    fts: ColumnElement[Any] = literal_column("quests_fts")
+    weights: List[ColumnElement[Any]] = [
+        literal_column(repr(_BM25_WEIGHTS[field])) for field in SEARCH_FIELDS
+    ]
+    highlights = [
+        func.highlight(fts, index, _MATCH_START, _MATCH_STOP).label(field)
+        for index, field in enumerate(SEARCH_FIELDS)
+    ]
+    return (
+        # bm25 is lower for better matches; negate it so higher is better everywhere
+        select(literal_column("quests_fts.rowid").label("id"), (-func.bm25(fts, *weights)).label("rank"), *highlights)
+        .select_from(_quests_fts)
+        .where(fts.op("MATCH")(_fts5_query(q)))
+        .subquery("hits")
+    )
+
+
+def search_hits(db: Session, q: str) -> Subquery:
+    """
+    Return a subquery of the quests matching ``q``.
+
+    Columns are ``id``, ``rank`` (higher is better) and one column per entry of
+    ``SEARCH_FIELDS`` holding that field with the matches highlighted.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return _postgresql_hits(q)
+    return _sqlite_hits(q)
+
+
+def highlights_from(values: Dict[str, object]) -> Dict[str, str]:
+    """
+    Keep only the highlighted fields that actually contain a match, as HTML:
+    the field text escaped and each match wrapped in ``<mark></mark>``.
+    """
+    return {
+        field: html.escape(value)
+        .replace(_MATCH_START, HIGHLIGHT_START)
+        .replace(_MATCH_STOP, HIGHLIGHT_STOP)
+        for field, value in values.items()
+        if field in SEARCH_FIELDS and isinstance(value, str) and _MATCH_START in value
+    }
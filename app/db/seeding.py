@@ -0,0 +1,171 @@
+"""
+Bulk, idempotent loading of seed data.
+
+Each table is written with one executemany ``INSERT`` of the rows it does not
+have yet, keyed on a natural key (name, email, title). The ids of existing and
+new rows are collected into in-memory maps, and the foreign keys of dependent
+tables are resolved from those maps. So seeding costs a few statements per
+table, not a query and a flush per row. Keys with a unique constraint also get
+``ON CONFLICT DO NOTHING``, so two seeders running at once cannot collide.
+Running the seeder again adds nothing.
+
+``synthetic_data`` builds any number of extra users, locations and quests from
+the sample data, the same ones for the same ``seed``, for benchmark databases.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.hashing import get_password_hash
+from app.db import crud_reference_data, crud_tags, trending
+from app.db.database import dialect_insert
+from app.db.models import Base, Campaign, Difficulty, Interest, Location, Quest, QuestType, User
+
+DEFAULT_PASSWORD = "password123"
+
+# Reference tables by the key each sample quest names them with
+REFERENCE_TABLES = {
+    "quest_type_name": ("quest_types", QuestType),
+    "difficulty_name": ("difficulties", Difficulty),
+    "interest_name": ("interests", Interest),
+}
+
+# Synthetic quests are spread over this much time before ``SYNTHETIC_NOW``
+SYNTHETIC_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+SYNTHETIC_SPAN = timedelta(days=365)
+
+
+def upsert_rows(db: Session, model: type[Base], key: str, rows: Iterable[Dict[str, Any]]) -> Dict[Any, int]:
+    """
+    Insert the ``rows`` whose ``key`` value is not in ``model``'s table yet.
+
+    Returns the id of every row in the table by its ``key`` value, new and
+    existing. Rows repeating a key already seen are skipped.
+    """
+    table = model.__table__
+    ids: Dict[Any, int] = {value: id_ for value, id_ in db.execute(select(table.c[key], table.c.id))}
+    missing: Dict[Any, Dict[str, Any]] = {}
+    for row in rows:
+        if row[key] not in ids:
+            missing.setdefault(row[key], row)
+    if not missing:
+        return ids
+
+    statement = dialect_insert(db)(table)
+    if table.c[key].unique:
+        statement = statement.on_conflict_do_nothing(index_elements=[key])
+    statement = statement.returning(table.c[key], table.c.id)
+    # An executemany needs the same columns in every row; omitted ones keep their defaults
+    batches: Dict[frozenset, List[Dict[str, Any]]] = {}
+    for row in missing.values():
+        batches.setdefault(frozenset(row), []).append(row)
+    for batch in batches.values():
+        ids.update({value: id_ for value, id_ in db.execute(statement, batch)})
+    if not missing.keys() <= ids.keys():
+        # Another seeder won a conflict; its rows were not returned
+        ids = {value: id_ for value, id_ in db.execute(select(table.c[key], table.c.id))}
+    return ids
+
+
+def seed(db: Session, data: Dict[str, List[Dict[str, Any]]], password: str = DEFAULT_PASSWORD) -> Dict[str, int]:
+    """
+    Load ``data``, in the format of ``data/sample_data.json``, into the database.
+
+    Quests name their start location, quest type, difficulty and interest,
+    and optionally their author by ``author_email``; campaigns and quests
+    without one belong to the first user. Every user gets ``password``,
+    hashed once. Commits, then links quest tags. Returns the number of rows
+    of each kind in ``data``.
+    """
+    references = {
+        key: upsert_rows(db, model, "name", data.get(section, []))
+        for key, (section, model) in REFERENCE_TABLES.items()
+    }
+
+    hashed_password = get_password_hash(password)
+    users = upsert_rows(db, User, "email", [
+        {**user, "hashed_password": hashed_password} for user in data["users"]
+    ])
+    default_author = users[data["users"][0]["email"]]
+
+    locations = upsert_rows(db, Location, "name", data["locations"])
+    upsert_rows(db, Campaign, "title", [
+        {"author_id": default_author, **campaign} for campaign in data.get("campaigns", [])
+    ])
+
+    quests = []
+    for quest in data["sample_quests"]:
+        values = {key: value for key, value in quest.items() if key in Quest.__table__.c}
+        values["author_id"] = users[quest["author_email"]] if "author_email" in quest else default_author
+        values["start_location_id"] = locations[quest["start_location_name"]]
+        for key, ids in references.items():
+            values[f"{key[:-len('_name')]}_id"] = ids[quest[key]]
+        quests.append(values)
+    upsert_rows(db, Quest, "name", quests)
+
+    db.commit()
+    crud_reference_data.invalidate_snapshot()
+    crud_tags.backfill_quest_tags(db)
+
+    counts = {section: len(data.get(section, [])) for section, _ in REFERENCE_TABLES.values()}
+    counts.update(
+        users=len(data["users"]),
+        locations=len(data["locations"]),
+        campaigns=len(data.get("campaigns", [])),
+        quests=len(data["sample_quests"]),
+    )
+    return counts
+
+
+def synthetic_data(sample: Dict[str, List[Dict[str, Any]]], scale: int, seed: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Return ``sample`` plus ``scale`` synthetic users, locations and quests.
+
+    Synthetic rows copy sample rows with numbered names, jittered coordinates,
+    random authors, locations and references, creation times over the year
+    before ``SYNTHETIC_NOW``, and like and bookmark counts with a matching
+    trending score. The same ``seed`` always gives the same rows.
+    """
+    rng = random.Random(seed)
+    users = list(sample["users"])
+    locations = list(sample["locations"])
+    quests = list(sample["sample_quests"])
+
+    for i in range(1, scale + 1):
+        template = sample["users"][i % len(sample["users"])]
+        local, domain = template["email"].split("@")
+        users.append({**template, "email": f"{local}+{i}@{domain}", "display_name": f"{template['display_name']} {i}"})
+
+        template = sample["locations"][i % len(sample["locations"])]
+        locations.append({
+            **template,
+            "name": f"{template['name']} {i}",
+            "latitude": max(-90.0, min(90.0, template["latitude"] + rng.uniform(-2, 2))),
+            "longitude": (template["longitude"] + rng.uniform(-2, 2) + 180) % 360 - 180,
+        })
+
+    for i in range(1, scale + 1):
+        template = sample["sample_quests"][i % len(sample["sample_quests"])]
+        created_at = SYNTHETIC_NOW - SYNTHETIC_SPAN * rng.random()
+        likes = int(rng.paretovariate(1.5)) - 1
+        bookmarks = int(rng.paretovariate(2.0)) - 1
+        weight = likes * trending.LIKE_WEIGHT + bookmarks * trending.BOOKMARK_WEIGHT
+        quest = {
+            **template,
+            "name": f"{template['name']} #{i}",
+            "author_email": rng.choice(users)["email"],
+            "start_location_name": rng.choice(locations)["name"],
+            "created_at": created_at,
+            "likes": likes,
+            "bookmarks": bookmarks,
+            # As if every like and bookmark had happened when the quest was created
+            "trending_score": trending.event_score(weight, created_at) if weight else 0.0,
+        }
+        for key, (section, _) in REFERENCE_TABLES.items():
+            quest[key] = rng.choice(sample[section])["name"]
+        quests.append(quest)
+
+    return {**sample, "users": users, "locations": locations, "sample_quests": quests}
@@ -0,0 +1,45 @@
+"""
+Time-decayed trending score for quests.
+
+Every like and bookmark adds its weight to a quest's score, and the weight
+halves every ``TRENDING_HALF_LIFE_HOURS``. Instead of decaying every score
+over time, each event's weight is scaled *up* by how late it happened,
+``weight * 2 ** (hours since EPOCH / half-life)``: that preserves the order
+of quests at any moment, so the stored score never needs refreshing and a
+plain index on ``quests.trending_score`` serves the top-N.
+
+Those sums grow exponentially, so the column stores their natural log and
+events are added with a log-sum-exp update inside the same ``UPDATE`` that
+bumps the counter. Removing a bookmark does not lower the score: the event
+still happened. Quests without any events score 0.
+"""
+import math
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+LIKE_WEIGHT = 1.0
+BOOKMARK_WEIGHT = 2.0
+
+
+def event_score(weight: float, at: Optional[datetime] = None) -> float:
+    """The log-space score of one event of ``weight`` happening ``at`` (default now)."""
+    at = at or datetime.now(timezone.utc)
+    hours = (at - EPOCH).total_seconds() / 3600
+    return math.log(weight) + math.log(2) * hours / settings.TRENDING_HALF_LIFE_HOURS
+
+
+def add_event(score: ColumnElement, event: ColumnElement) -> ColumnElement:
+    """
+    SQL for ``ln(exp(score) + exp(event))``.
+
+    Written as ``max(a, b) + ln(1 + exp(-|a - b|))`` so nothing large is ever
+    exponentiated.
+    """
+    larger = case((score > event, score), else_=event)
+    return larger + func.ln(1 + func.exp(-func.abs(score - event)))
@@ -1,11 +1,29 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST
+import asyncio
+import contextlib
+import os
+from dataclasses import asdict
 from contextlib import asynccontextmanager
 from typing import Dict, Any, AsyncGenerator
 
 from app.core.config import settings
-from app.db.database import engine
+from app.core.cache import MonitoredCache, response_cache
+from app.core.hashing import PasswordHashingBusyError, password_hasher
+from app.core import metrics
+from app.core.compression import CompressionMiddleware
+from app.core.middleware import MetricsMiddleware, QueryStatsMiddleware
+from app.core.principal_cache import principal_cache
+from app.db.database import SessionLocal, async_engine, engine
+from app.db import crud_reference_data, feed, likes
 from app.db.models import Base
+from app.db.fieldsets import InvalidFieldSelectionError
+from app.db.geo import InvalidSpatialFilterError
+from app.db.pool import pool_status
+from app.db.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
+from app.db.search import InvalidSearchQueryError
 from app.api.v1.api import api_router
 
 
@@ -13,7 +31,33 @@ from app.api.v1.api import api_router
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Create tables on startup
     Base.metadata.create_all(bind=engine)
+    # Reference data is served from memory; load it before the first request
+    with SessionLocal() as db:
+        crud_reference_data.load_snapshot(db)
+    password_hasher.start()
+    flusher = None
+    if likes.like_buffer is not None:
+        flusher = asyncio.create_task(
+            likes.run_flusher(SessionLocal, settings.LIKE_FLUSH_INTERVAL_SECONDS)
+        )
+    trimmer = None
+    if isinstance(feed.timeline_store, feed.TableTimelineStore):
+        trimmer = asyncio.create_task(
+            feed.run_trimmer(SessionLocal, settings.FEED_TRIM_INTERVAL_SECONDS)
+        )
     yield
+    if trimmer is not None:
+        trimmer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await trimmer
+    if flusher is not None:
+        # Cancelling runs one last flush so buffered likes are not lost
+        flusher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await flusher
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 app = FastAPI(
@@ -35,11 +79,41 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Server-Timing"],
     )  # type: ignore
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Added last so it wraps everything else, CORS preflights included
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    metrics.register_engine("sync", engine)
+    if async_engine is not None:
+        metrics.register_engine("async", async_engine.sync_engine)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.exception_handler(InvalidCursorError)
+@app.exception_handler(InvalidFieldSelectionError)
+@app.exception_handler(InvalidSearchQueryError)
+@app.exception_handler(InvalidSpatialFilterError)
+async def invalid_query_parameter_handler(request: Request, exc: ValueError) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(PasswordHashingBusyError)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusyError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many concurrent sign-ins, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/")
 async def root() -> Dict[str, Any]:
     return {
@@ -51,4 +125,37 @@ async def root() -> Dict[str, Any]:
 
 @app.get("/health")
 async def health_check() -> Dict[str, str]:
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/health/db")
+async def database_pool_health() -> Dict[str, Any]:
+    """Connection-pool occupancy and checkout wait times for this worker."""
+    pools = {"sync": pool_status(engine)}
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine.sync_engine)
+    return {"pid": os.getpid(), "pools": pools}
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics() -> Response:
+    """Prometheus metrics, aggregated across workers in multiprocess mode."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(metrics.render(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/health/cache")
+async def cache_health() -> Dict[str, Any]:
+    """Hit and miss counters of this worker's caches."""
+    caches: Dict[str, MonitoredCache] = {"responses": response_cache, "principals": principal_cache}
+    return {
+        "pid": os.getpid(),
+        "caches": {
+            name: {
+                "backend": type(cache.backend).__name__ if cache.backend else None,
+                **asdict(cache.stats),
+            }
+            for name, cache in caches.items()
+        },
+    }
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""
+Latency and throughput benchmarks for the API's hot paths.
+
+Seeds a database with ``app.db.seeding`` at a configurable scale, then drives
+each scenario in ``benchmarks.scenarios`` through the app in-process over an
+ASGI transport, so no server or network is involved. Results (p50/p95/p99
+latency and requests per second per scenario) can be saved as a JSON baseline
+and later runs compared against it:
+
+    python -m benchmarks --scale 5000 --save benchmarks/baselines/sqlite.json
+    python -m benchmarks --scale 5000 --baseline benchmarks/baselines/sqlite.json
+
+The run exits non-zero when a scenario regresses past ``--threshold``. By
+default it uses a fresh SQLite file; pass ``--database-url`` for PostgreSQL.
+"""
@@ -0,0 +1,107 @@
+"""
+Command line entry point: ``python -m benchmarks --help``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks import baseline
+from benchmarks.scenarios import SCENARIOS
+
+project_root = Path(__file__).parent.parent
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--database-url", help="Defaults to a fresh SQLite file in a temporary directory")
+    parser.add_argument("--scale", type=int, default=1000, help="Synthetic users, locations and quests to seed")
+    parser.add_argument("--skip-seed", action="store_true", help="Use the database as it is")
+    parser.add_argument("--reset", action="store_true", help="Drop all tables before seeding")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), help="Run only these (repeatable)"
+    )
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache on")
+    parser.add_argument("--save", type=Path, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Fail if the results regress from this JSON file")
+    parser.add_argument(
+        "--threshold", type=float, default=baseline.DEFAULT_THRESHOLD,
+        help="Allowed regression as a fraction (default %(default)s)",
+    )
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace, database_url: str) -> int:
+    # Settings are read on import, so the app's modules are imported only now
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["CACHE_ENABLED"] = str(args.cache).lower()
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key")
+    sys.path.insert(0, str(project_root))
+
+    from app.db import seeding
+    from app.db.database import SessionLocal, engine
+    from app.db.models import Base
+    from app.main import app
+    from benchmarks.runner import load_context, run_suite
+
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+    if not args.skip_seed:
+        Base.metadata.create_all(bind=engine)
+        sample = json.loads((project_root / "data" / "sample_data.json").read_text())
+        with SessionLocal() as db:
+            seeding.seed(db, seeding.synthetic_data(sample, args.scale))
+    with SessionLocal() as db:
+        context = load_context(db, seeding.DEFAULT_PASSWORD)
+
+    scenarios = [SCENARIOS[name] for name in args.scenario or SCENARIOS]
+    results = asyncio.run(run_suite(app, context, scenarios, args.requests, args.concurrency))
+    report = {
+        "meta": {
+            "database": engine.dialect.name,
+            "scale": args.scale,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "cache": args.cache,
+            "python": platform.python_version(),
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "scenarios": {result.name: result.summary() for result in results},
+    }
+    engine.dispose()
+
+    print(f"{'scenario':<16} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, summary in report["scenarios"].items():
+        print(
+            f"{name:<16} {summary['requests']:>9} {summary['errors']:>7} {summary['requests_per_second']:>9.1f} "
+            f"{summary['p50_ms']:>8.2f} {summary['p95_ms']:>8.2f} {summary['p99_ms']:>8.2f}"
+        )
+
+    if args.save:
+        baseline.save(args.save, report)
+    status = 0
+    failed = [name for name, summary in report["scenarios"].items() if summary["errors"]]
+    if failed:
+        print(f"Requests failed in: {', '.join(failed)}")
+        status = 1
+    if args.baseline:
+        problems = baseline.regressions(report, baseline.load(args.baseline), args.threshold)
+        for problem in problems:
+            print(f"Regression: {problem}")
+        status = status or int(bool(problems))
+    return status
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.database_url:
+        sys.exit(main(args, args.database_url))
+    with tempfile.TemporaryDirectory() as tmp:
+        sys.exit(main(args, f"sqlite:///{Path(tmp) / 'benchmark.db'}"))
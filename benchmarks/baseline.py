@@ -0,0 +1,38 @@
+"""
+Saving runs as JSON baselines and comparing later runs against them.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+DEFAULT_THRESHOLD = 0.25
+
+
+def save(path: Path, report: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def load(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def regressions(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Describe every scenario that got worse than ``baseline`` by more than
+    ``threshold`` (a fraction): p95 latency up, or throughput down.
+    Scenarios missing from either run are not compared.
+    """
+    problems = []
+    for name, current in report["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            problems.append(f"{name}: p95 {current['p95_ms']:.2f}ms, baseline {previous['p95_ms']:.2f}ms")
+        if current["requests_per_second"] < previous["requests_per_second"] * (1 - threshold):
+            problems.append(
+                f"{name}: {current['requests_per_second']:.1f} req/s, "
+                f"baseline {previous['requests_per_second']:.1f} req/s"
+            )
+    return problems
@@ -0,0 +1,74 @@
+"""
+Bytes on the wire and CPU per encoding for a page of quests.
+
+Renders a 100-quest page from a seeded database, then compresses it with
+every available encoding at the configured level (``COMPRESSION_*``
+settings):
+
+    python -m benchmarks.compression --scale 1000
+
+``cpu ms`` is the cost of compressing the page once, which the response
+cache pays once per encoding; without the cache it is paid per request.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+project_root = Path(__file__).parent.parent
+
+PAGE_SIZE = 100
+
+
+def measure(body: bytes, repeat: int = 50) -> Dict[str, Dict[str, float]]:
+    """Compressed size and milliseconds of CPU per compression, by encoding."""
+    from app.core.compression import available_encodings
+
+    report = {"identity": {"bytes": len(body), "ratio": 1.0, "cpu_ms": 0.0}}
+    for name, encoding in available_encodings().items():
+        compressed = encoding.compress(body)
+        started = time.process_time()
+        for _ in range(repeat):
+            encoding.compress(body)
+        report[name] = {
+            "bytes": len(compressed),
+            "ratio": len(body) / len(compressed),
+            "cpu_ms": (time.process_time() - started) / repeat * 1000,
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compression", description=__doc__)
+    parser.add_argument("--database-url", help="Defaults to a fresh SQLite file in a temporary directory")
+    parser.add_argument("--scale", type=int, default=1000, help="Synthetic users, locations and quests to seed")
+    parser.add_argument("--repeat", type=int, default=50, help="Compressions per encoding")
+    args = parser.parse_args()
+
+    # Settings are read on import, so the app's modules are imported only now
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tmp.name}/benchmark.db"
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key")
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+    sys.path.insert(0, str(project_root))
+
+    from app.api.serialization import dump_json
+    from app.db import crud_quests, schemas, seeding
+    from app.db.database import SessionLocal, engine
+    from app.db.models import Base
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        if args.database_url is None:
+            sample = json.loads((project_root / "data" / "sample_data.json").read_text())
+            seeding.seed(db, seeding.synthetic_data(sample, args.scale))
+        page = dump_json(schemas.QuestOut, crud_quests.get_quests(db, limit=PAGE_SIZE).items)
+    engine.dispose()
+
+    print(f"{'encoding':<10} {'bytes':>9} {'ratio':>7} {'cpu ms':>8}")
+    for name, row in measure(page, args.repeat).items():
+        print(f"{name:<10} {row['bytes']:>9} {row['ratio']:>6.1f}x {row['cpu_ms']:>8.3f}")
@@ -0,0 +1,76 @@
+"""
+Per-request cost of the measuring middleware.
+
+Calls each middleware around a do-nothing ASGI app many times and subtracts
+the time the bare app takes, so only the middleware's own work is left:
+
+    python -m benchmarks.middleware_overhead --max-us 50
+
+Exits non-zero if any middleware costs more than ``--max-us`` microseconds
+per request.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+project_root = Path(__file__).parent.parent
+
+MAX_OVERHEAD_US = 50.0
+
+
+async def _noop_app(scope: Any, receive: Any, send: Any) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _receive() -> Dict[str, Any]:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: Any) -> None:
+    pass
+
+
+async def _time_per_request(app: Any, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/benchmark", "headers": []}
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), _receive, _send)
+    return (time.perf_counter() - started) / requests
+
+
+def measure(requests: int = 20000) -> Dict[str, float]:
+    """Microseconds each middleware adds to a request, by middleware name."""
+    from app.core.middleware import MetricsMiddleware, QueryStatsMiddleware
+
+    async def run() -> Dict[str, float]:
+        # Warm up imports, label children and the event loop first
+        await _time_per_request(MetricsMiddleware(_noop_app), 1000)
+        bare = await _time_per_request(_noop_app, requests)
+        return {
+            middleware.__name__: max(0.0, await _time_per_request(middleware(_noop_app), requests) - bare) * 1e6
+            for middleware in (MetricsMiddleware, QueryStatsMiddleware)
+        }
+
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.middleware_overhead", description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--max-us", type=float, default=MAX_OVERHEAD_US)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key")
+    sys.path.insert(0, str(project_root))
+
+    status = 0
+    for name, overhead in measure(args.requests).items():
+        print(f"{name:<24} {overhead:>8.1f} µs/request")
+        status = status or int(overhead > args.max_us)
+    sys.exit(status)
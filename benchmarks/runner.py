@@ -0,0 +1,109 @@
+"""
+Running scenarios and summarising their latencies.
+"""
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import Quest, User
+from benchmarks.scenarios import Context, Scenario, login
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    duration: float
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def requests_per_second(self) -> float:
+        return len(self.latencies_ms) / self.duration if self.duration else 0.0
+
+    def percentile(self, pct: int) -> float:
+        if len(self.latencies_ms) < 2:
+            return self.latencies_ms[0] if self.latencies_ms else 0.0
+        return statistics.quantiles(self.latencies_ms, n=100, method="inclusive")[pct - 1]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "requests": len(self.latencies_ms),
+            "errors": self.errors,
+            "requests_per_second": round(self.requests_per_second, 1),
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+        }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    context: Context,
+    requests: int,
+    concurrency: int,
+    warmup: int = 5,
+) -> ScenarioResult:
+    """
+    Send ``requests`` requests from ``concurrency`` concurrent workers.
+
+    ``warmup`` requests go first and are not counted. Every request is timed,
+    failed ones included; a failure is an exception or a status of 400 or more.
+    """
+    for i in range(warmup):
+        await scenario.send(client, context, i)
+
+    result = ScenarioResult(name=scenario.name, duration=0.0)
+    sequence = iter(range(warmup, warmup + requests))
+
+    async def worker() -> None:
+        for i in sequence:
+            started = time.perf_counter()
+            try:
+                ok = (await scenario.send(client, context, i)).status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            result.latencies_ms.append((time.perf_counter() - started) * 1000)
+            result.errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.duration = time.perf_counter() - started
+    return result
+
+
+def load_context(db: Session, password: str, quests: int = 100) -> Context:
+    """Pick the quests and the user the scenarios work with from a seeded database."""
+    quest_ids = list(db.scalars(
+        select(Quest.id).where(Quest.is_public.is_(True)).order_by(Quest.id).limit(quests)
+    ))
+    email = db.scalars(select(User.email).order_by(User.id).limit(1)).one()
+    return Context(quest_ids=quest_ids, email=email, password=password)
+
+
+async def run_suite(
+    app: Any,
+    context: Context,
+    scenarios: List[Scenario],
+    requests: int,
+    concurrency: int,
+) -> List[ScenarioResult]:
+    """Run ``scenarios`` one after another against ``app``, inside its lifespan."""
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+            response = await login(client, context, 0)
+            response.raise_for_status()
+            context.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            return [
+                await run_scenario(
+                    client, scenario, context, max(1, int(requests * scenario.request_share)), concurrency
+                )
+                for scenario in scenarios
+            ]
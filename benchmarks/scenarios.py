@@ -0,0 +1,75 @@
+"""
+The requests each benchmark scenario sends.
+
+A scenario is an async function taking the client, the run's ``Context``
+and the request's sequence number, and returning the response. Successful
+responses are those below 400.
+"""
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+API = "/api/v1"
+
+
+@dataclass
+class Context:
+    quest_ids: List[int]
+    email: str
+    password: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+ScenarioFn = Callable[[httpx.AsyncClient, Context, int], Awaitable[httpx.Response]]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    send: ScenarioFn
+    # Share of --requests this scenario sends; login is dominated by bcrypt
+    request_share: float = 1.0
+
+
+async def list_quests(client: httpx.AsyncClient, context: Context, i: int) -> httpx.Response:
+    return await client.get(f"{API}/quests/", params={"limit": 20})
+
+
+async def get_quest(client: httpx.AsyncClient, context: Context, i: int) -> httpx.Response:
+    return await client.get(f"{API}/quests/{context.quest_ids[i % len(context.quest_ids)]}/")
+
+
+async def list_campaigns(client: httpx.AsyncClient, context: Context, i: int) -> httpx.Response:
+    return await client.get(f"{API}/campaigns/", params={"limit": 20})
+
+
+REFERENCE_PATHS = ("all", "interests", "difficulties", "quest-types")
+
+
+async def get_reference(client: httpx.AsyncClient, context: Context, i: int) -> httpx.Response:
+    return await client.get(f"{API}/reference/{REFERENCE_PATHS[i % len(REFERENCE_PATHS)]}")
+
+
+async def login(client: httpx.AsyncClient, context: Context, i: int) -> httpx.Response:
+    return await client.post(
+        f"{API}/auth/login/", data={"username": context.email, "password": context.password}
+    )
+
+
+async def toggle_bookmark(client: httpx.AsyncClient, context: Context, i: int) -> httpx.Response:
+    quest_id = context.quest_ids[i % len(context.quest_ids)]
+    return await client.post(f"{API}/quests/{quest_id}/bookmark/", headers=context.headers)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("quests.list", list_quests),
+        Scenario("quests.detail", get_quest),
+        Scenario("campaigns.list", list_campaigns),
+        Scenario("reference", get_reference),
+        Scenario("auth.login", login, request_share=0.1),
+        Scenario("quests.bookmark", toggle_bookmark),
+    )
+}
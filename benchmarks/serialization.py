@@ -0,0 +1,95 @@
+"""
+CPU per page spent turning ORM objects into JSON.
+
+Loads a 100-row page of quests, campaigns, locations and users once, then
+renders it many times both ways: validating through the output schema and
+dumping (the old path), and with ``app.api.serialization.dump_json``:
+
+    python -m benchmarks.serialization --scale 1000
+
+Database time is left out; only the rendering is measured, with
+``time.process_time``.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+project_root = Path(__file__).parent.parent
+
+PAGE_SIZE = 100
+
+
+def _cpu_ms_per_page(render: Callable[[], bytes], pages: int) -> float:
+    render()  # Warm up caches and lazy schema construction
+    started = time.process_time()
+    for _ in range(pages):
+        render()
+    return (time.process_time() - started) / pages * 1000
+
+
+def measure(db: Any, pages: int = 50) -> Dict[str, Dict[str, float]]:
+    """Milliseconds of CPU per page, validated and projected, by resource."""
+    from pydantic import TypeAdapter
+
+    from app.api.serialization import dump_json
+    from app.db import crud_campaigns, crud_locations, crud_quests, crud_users, schemas
+
+    resources: Dict[str, Any] = {
+        "quests": (schemas.QuestOut, crud_quests.get_quests(db, limit=PAGE_SIZE).items),
+        "campaigns": (schemas.CampaignOut, crud_campaigns.get_campaigns(db, limit=PAGE_SIZE).items),
+        "locations": (schemas.LocationOut, crud_locations.get_locations(db, limit=PAGE_SIZE).items),
+        "users": (schemas.UserOut, crud_users.get_users(db, limit=PAGE_SIZE).items),
+    }
+    report = {}
+    for name, (schema, objects) in resources.items():
+        adapter = TypeAdapter(List[schema])
+
+        def validated() -> bytes:
+            return adapter.dump_json([schema.model_validate(obj) for obj in objects])
+
+        def projected() -> bytes:
+            return dump_json(schema, objects)
+
+        report[name] = {
+            "rows": len(objects),
+            "validated_ms": _cpu_ms_per_page(validated, pages),
+            "projected_ms": _cpu_ms_per_page(projected, pages),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization", description=__doc__)
+    parser.add_argument("--database-url", help="Defaults to a fresh SQLite file in a temporary directory")
+    parser.add_argument("--scale", type=int, default=1000, help="Synthetic users, locations and quests to seed")
+    parser.add_argument("--pages", type=int, default=50, help="Renders of each page per path")
+    args = parser.parse_args()
+
+    # Settings are read on import, so the app's modules are imported only now
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tmp.name}/benchmark.db"
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key")
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+    sys.path.insert(0, str(project_root))
+
+    from app.db import seeding
+    from app.db.database import SessionLocal, engine
+    from app.db.models import Base
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        if args.database_url is None:
+            sample = json.loads((project_root / "data" / "sample_data.json").read_text())
+            seeding.seed(db, seeding.synthetic_data(sample, args.scale))
+        report = measure(db, args.pages)
+    engine.dispose()
+
+    print(f"{'resource':<10} {'rows':>5} {'validated ms':>13} {'projected ms':>13} {'speedup':>8}")
+    for name, row in report.items():
+        speedup = row["validated_ms"] / row["projected_ms"] if row["projected_ms"] else float("inf")
+        print(f"{name:<10} {row['rows']:>5} {row['validated_ms']:>13.2f} {row['projected_ms']:>13.2f} {speedup:>7.1f}x")
@@ -0,0 +1,29 @@
+"""
+Gunicorn settings for production (see docker-compose.prod.yml).
+
+Workers share Prometheus metrics through files in PROMETHEUS_MULTIPROC_DIR,
+which is emptied when gunicorn starts; a worker's live gauges are dropped
+when it exits so restarts do not leave stale values behind.
+"""
+import os
+import shutil
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+forwarded_allow_ips = "*"
+
+# Set before the workers import prometheus_client, which reads it on import
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+
+def on_starting(server):
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Fill the tags and quest_tags tables from the existing Quest.tags strings.
+
+Run it once after migration 0009 creates the tables. Safe to re-run: only
+missing tags and links are added. Quests created or updated through the API
+keep their tags in sync on their own; this is for rows written before the
+tables existed or by other tools.
+"""
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+project_root = Path(__file__).parent.parent
+load_dotenv(project_root / '.env')
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///./adventure_guild.db')
+os.environ.setdefault('JWT_SECRET_KEY', 'default-secret-key-for-development')
+
+
+def main() -> None:
+    # Imported here: the settings read the environment set up above
+    from app.db import crud_tags
+    from app.db.database import SessionLocal, engine
+    from app.db.models import QuestTag, Tag
+
+    # Databases created by create_all rather than Alembic may predate the tables
+    Tag.__table__.create(bind=engine, checkfirst=True)
+    QuestTag.__table__.create(bind=engine, checkfirst=True)
+    with SessionLocal() as db:
+        added = crud_tags.backfill_quest_tags(db)
+    print(f"Linked {added} quest tags")
+
+
+if __name__ == "__main__":
+    main()
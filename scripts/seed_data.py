@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 """
 Script to seed the database with sample data
+
+Loads data/sample_data.json with a few bulk statements per table. Use
+--scale N to generate a large, reproducible benchmark database.
 """
 from pathlib import Path
+import argparse
 import sys
 import os
 import json
-from datetime import datetime
-from sqlalchemy.orm import Session
-from typing import Dict, Any, Optional, List, Union, cast
+import time
+from typing import Dict, Any
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
@@ -27,128 +30,43 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 # Now import your app modules
 from app.db.database import SessionLocal, engine
-from app.db.models import Base, User, Location, Quest, Campaign, QuestType, Difficulty, Interest
-from app.db import schemas, crud_locations, crud_quests, crud_campaigns, crud_reference_data
-from app.core.password import get_password_hash
-
-# Note: The `type: ignore` for `app.db.models` is a temporary measure if mypy
-# complains about models not having certain attributes when imported here.
-# It's better to fix the underlying model definitions if possible.
+from app.db.models import Base
+from app.db import seeding
 
 
-def get_or_create(db: Session, model: type, defaults: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Any:
+def create_sample_data(scale: int = 0, seed: int = 0, reset: bool = False) -> Dict[str, Any]:
     """
-    Generic helper to get an object or create it if it doesn't exist.
-    `kwargs` are used for the query.
-    `defaults` are used for creating the new object.
-    """
-    instance = db.query(model).filter_by(**kwargs).first()
-    if not instance:
-        params = {**kwargs, **(defaults or {})}
-        instance = model(**params)
-        db.add(instance)
-        db.flush()  # Flush to get ID for relationships before commit
-    return instance
-
+    Create sample data for the Adventure Guild API.
 
-def create_sample_data() -> Dict[str, Any]:
-    """Create sample data for the Adventure Guild API"""
-    
-    # Create tables
-    Base.metadata.drop_all(bind=engine) # Drop all tables to ensure a clean slate and latest schema
+    Safe to re-run: rows that already exist are left alone. ``scale`` adds
+    that many synthetic users, locations and quests; ``reset`` drops all
+    tables first.
+    """
+    if reset:
+        Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
-    
-    db = SessionLocal()
-    
+
     # Load all sample data from the JSON file
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_data.json')
+    data_path = project_root / 'data' / 'sample_data.json'
     with open(data_path, 'r') as f:
         sample_data = json.load(f)
+    if scale:
+        sample_data = seeding.synthetic_data(sample_data, scale, seed=seed)
 
-    try:
-        # Create reference data first
-        quest_types = {item['name']: get_or_create(db, QuestType, name=item['name']) for item in sample_data['quest_types']}
-        difficulties = {item['name']: get_or_create(db, Difficulty, name=item['name']) for item in sample_data['difficulties']}
-        interests = {item['name']: get_or_create(db, Interest, name=item['name']) for item in sample_data['interests']}
-
-        # Create sample users
-        users = {}
-        for user_data in sample_data["users"]:
-            user_email = user_data["email"]
-            user_defaults = {
-                "display_name": user_data["display_name"],
-                "hashed_password": get_password_hash("password123"),
-                "avatar_url": user_data.get("avatar_url"),
-                "guild_rank": user_data.get("guild_rank"),
-            }
-            users[user_email] = get_or_create(db, User, email=user_email, defaults=user_defaults)
-
-        # Create sample locations
-        locations = {loc['name']: get_or_create(db, Location, name=loc['name'], defaults=loc) for loc in sample_data['locations']}
-
-        # Create sample campaigns
-        campaigns = {}
-        default_author = next(iter(users.values())) # Get the first user as a default author
-        for camp_data in sample_data['campaigns']:
-            campaigns[camp_data['title']] = get_or_create(db, Campaign, title=camp_data['title'], defaults={'author_id': default_author.id, **camp_data})
-
-        # Create sample quests
-        quests = []
-        for quest_data in sample_data['sample_quests']:
-            # Pop the mapping fields from the quest_data dict to avoid passing them to the model constructor
-            location_name = quest_data.pop("start_location_name", None)
-            quest_type_name = quest_data.pop("quest_type_name", None)
-            difficulty_name = quest_data.pop("difficulty_name", None)
-            interest_name = quest_data.pop("interest_name", None)
-
-            # Get the related objects from the dictionaries created earlier
-            start_location = locations.get(location_name) if location_name else None
-            quest_type = quest_types.get(quest_type_name) if quest_type_name else None
-            difficulty = difficulties.get(difficulty_name) if difficulty_name else None
-            interest = interests.get(interest_name) if interest_name else None
-
-            # Raise errors if any required mapping is missing to ensure data integrity
-            if not start_location:
-                raise ValueError(f"Quest '{quest_data['name']}' has an invalid or missing 'start_location_name': {location_name}")
-            if not quest_type:
-                raise ValueError(f"Quest '{quest_data['name']}' has an invalid or missing 'quest_type_name': {quest_type_name}")
-            if not difficulty:
-                raise ValueError(f"Quest '{quest_data['name']}' has an invalid or missing 'difficulty_name': {difficulty_name}")
-            if not interest:
-                raise ValueError(f"Quest '{quest_data['name']}' has an invalid or missing 'interest_name': {interest_name}")
-
-            quest_defaults = {
-                "author_id": default_author.id,
-                "start_location_id": start_location.id,
-                "interest_id": interest.id,
-                "difficulty_id": difficulty.id,
-                "quest_type_id": quest_type.id,
-                **quest_data
-            }
-            quests.append(get_or_create(db, Quest, name=quest_data['name'], defaults=quest_defaults))
-        
-        db.commit()
-        
-        return {
-            "message": "Sample data created successfully",
-            "users": len(users),
-            "locations": len(locations),
-            "quests": len(quests),
-            "campaigns": len(campaigns),
-            "quest_types": len(quest_types),
-            "difficulties": len(difficulties),
-            "interests": len(interests)
-        }
-        
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+    with SessionLocal() as db:
+        counts = seeding.seed(db, sample_data)
+    return {"message": "Sample data created successfully", **counts}
 
 
 if __name__ == "__main__":
-    result = create_sample_data()
-    print("Seed data creation completed:")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=0, help="Also create N synthetic users, locations and quests")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for --scale; the same seed gives the same data")
+    parser.add_argument("--reset", action="store_true", help="Drop all tables before seeding")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    result = create_sample_data(scale=args.scale, seed=args.seed, reset=args.reset)
+    print(f"Seed data creation completed in {time.perf_counter() - started:.1f}s:")
     for key, value in result.items():
         print(f"  {key}: {value}")
@@ -1,19 +1,28 @@
+import json
 import os
+import fakeredis
 import pytest
-from typing import Dict, Any, Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Callable, ContextManager, Generator, Iterator, List, Optional
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
 # Set required environment variables for testing before importing app modules
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-testing-only")
+# Hash in-process; tests/test_hashing.py covers the worker pool
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
 
 from app.main import app
+from app.core.cache import RedisCacheBackend, response_cache
+from app.core.principal_cache import principal_cache
+from app.core.security import get_password_hash
 from app.db.database import get_db
 from app.db.models import Base
-from app.db import models
+from app.db import crud_quests, crud_reference_data, models, schemas, seeding
 
 # Use in-memory SQLite for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -25,6 +34,12 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+SAMPLE_DATA = json.loads((Path(__file__).parent.parent / "data" / "sample_data.json").read_text())
+
+# Exercise the shared (Redis) cache backend against an in-memory stand-in
+response_cache.backend = RedisCacheBackend(fakeredis.FakeRedis())
+principal_cache.backend = RedisCacheBackend(fakeredis.FakeRedis(), prefix="advguild:principal:")
+
 
 def override_get_db() -> Generator[Session, None, None]:
     try:
@@ -44,6 +59,10 @@ def client() -> Generator[TestClient, None, None]:
     
     # Create test client
     with TestClient(app) as test_client:
+        response_cache.clear()
+        principal_cache.clear()
+        # Startup loaded reference data from the app's engine, not the test one
+        crud_reference_data.invalidate_snapshot()
         yield test_client
     
     # Clean up
@@ -62,6 +81,61 @@ def db() -> Generator[Session, None, None]:
         Base.metadata.drop_all(bind=engine)
 
 
+@contextmanager
+def recording_statements(prefix: str = "") -> Iterator[List[str]]:
+    """Record the statements issued against the test database that start with ``prefix``."""
+    statements: List[str] = []
+
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if statement.lstrip().upper().startswith(prefix.upper()):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def record_statements() -> Callable[..., ContextManager[List[str]]]:
+    """
+    Record the SQL statements a block issues, optionally only those starting
+    with a prefix.
+
+        with record_statements("UPDATE") as updates:
+            flush_likes(db)
+    """
+    return recording_statements
+
+
+@pytest.fixture
+def select_statements() -> Generator[List[str], None, None]:
+    """Record every SELECT issued against the test database."""
+    with recording_statements("SELECT") as statements:
+        yield statements
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], ContextManager[List[str]]]:
+    """
+    Fail if a block issues more SQL statements than its budget.
+
+        with query_budget(2):
+            client.get("/api/v1/quests/")
+    """
+
+    @contextmanager
+    def budget(max_queries: int) -> Iterator[List[str]]:
+        with recording_statements() as statements:
+            yield statements
+        assert len(statements) <= max_queries, (
+            f"{len(statements)} queries, budget {max_queries}:\n" + "\n\n".join(statements)
+        )
+
+    return budget
+
+
 @pytest.fixture
 def sample_reference_data(db: Session) -> Dict[str, Any]:
     """Create sample reference data for tests."""
@@ -83,4 +157,55 @@ def sample_reference_data(db: Session) -> Dict[str, Any]:
         'difficulty': difficulty,
         'interest': interest,
         'location': location
-    }
\ No newline at end of file
+    }
+
+
+@pytest.fixture
+def create_quest(db: Session, sample_reference_data: Dict[str, Any]) -> Callable[..., models.Quest]:
+    """
+    Create and commit a quest through ``crud_quests.create_quest``, set in the
+    sample reference data. ``fields`` are those of ``QuestCreate``. Quests
+    share one author unless ``author`` is given::
+
+        quest = create_quest("Slay the Dragon", tags="dragons")
+    """
+    authors: List[models.User] = []
+
+    def create(
+        name: str = "Test Quest", author: Optional[models.User] = None, **fields: Any
+    ) -> models.Quest:
+        if author is None:
+            if not authors:
+                authors.append(models.User(
+                    email="author@example.com",
+                    display_name="Quest Author",
+                    hashed_password=get_password_hash("password123"),
+                ))
+                db.add(authors[0])
+                db.flush()
+            author = authors[0]
+        quest = crud_quests.create_quest(
+            db,
+            schemas.QuestCreate(**{
+                "name": name,
+                "synopsis": "A quest",
+                "itinerary": "There and back",
+                "start_location_id": sample_reference_data["location"].id,
+                "interest_id": sample_reference_data["interest"].id,
+                "difficulty_id": sample_reference_data["difficulty"].id,
+                "quest_type_id": sample_reference_data["quest_type"].id,
+                **fields,
+            }),
+            author_id=author.id,
+        )
+        db.commit()
+        return quest
+
+    return create
+
+
+@pytest.fixture
+def seeded(db: Session) -> Session:
+    """``db`` seeded with the sample data plus 30 synthetic rows of each kind."""
+    seeding.seed(db, seeding.synthetic_data(SAMPLE_DATA, 30))
+    return db
@@ -0,0 +1,111 @@
+import asyncio
+import inspect
+import threading
+from pathlib import Path
+from typing import Any, AsyncGenerator, Generator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.endpoints import users
+from app.db import schemas
+from app.db.async_crud import async_crud_users
+from app.db.database import async_database_url, get_async_db, off_loop, run_on_async_session
+from app.db.models import Base
+
+
+@pytest.fixture
+def async_sessions(tmp_path: Path) -> Generator[async_sessionmaker, None, None]:
+    """Sessions on a file-backed SQLite database through aiosqlite."""
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+
+    engine = create_async_engine(async_database_url(url))
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def test_async_database_url() -> None:
+    assert async_database_url("postgresql://u:p@db:5432/quests") == (
+        "postgresql+asyncpg://u:p@db:5432/quests"
+    )
+    assert async_database_url("postgresql+psycopg2://u@db/quests") == "postgresql+asyncpg://u@db/quests"
+    assert async_database_url("sqlite:///./adventure_guild.db") == "sqlite+aiosqlite:///./adventure_guild.db"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u@db/quests")
+
+
+def test_async_crud_runs_sync_queries(async_sessions: async_sessionmaker) -> None:
+    async def scenario() -> Any:
+        async with async_sessions() as db:
+            await async_crud_users.create_user(
+                db,
+                schemas.UserCreate(
+                    email="async@example.com", display_name="Async", password="password123"
+                ),
+            )
+            await db.commit()
+        async with async_sessions() as db:
+            return await async_crud_users.get_user_by_email(db, email="async@example.com")
+
+    user = asyncio.run(scenario())
+    assert user is not None and user.display_name == "Async"
+
+
+def test_async_crud_only_exposes_module_functions() -> None:
+    assert inspect.iscoroutinefunction(async_crud_users.get_user)
+    with pytest.raises(AttributeError):
+        async_crud_users.Session
+    with pytest.raises(AttributeError):
+        async_crud_users.QUEST_OUT_OPTIONS
+
+
+def test_off_loop_leaves_the_event_loop_thread(async_sessions: async_sessionmaker) -> None:
+    @off_loop
+    def blocking_call() -> int:
+        return threading.get_ident()
+
+    async def scenario() -> Any:
+        async with async_sessions() as db:
+            return threading.get_ident(), await db.run_sync(lambda session: blocking_call())
+
+    loop_thread, call_thread = asyncio.run(scenario())
+    assert call_thread != loop_thread
+    # Outside run_sync the call stays on the caller's thread
+    assert blocking_call() == threading.get_ident()
+
+
+def test_endpoint_runs_on_async_session(async_sessions: async_sessionmaker) -> None:
+    endpoint = run_on_async_session(users.get_user)
+    assert inspect.iscoroutinefunction(endpoint)
+
+    async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with async_sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.add_api_route("/users/{user_id}/", endpoint, response_model=schemas.UserOut)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    async def seed() -> int:
+        async with async_sessions() as db:
+            user = await async_crud_users.create_user(
+                db,
+                schemas.UserCreate(
+                    email="route@example.com", display_name="Route", password="password123"
+                ),
+            )
+            await db.commit()
+            return user.id
+
+    user_id = asyncio.run(seed())
+    with TestClient(app) as client:
+        response = client.get(f"/users/{user_id}/")
+        assert response.status_code == 200
+        assert response.json()["email"] == "route@example.com"
+        assert client.get("/users/999/").status_code == 404
@@ -0,0 +1,53 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db import seeding
+from app.main import app
+from benchmarks import baseline
+from benchmarks.runner import load_context, run_scenario
+from benchmarks.scenarios import SCENARIOS
+
+SAMPLE_DATA = json.loads((Path(__file__).parent.parent / "data" / "sample_data.json").read_text())
+
+
+def report(p95_ms: float, requests_per_second: float) -> Dict[str, Any]:
+    return {"scenarios": {"quests.list": {"p95_ms": p95_ms, "requests_per_second": requests_per_second}}}
+
+
+def test_regressions_past_threshold() -> None:
+    previous = report(p95_ms=10.0, requests_per_second=100.0)
+
+    assert baseline.regressions(report(12.0, 90.0), previous, threshold=0.25) == []
+    slower = baseline.regressions(report(13.0, 100.0), previous, threshold=0.25)
+    assert slower == ["quests.list: p95 13.00ms, baseline 10.00ms"]
+    assert len(baseline.regressions(report(10.0, 70.0), previous, threshold=0.25)) == 1
+    # Scenarios new since the baseline are not compared
+    assert baseline.regressions(report(10.0, 100.0), {"scenarios": {}}) == []
+
+
+def test_scenarios_run_without_errors(client: TestClient, db: Session) -> None:
+    seeding.seed(db, seeding.synthetic_data(SAMPLE_DATA, 10))
+    context = load_context(db, seeding.DEFAULT_PASSWORD)
+
+    # The test database is a single shared connection, so requests go one at a time
+    async def run() -> Dict[str, Dict[str, Any]]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as http:
+            token = (await SCENARIOS["auth.login"].send(http, context, 0)).json()["access_token"]
+            context.headers = {"Authorization": f"Bearer {token}"}
+            return {
+                name: (await run_scenario(http, scenario, context, requests=4, concurrency=1, warmup=1)).summary()
+                for name, scenario in SCENARIOS.items()
+            }
+
+    summaries = asyncio.run(run())
+    for name, summary in summaries.items():
+        assert summary["requests"] == 4, name
+        assert summary["errors"] == 0, name
+        assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
@@ -0,0 +1,187 @@
+import json
+from typing import Any, Callable, ContextManager, Dict, Iterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token, get_password_hash
+from app.db import models
+
+URL = "/api/v1/quests/bulk/"
+
+
+@pytest.fixture
+def headers(db: Session) -> Dict[str, str]:
+    db.add(models.User(
+        email="importer@example.com",
+        display_name="Importer",
+        hashed_password=get_password_hash("password123"),
+    ))
+    db.commit()
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': 'importer@example.com'})}"}
+
+
+def row(name: str, **overrides: Any) -> Dict[str, Any]:
+    data = {
+        "name": name,
+        "synopsis": f"{name} synopsis",
+        "itinerary": "There and back",
+        "start_location_name": "Test Location",
+        "interest_name": "Exploration",
+        "difficulty_name": "Medium",
+        "quest_type_name": "Adventure",
+        "tags": "Ruins, Night",
+    }
+    data.update(overrides)
+    return data
+
+
+def quest_names(db: Session) -> List[str]:
+    db.expire_all()
+    return sorted(name for (name,) in db.query(models.Quest.name))
+
+
+def test_import_json_array_by_names(
+    client: TestClient,
+    db: Session,
+    sample_reference_data: Dict[str, Any],
+    headers: Dict[str, str],
+    record_statements: Callable[..., ContextManager[List[str]]],
+) -> None:
+    with record_statements("INSERT INTO quests") as inserts:
+        response = client.post(URL, json=[row(f"Quest {i}") for i in range(25)], headers=headers)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["committed"] is True
+    assert body["created"] == 25
+    assert body["errors"] == []
+    # All rows go to the database in one multi-row INSERT
+    assert len(inserts) == 1
+
+    first = db.get(models.Quest, body["quest_ids"][0])
+    assert first.name == "Quest 0"
+    assert first.start_location_id == sample_reference_data["location"].id
+    assert first.quest_type_id == sample_reference_data["quest_type"].id
+    assert sorted(tag.name for tag in first.normalized_tags) == ["night", "ruins"]
+
+    listed = client.get("/api/v1/quests/", params={"tags": "ruins", "limit": 100}).json()
+    assert len(listed) == 25
+
+
+def test_import_ndjson(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any], headers: Dict[str, str]
+) -> None:
+    lines = [
+        json.dumps(row("Streamed A")),
+        "",
+        json.dumps(row("Streamed B", interest_name=None, interest_id=sample_reference_data["interest"].id)),
+    ]
+    response = client.post(
+        URL,
+        content="\n".join(lines) + "\n",
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 201
+    assert response.json()["created"] == 2
+    assert quest_names(db) == ["Streamed A", "Streamed B"]
+
+
+def test_atomic_import_reports_errors_and_creates_nothing(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any], headers: Dict[str, str]
+) -> None:
+    rows = [
+        row("Fine"),
+        row("Unknown Place", start_location_name="Atlantis"),
+        {"name": "Incomplete"},
+        row("Bad Difficulty", difficulty_name=None, difficulty_id=999),
+    ]
+    response = client.post(URL, json=rows, headers=headers)
+
+    assert response.status_code == 422
+    body = response.json()
+    assert body["committed"] is False
+    assert body["created"] == 0
+    assert [error["row"] for error in body["errors"]] == [1, 2, 3]
+    assert body["errors"][0]["errors"] == ["start_location_name: 'Atlantis' was not found"]
+    assert any(message.startswith("synopsis") for message in body["errors"][1]["errors"])
+    assert body["errors"][2]["errors"] == ["difficulty_id: no difficulties row with id 999"]
+    assert quest_names(db) == []
+
+
+def test_partial_import_keeps_valid_rows(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any], headers: Dict[str, str]
+) -> None:
+    rows = [row("Kept"), row("Dropped", quest_type_name="Heist"), row("Also Kept")]
+    response = client.post(URL, params={"mode": "partial"}, json=rows, headers=headers)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["committed"] is True
+    assert body["created"] == 2
+    assert body["errors"] == [{"row": 1, "errors": ["quest_type_name: 'Heist' was not found"]}]
+    assert quest_names(db) == ["Also Kept", "Kept"]
+
+
+def test_partial_import_with_no_valid_rows_is_rejected(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any], headers: Dict[str, str]
+) -> None:
+    rows = [row("Nowhere", start_location_name="Atlantis"), {"name": "Incomplete"}]
+    response = client.post(URL, params={"mode": "partial"}, json=rows, headers=headers)
+
+    assert response.status_code == 422
+    assert response.json()["committed"] is False
+    assert [error["row"] for error in response.json()["errors"]] == [0, 1]
+    assert quest_names(db) == []
+
+
+def test_invalid_bodies(client: TestClient, sample_reference_data: Dict[str, Any], headers: Dict[str, str]) -> None:
+    assert client.post(URL, json={"name": "Not a list"}, headers=headers).status_code == 400
+    assert client.post(URL, content="[{", headers={**headers, "Content-Type": "application/json"}).status_code == 400
+
+    ndjson = client.post(
+        URL,
+        content="{broken\n" + json.dumps(row("Fine")),
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert ndjson.status_code == 422
+    assert ndjson.json()["errors"] == [{"row": 0, "errors": ["Invalid JSON"]}]
+
+
+def test_import_size_limit(
+    client: TestClient, sample_reference_data: Dict[str, Any], headers: Dict[str, str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "QUEST_IMPORT_MAX_ROWS", 2)
+    response = client.post(URL, json=[row(f"Quest {i}") for i in range(3)], headers=headers)
+    assert response.status_code == 413
+
+
+def test_import_byte_limit(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any], headers: Dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "QUEST_IMPORT_MAX_BYTES", 1000)
+    rows = [row(f"Quest {i}") for i in range(10)]
+    assert client.post(URL, json=rows, headers=headers).status_code == 413
+
+    # Without a Content-Length the body is cut off as it streams in
+    def chunks() -> Iterator[bytes]:
+        for data in rows:
+            yield json.dumps(data).encode() + b"\n"
+
+    response = client.post(URL, content=chunks(), headers={**headers, "Content-Type": "application/x-ndjson"})
+    assert response.status_code == 413
+    assert quest_names(db) == []
+
+
+def test_import_requires_authentication(client: TestClient, sample_reference_data: Dict[str, Any]) -> None:
+    assert client.post(URL, json=[row("Anonymous")]).status_code == 401
+    # Before the body is read or its size checked
+    assert client.post(URL, content="[{", headers={"Content-Type": "application/json"}).status_code == 401
+    assert client.post(URL, content=b" " * 20_000_000, headers={"Content-Type": "application/json"}).status_code == 401
@@ -0,0 +1,132 @@
+import time
+from typing import Any, Callable, Dict
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCacheBackend, response_cache
+from app.core.security import create_access_token
+from app.db import crud_locations, models, schemas
+
+
+def test_lru_backend_evicts_least_recently_used() -> None:
+    backend = LRUCacheBackend(max_entries=2)
+    backend.set("a", b"1", ttl=60, tags=["t"])
+    backend.set("b", b"2", ttl=60, tags=["t"])
+    assert backend.get("a") == b"1"
+    backend.set("c", b"3", ttl=60, tags=["t"])
+
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+    assert backend.get("c") == b"3"
+
+
+def test_lru_backend_expires_entries(monkeypatch: Any) -> None:
+    backend = LRUCacheBackend()
+    backend.set("a", b"1", ttl=10, tags=[])
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert backend.get("a") is None
+
+
+def test_lru_backend_invalidates_by_tag() -> None:
+    backend = LRUCacheBackend()
+    backend.set("list", b"1", ttl=60, tags=["quests"])
+    backend.set("detail", b"2", ttl=60, tags=["quest:1"])
+    backend.invalidate_tags(["quests"])
+
+    assert backend.get("list") is None
+    assert backend.get("detail") == b"2"
+
+
+def test_quest_list_is_served_from_cache(
+    client: TestClient, create_quest: Callable[..., models.Quest]
+) -> None:
+    create_quest()
+
+    first = client.get("/api/v1/quests/")
+    second = client.get("/api/v1/quests/")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert first.json() == second.json()
+    assert response_cache.stats.hits == 1
+
+
+def test_quest_update_evicts_cached_responses(
+    client: TestClient, create_quest: Callable[..., models.Quest]
+) -> None:
+    quest = create_quest()
+    quest_id, author_email = quest.id, quest.author.email
+    client.get("/api/v1/quests/")
+    client.get(f"/api/v1/quests/{quest_id}/")
+
+    token = create_access_token(data={"sub": author_email})
+    response = client.put(
+        f"/api/v1/quests/{quest_id}",
+        json={"name": "Renamed Quest"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+
+    listing = client.get("/api/v1/quests/")
+    detail = client.get(f"/api/v1/quests/{quest_id}/")
+    assert listing.headers["X-Cache"] == "MISS"
+    assert listing.json()[0]["name"] == "Renamed Quest"
+    assert detail.headers["X-Cache"] == "MISS"
+    assert detail.json()["name"] == "Renamed Quest"
+
+
+def test_like_evicts_only_lists_showing_the_quest(
+    client: TestClient, create_quest: Callable[..., models.Quest]
+) -> None:
+    liked, other = create_quest("Liked Quest"), create_quest("Other Quest")
+    pages = {
+        quest["id"]: f"/api/v1/quests/?sort=popular&limit=1&skip={skip}"
+        for skip, quest in enumerate(client.get("/api/v1/quests/?sort=popular").json())
+    }
+    for url in pages.values():
+        client.get(url)
+
+    assert client.post(f"/api/v1/quests/{liked.id}/like/").status_code == 200
+
+    assert client.get(pages[liked.id]).headers["X-Cache"] == "MISS"
+    assert client.get(pages[other.id]).headers["X-Cache"] == "HIT"
+
+
+def test_location_update_evicts_quests_embedding_it(
+    client: TestClient,
+    db: Session,
+    sample_reference_data: Dict[str, Any],
+    create_quest: Callable[..., models.Quest],
+) -> None:
+    quest_id = create_quest().id
+    client.get(f"/api/v1/quests/{quest_id}/")
+
+    location = sample_reference_data["location"]
+    crud_locations.update_location(db, location, schemas.LocationUpdate(name="Moved"))
+    db.commit()
+
+    detail = client.get(f"/api/v1/quests/{quest_id}/")
+    assert detail.headers["X-Cache"] == "MISS"
+    assert detail.json()["start_location"]["name"] == "Moved"
+
+
+def test_rolled_back_write_keeps_cache(
+    client: TestClient, db: Session, create_quest: Callable[..., models.Quest]
+) -> None:
+    create_quest()
+    client.get("/api/v1/locations/")
+
+    crud_locations.create_location(
+        db, schemas.LocationCreate(name="Never Saved", latitude=0.0, longitude=0.0)
+    )
+    db.rollback()
+
+    assert client.get("/api/v1/locations/").headers["X-Cache"] == "HIT"
+
+
+def test_missing_quest_is_not_cached(client: TestClient) -> None:
+    assert client.get("/api/v1/quests/999/").status_code == 404
+    assert client.get("/api/v1/quests/999/").status_code == 404
+    assert response_cache.stats.hits == 0
@@ -0,0 +1,136 @@
+import asyncio
+import gzip
+import json
+from typing import Any, Dict, List
+
+import brotli
+import pytest
+import zstandard
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, negotiate
+from benchmarks import compression as compression_benchmark
+
+ENCODINGS = compression.available_encodings()
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, None),
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("zstd, gzip", "zstd"),
+        ("*", "br"),
+        ("*, br;q=0", "zstd"),
+        ("br;q=0, zstd;q=0, gzip;q=0", None),
+    ],
+)
+def test_negotiate(accept: str, expected: str) -> None:
+    encoding = negotiate(accept, ENCODINGS)
+    assert (encoding.name if encoding else None) == expected
+
+
+def decode(response: Any) -> bytes:
+    # httpx decodes gzip and br itself, but not zstd
+    if response.headers.get("content-encoding") == "zstd":
+        return zstandard.ZstdDecompressor().decompressobj().decompress(response.content)
+    return response.content
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_list_is_compressed(client: TestClient, seeded: Session, encoding: str) -> None:
+    plain = client.get("/api/v1/quests/", params={"limit": 20}, headers={"Accept-Encoding": "identity"})
+    response = client.get("/api/v1/quests/", params={"limit": 20}, headers={"Accept-Encoding": encoding})
+
+    assert "content-encoding" not in plain.headers
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(plain.content) / 3
+    assert json.loads(decode(response)) == plain.json()
+
+
+def test_small_responses_are_not_compressed(client: TestClient) -> None:
+    response = client.get("/api/v1/quests/999/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 404
+    assert "content-encoding" not in response.headers
+
+
+def test_cache_hits_reuse_compressed_bytes(
+    client: TestClient, seeded: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: List[str] = []
+    original = compression.Encoding.compress
+
+    def counting(self: compression.Encoding, data: bytes) -> bytes:
+        calls.append(self.name)
+        return original(self, data)
+
+    monkeypatch.setattr(compression.Encoding, "compress", counting)
+    responses = [
+        client.get("/api/v1/quests/", params={"limit": 20}, headers={"Accept-Encoding": accept})
+        for accept in ("br", "br", "gzip", "gzip", "identity")
+    ]
+
+    assert [response.headers["X-Cache"] for response in responses] == ["MISS", "HIT", "HIT", "HIT", "HIT"]
+    assert [response.headers.get("content-encoding") for response in responses] == ["br", "br", "gzip", "gzip", None]
+    # One compression per encoding, when its copy is first stored
+    assert calls == ["br", "gzip"]
+    assert len({response.text for response in responses}) == 1
+
+
+def test_strong_etag_becomes_weak_when_compressed(client: TestClient, seeded: Session) -> None:
+    plain = client.get("/api/v1/reference/all", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/api/v1/reference/all", headers={"Accept-Encoding": "gzip"})
+    if "content-encoding" in compressed.headers:
+        assert compressed.headers["etag"] == "W/" + plain.headers["etag"]
+    revalidated = client.get(
+        "/api/v1/reference/all", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+
+
+def test_streamed_response_is_compressed() -> None:
+    chunks = [json.dumps({"row": index, "padding": "x" * 200}).encode() + b"\n" for index in range(50)]
+
+    async def app(scope: Any, receive: Any, send: Any) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/x-ndjson")],
+        })
+        for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    sent: List[Dict[str, Any]] = []
+
+    async def send(message: Dict[str, Any]) -> None:
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(app, ENCODINGS)(scope, None, send))
+
+    start, *bodies = sent
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    assert gzip.decompress(b"".join(message["body"] for message in bodies)) == b"".join(chunks)
+
+
+def test_brotli_round_trip() -> None:
+    body = b'{"name": "quest"}' * 200
+    assert brotli.decompress(ENCODINGS["br"].compress(body)) == body
+
+
+def test_benchmark_reports_every_encoding() -> None:
+    report = compression_benchmark.measure(b'{"name": "quest", "synopsis": "a long walk"}' * 500, repeat=3)
+    assert set(report) == {"identity", *ENCODINGS}
+    for name, row in report.items():
+        if name != "identity":
+            assert row["bytes"] < report["identity"]["bytes"]
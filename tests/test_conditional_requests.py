@@ -0,0 +1,111 @@
+from typing import Callable, ContextManager, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token
+from app.db import crud_locations, crud_quests, likes, models, schemas
+from app.db.likes import MemoryLikeBuffer
+
+QueryBudget = Callable[[int], ContextManager[List[str]]]
+
+
+@pytest.fixture
+def quest(create_quest: Callable[..., models.Quest]) -> models.Quest:
+    return create_quest("Versioned Quest")
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/api/v1/quests/{quest}/", "/api/v1/campaigns/{campaign}/", "/api/v1/locations/{location}", "/api/v1/users/{user}/"],
+)
+def test_entity_endpoints_answer_if_none_match(
+    client: TestClient, db: Session, quest: models.Quest, path: str
+) -> None:
+    campaign = models.Campaign(title="Versioned Campaign", author_id=quest.author_id)
+    db.add(campaign)
+    db.commit()
+    url = path.format(quest=quest.id, campaign=campaign.id, location=quest.start_location_id, user=quest.author_id)
+
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "Last-Modified" in first.headers
+    assert "s-maxage=" in first.headers["Cache-Control"]
+
+    second = client.get(url, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+    assert second.headers["Cache-Control"] == first.headers["Cache-Control"]
+
+    assert client.get(url, headers={"If-None-Match": 'W/"other"'}).status_code == 200
+
+
+def test_not_modified_without_serializing(
+    client: TestClient, quest: models.Quest, query_budget: QueryBudget
+) -> None:
+    etag = client.get(f"/api/v1/quests/{quest.id}/").headers["ETag"]
+    # The cached validators answer without touching the database
+    with query_budget(0):
+        assert client.get(f"/api/v1/quests/{quest.id}/", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_uncached_quest_checks_before_rendering(
+    client: TestClient, quest: models.Quest, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    etag = client.get(f"/api/v1/quests/{quest.id}/", params={"fields": "name"}).headers["ETag"]
+    monkeypatch.setattr("app.api.v1.endpoints.quests.response_cache.backend", None)
+    monkeypatch.setattr("app.api.v1.endpoints.quests.dump_one_json", None)  # Would fail if called
+
+    response = client.get(f"/api/v1/quests/{quest.id}/", params={"fields": "name"}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_etag_changes_with_embedded_rows_and_counters(
+    client: TestClient, db: Session, quest: models.Quest, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url = f"/api/v1/quests/{quest.id}/"
+    seen = {client.get(url).headers["ETag"]}
+
+    token = create_access_token(data={"sub": quest.author.email})
+    client.put(f"/api/v1/quests/{quest.id}", json={"name": "Renamed"}, headers={"Authorization": f"Bearer {token}"})
+    seen.add(client.get(url).headers["ETag"])
+
+    crud_locations.update_location(db, quest.start_location, schemas.LocationUpdate(name="Moved"))
+    db.commit()
+    seen.add(client.get(url).headers["ETag"])
+
+    crud_quests.like_quest(db, quest_id=quest.id)
+    db.commit()
+    seen.add(client.get(url).headers["ETag"])
+
+    buffer = MemoryLikeBuffer()
+    monkeypatch.setattr(likes, "like_buffer", buffer)
+    buffer.add(quest.id)
+    client.post(f"{url}like/")  # Evicts the cached detail like a buffered like does
+    seen.add(client.get(url).headers["ETag"])
+
+    assert len(seen) == 5
+
+
+def test_row_version_increments_on_core_updates(db: Session, quest: models.Quest) -> None:
+    assert quest.row_version == 1
+    crud_quests.like_quest(db, quest_id=quest.id)
+    db.commit()
+    db.refresh(quest)
+    assert quest.row_version == 2
+
+
+def test_if_modified_since(client: TestClient, quest: models.Quest) -> None:
+    url = f"/api/v1/locations/{quest.start_location_id}"
+    last_modified = client.get(url).headers["Last-Modified"]
+
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}).status_code == 200
+    # If-None-Match wins over If-Modified-Since
+    assert client.get(
+        url, headers={"If-Modified-Since": last_modified, "If-None-Match": 'W/"other"'}
+    ).status_code == 200
@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.security import create_access_token
+from app.db import crud_quests, models
+from app.db.models import Base
+
+
+def test_parallel_likes_are_not_lost(tmp_path: Path) -> None:
+    """Each like is one UPDATE, so concurrent transactions cannot overwrite each other."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'likes.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    Sessions = sessionmaker(bind=engine, autoflush=False)
+
+    with Sessions() as db:
+        # Its own database, so not the create_quest fixture
+        quest = models.Quest(
+            name="Popular Quest",
+            author=models.User(email="counter@example.com", display_name="Counter", hashed_password="x"),
+            start_location=models.Location(name="Tavern", latitude=0.0, longitude=0.0),
+        )
+        db.add(quest)
+        db.commit()
+        quest_id = quest.id
+
+    def like(_: int) -> int:
+        with Sessions() as db:
+            likes = crud_quests.like_quest(db, quest_id)
+            db.commit()
+            return likes
+
+    parallel = 40
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        returned = list(pool.map(like, range(parallel)))
+
+    assert sorted(returned) == list(range(1, parallel + 1))
+    with Sessions() as db:
+        assert db.get(models.Quest, quest_id).likes == parallel
+    engine.dispose()
+
+
+def test_like_endpoint(client: TestClient, create_quest: Callable[..., models.Quest]) -> None:
+    quest_id = create_quest().id
+
+    assert client.post(f"/api/v1/quests/{quest_id}/like/").json()["likes"] == 1
+    assert client.post(f"/api/v1/quests/{quest_id}/like/").json()["likes"] == 2
+    assert client.post("/api/v1/quests/999/like/").status_code == 404
+
+
+def test_bookmark_toggle(
+    client: TestClient,
+    db: Session,
+    create_quest: Callable[..., models.Quest],
+    select_statements: List[str],
+) -> None:
+    quest = create_quest()
+    quest_id = quest.id
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': quest.author.email})}"}
+    client.get("/api/v1/users/me/", headers=headers)
+    select_statements.clear()
+
+    added = client.post(f"/api/v1/quests/{quest_id}/bookmark/", headers=headers)
+    assert added.json() == {"bookmarks": 1, "user_bookmarked": True}
+    # The quest and bookmark rows are never read back before writing
+    assert select_statements == []
+
+    removed = client.post(f"/api/v1/quests/{quest_id}/bookmark/", headers=headers)
+    assert removed.json() == {"bookmarks": 0, "user_bookmarked": False}
+    assert db.query(models.UserQuestBookmark).count() == 0
+
+    missing = client.post("/api/v1/quests/999/bookmark/", headers=headers)
+    assert missing.status_code == 404
@@ -0,0 +1,323 @@
+from datetime import datetime
+from typing import Any, Callable, ContextManager, Dict, List, Tuple
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.db import crud_campaigns, crud_follows, crud_quests, feed, models, schemas
+from app.db.feed import RedisTimelineStore, TableTimelineStore
+
+QueryBudget = Callable[[int], ContextManager[List[str]]]
+CreateQuest = Callable[..., models.Quest]
+
+FEED_URL = "/api/v1/users/me/feed/"
+FOLLOWING_URL = "/api/v1/users/me/following/"
+
+
+@pytest.fixture
+def users(db: Session) -> Dict[str, models.User]:
+    users = {
+        name: models.User(
+            email=f"{name}@example.com", display_name=name.title(), hashed_password=get_password_hash("password123")
+        )
+        for name in ("reader", "author", "other", "star")
+    }
+    db.add_all(users.values())
+    db.commit()
+    return users
+
+
+def auth(user: models.User) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+
+
+def create_campaign(db: Session, author: models.User, title: str, **fields: Any) -> int:
+    campaign = crud_campaigns.create_campaign(db, schemas.CampaignCreate(title=title, **fields), author_id=author.id)
+    db.commit()
+    return campaign.id
+
+
+def follow(db: Session, follower: models.User, followee: models.User) -> None:
+    crud_follows.follow_user(db, follower.id, followee.id)
+    db.commit()
+
+
+def newest_first(db: Session, *authors: models.User) -> List[Tuple[str, str]]:
+    """The public items of ``authors`` in feed order, whatever second each was created in."""
+    author_ids = [author.id for author in authors]
+    items = [
+        (feed.as_utc(quest.created_at), "quest", quest.id, quest.name)
+        for quest in db.query(models.Quest).filter(models.Quest.author_id.in_(author_ids), models.Quest.is_public)
+    ] + [
+        (feed.as_utc(campaign.created_at), "campaign", campaign.id, campaign.title)
+        for campaign in db.query(models.Campaign).filter(models.Campaign.author_id.in_(author_ids))
+    ]
+    return [(kind, name) for _, kind, _, name in sorted(items, reverse=True)]
+
+
+def feed_items(response: Any) -> List[Tuple[str, str]]:
+    assert response.status_code == 200, response.text
+    return [
+        (item["type"], item["quest"]["name"] if item["type"] == "quest" else item["campaign"]["title"])
+        for item in response.json()
+    ]
+
+
+def read_feed(client: TestClient, user: models.User, limit: int = 20) -> List[Tuple[str, str]]:
+    """Every item of ``user``'s feed, page by page."""
+    items: List[Tuple[str, str]] = []
+    params: Dict[str, Any] = {"limit": limit}
+    while True:
+        response = client.get(FEED_URL, params=params, headers=auth(user))
+        items.extend(feed_items(response))
+        if "X-Next-Cursor" not in response.headers:
+            return items
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+
+def test_follow_and_unfollow(client: TestClient, db: Session, users: Dict[str, models.User]) -> None:
+    reader, author = users["reader"], users["author"]
+
+    response = client.post(FOLLOWING_URL, json={"followee_id": author.id}, headers=auth(reader))
+    assert response.status_code == 200
+    assert response.json()["followee"]["display_name"] == "Author"
+    # Following twice is not an error, nor a second follow
+    assert client.post(FOLLOWING_URL, json={"followee_id": author.id}, headers=auth(reader)).status_code == 200
+    assert client.post(FOLLOWING_URL, json={"followee_id": reader.id}, headers=auth(reader)).status_code == 400
+    assert client.post(FOLLOWING_URL, json={"followee_id": 999}, headers=auth(reader)).status_code == 404
+
+    following = client.get(FOLLOWING_URL, headers=auth(reader)).json()
+    assert [follow["followee_id"] for follow in following] == [author.id]
+    db.refresh(author)
+    assert author.follower_count == 1
+
+    assert client.delete(f"{FOLLOWING_URL}{author.id}/", headers=auth(reader)).status_code == 204
+    assert client.delete(f"{FOLLOWING_URL}{author.id}/", headers=auth(reader)).status_code == 404
+    assert client.get(FOLLOWING_URL, headers=auth(reader)).json() == []
+    db.refresh(author)
+    assert author.follower_count == 0
+
+
+def test_feed_shows_new_items_of_followed_users(
+    client: TestClient,
+    db: Session,
+    users: Dict[str, models.User],
+    sample_reference_data: Dict[str, Any],
+    create_quest: CreateQuest,
+) -> None:
+    reader, author = users["reader"], users["author"]
+    follow(db, reader, author)
+    create_quest("First", author=author)
+    create_quest("Hidden", author=author, is_public=False)
+    create_campaign(db, author, "Saga")
+    create_quest("Unfollowed", author=users["other"])
+    response = client.post(
+        "/api/v1/quests/",
+        json={
+            "name": "Posted", "synopsis": "A quest", "itinerary": "There and back",
+            "start_location_id": sample_reference_data["location"].id,
+            "interest_id": sample_reference_data["interest"].id,
+            "difficulty_id": sample_reference_data["difficulty"].id,
+            "quest_type_id": sample_reference_data["quest_type"].id,
+        },
+        headers=auth(author),
+    )
+    assert response.status_code == 200
+
+    response = client.get(FEED_URL, headers=auth(reader))
+    assert sorted(feed_items(response)) == [("campaign", "Saga"), ("quest", "First"), ("quest", "Posted")]
+    # Newest first; items of the same second put quests before campaigns
+    assert feed_items(response) == newest_first(db, author)
+    campaign = next(item for item in response.json() if item["type"] == "campaign")
+    assert campaign["quest"] is None and campaign["campaign"]["author"]["display_name"] == "Author"
+    for item in response.json():
+        schemas.FeedItemOut.model_validate(item)
+
+    assert client.get(FEED_URL, headers=auth(author)).json() == []
+    assert client.get(FEED_URL).status_code == 401
+
+
+def test_following_backfills_and_unfollowing_removes(
+    client: TestClient, db: Session, users: Dict[str, models.User], create_quest: CreateQuest
+) -> None:
+    reader, author = users["reader"], users["author"]
+    create_quest("Earlier", author=author)
+    create_campaign(db, author, "Earlier Saga")
+    assert read_feed(client, reader) == []
+
+    client.post(FOLLOWING_URL, json={"followee_id": author.id}, headers=auth(reader))
+    assert read_feed(client, reader) == newest_first(db, author)
+    assert len(newest_first(db, author)) == 2
+
+    client.delete(f"{FOLLOWING_URL}{author.id}/", headers=auth(reader))
+    assert read_feed(client, reader) == []
+    assert db.scalar(select(func.count()).select_from(models.FeedEntry)) == 0
+
+
+def test_private_and_deleted_items_leave_the_feed(
+    client: TestClient, db: Session, users: Dict[str, models.User], create_quest: CreateQuest
+) -> None:
+    reader, author = users["reader"], users["author"]
+    follow(db, reader, author)
+    create_quest("Kept", author=author)
+    hidden = create_quest("Later hidden", author=author).id
+    removed = create_campaign(db, author, "Removed")
+
+    crud_quests.update_quest(db, crud_quests.get_quest(db, hidden), schemas.QuestUpdate(is_public=False))
+    crud_campaigns.delete_campaign(db, removed)
+    db.commit()
+    assert read_feed(client, reader) == [("quest", "Kept")]
+
+
+def test_feed_pages_with_cursor(
+    client: TestClient, db: Session, users: Dict[str, models.User], create_quest: CreateQuest
+) -> None:
+    reader = users["reader"]
+    for author in (users["author"], users["other"]):
+        follow(db, reader, author)
+        for index in range(4):
+            create_quest(f"{author.display_name} quest {index}", author=author)
+            create_campaign(db, author, f"{author.display_name} saga {index}")
+
+    everything = read_feed(client, reader)
+    assert everything == newest_first(db, users["author"], users["other"])
+    assert len(everything) == 16
+    for limit in (1, 3, 5):
+        assert read_feed(client, reader, limit=limit) == everything
+    assert client.get(FEED_URL, params={"cursor": "garbage"}, headers=auth(reader)).status_code == 400
+
+
+def test_widely_followed_authors_are_read_at_feed_time(
+    client: TestClient,
+    db: Session,
+    users: Dict[str, models.User],
+    create_quest: CreateQuest,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 2)
+    reader, author, star = users["reader"], users["author"], users["star"]
+    follow(db, reader, author)
+    create_quest("Pushed before fame", author=star)
+    follow(db, reader, star)
+    follow(db, users["other"], star)  # Reaches the threshold
+    for index in range(3):
+        create_quest(f"Star quest {index}", author=star)
+        create_quest(f"Author quest {index}", author=author)
+    create_campaign(db, star, "Star saga")
+
+    timelines = db.execute(select(models.FeedEntry.follower_id, models.FeedEntry.author_id)).all()
+    # Nothing the star created after the threshold was pushed
+    assert timelines.count((reader.id, star.id)) == 1
+    assert (users["other"].id, star.id) not in timelines
+
+    everything = read_feed(client, reader)
+    assert everything == newest_first(db, author, star)
+    assert len(everything) == 8
+    assert read_feed(client, reader, limit=2) == everything
+    assert read_feed(client, users["other"]) == newest_first(db, star)
+
+
+def test_feed_read_costs_the_same_whatever_is_followed(
+    client: TestClient,
+    db: Session,
+    users: Dict[str, models.User],
+    create_quest: CreateQuest,
+    query_budget: QueryBudget,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 1)
+    reader = users["reader"]
+    client.get(FEED_URL, headers=auth(reader))  # Caches the principal
+    for author in (users["author"], users["other"], users["star"]):
+        follow(db, reader, author)
+        for index in range(15):
+            create_quest(f"{author.display_name} quest {index}", author=author)
+            create_campaign(db, author, f"{author.display_name} saga {index}")
+
+    # Timeline, pulled authors, one pull per kind, quests (joined), campaigns
+    headers = auth(reader)
+    with query_budget(6) as statements:
+        response = client.get(FEED_URL, params={"limit": 10}, headers=headers)
+    assert len(response.json()) == 10
+    # Reading a feed never writes
+    assert all(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+
+
+def test_table_timelines_are_trimmed(
+    db: Session, users: Dict[str, models.User], create_quest: CreateQuest, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(feed, "timeline_store", TableTimelineStore(max_entries=3))
+    reader, author = users["reader"], users["author"]
+    follow(db, reader, author)
+    for index in range(5):
+        create_quest(f"Quest {index}", author=author)
+    assert db.scalar(select(func.count()).select_from(models.FeedEntry)) == 5
+
+    # Entries sharing the oldest kept instant stay
+    db.execute(models.FeedEntry.__table__.update().values(created_at=datetime(2024, 3, 1, 12)))
+    db.commit()
+    assert feed.trim_timelines(db) == 0
+    db.execute(models.FeedEntry.__table__.update().where(models.FeedEntry.item_id <= 2).values(
+        created_at=func.datetime(models.FeedEntry.created_at, "-1 hour")
+    ))
+    db.commit()
+    # Reading leaves the timeline alone; trimming keeps the newest entries
+    assert len(crud_follows.get_feed(db, reader.id, limit=10).items) == 5
+    assert feed.trim_timelines(db) == 2
+    page = crud_follows.get_feed(db, reader.id, limit=10)
+    assert sorted(item.item.name for item in page.items) == ["Quest 2", "Quest 3", "Quest 4"]
+
+
+def test_redis_timelines(
+    db: Session,
+    users: Dict[str, models.User],
+    sample_reference_data: Dict[str, Any],
+    create_quest: CreateQuest,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    store = RedisTimelineStore(fakeredis.FakeRedis(), max_entries=4)
+    monkeypatch.setattr(feed, "timeline_store", store)
+    reader, author = users["reader"], users["author"]
+    follow(db, reader, author)
+
+    crud_quests.create_quest(
+        db,
+        schemas.QuestCreate(
+            name="Rolled back", synopsis="s", itinerary="i",
+            start_location_id=sample_reference_data["location"].id,
+            interest_id=sample_reference_data["interest"].id,
+            difficulty_id=sample_reference_data["difficulty"].id,
+            quest_type_id=sample_reference_data["quest_type"].id,
+        ),
+        author_id=author.id,
+    )
+    # Written after commit only
+    assert store.client.zcard(store._key(reader.id)) == 0
+    db.rollback()
+    assert store.client.zcard(store._key(reader.id)) == 0
+
+    for index in range(3):
+        create_quest(f"Quest {index}", author=author)
+        create_campaign(db, author, f"Saga {index}")
+    # Trimmed to the newest entries
+    assert store.client.zcard(store._key(reader.id)) == 4
+
+    items = []
+    cursor = None
+    while True:
+        page = crud_follows.get_feed(db, reader.id, limit=3, cursor=cursor)
+        items.extend((entry.kind, getattr(entry.item, "name", None) or entry.item.title) for entry in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    assert items == newest_first(db, author)[:4]
+
+    crud_follows.unfollow_user(db, reader.id, author.id)
+    assert store.client.zcard(store._key(reader.id)) == 4
+    db.commit()
+    assert store.client.zcard(store._key(reader.id)) == 0
@@ -0,0 +1,88 @@
+import math
+from typing import Callable, ContextManager, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db import geo, models, schemas
+from app.db.fieldsets import FieldSelection, InvalidFieldSelectionError, selectable
+
+QueryBudget = Callable[[int], ContextManager[List[str]]]
+
+
+def test_whitelist_comes_from_schema() -> None:
+    scalars, embeds = selectable(models.Quest, schemas.QuestOut)
+    assert {"id", "name", "likes", "start_location_id"} <= scalars
+    assert "hashed_password" not in scalars and "trending_score" not in scalars
+    assert embeds == {"author", "start_location", "destination", "interest", "difficulty", "quest_type", "campaign"}
+
+
+def test_from_params_defaults() -> None:
+    _, embeds = selectable(models.Quest, schemas.QuestOut)
+    assert FieldSelection.from_params(models.Quest, schemas.QuestOut, None, None) is None
+    assert FieldSelection.from_params(models.Quest, schemas.QuestOut, "name", None) == FieldSelection(
+        fields=frozenset({"id", "name"}), embeds=frozenset()
+    )
+    assert FieldSelection.from_params(models.Quest, schemas.QuestOut, None, "").embeds == frozenset()
+    assert FieldSelection.from_params(models.Quest, schemas.QuestOut, None, "author").embeds == {"author"}
+    with pytest.raises(InvalidFieldSelectionError, match="Unknown 'embed' value"):
+        FieldSelection.from_params(models.Quest, schemas.QuestOut, None, "comments")
+
+
+def test_sparse_list_narrows_select_and_json(
+    client: TestClient, seeded: Session, query_budget: QueryBudget
+) -> None:
+    with query_budget(1) as statements:
+        response = client.get("/api/v1/quests/", params={"fields": "id,name", "embed": "start_location", "limit": 5})
+
+    assert response.status_code == 200
+    quests = response.json()
+    assert len(quests) == 5
+    assert set(quests[0]) == {"id", "name", "start_location"}
+    assert {"latitude", "longitude"} <= set(quests[0]["start_location"])
+
+    [statement] = statements
+    assert "quests.synopsis" not in statement and "quests.itinerary" not in statement
+    assert "users" not in statement and "campaigns" not in statement
+    assert "locations" in statement
+
+
+def test_sparse_list_pages_with_cursor(client: TestClient, seeded: Session, query_budget: QueryBudget) -> None:
+    params = {"fields": "name", "sort": "popular", "limit": 10}
+    with query_budget(1):
+        first = client.get("/api/v1/quests/", params=params)
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/api/v1/quests/", params={**params, "cursor": cursor})
+    full = client.get("/api/v1/quests/", params={"sort": "popular", "limit": 20}).json()
+    assert [quest["id"] for quest in first.json() + second.json()] == [quest["id"] for quest in full]
+
+
+def test_sparse_list_near_point(client: TestClient, seeded: Session, query_budget: QueryBudget) -> None:
+    # Without a radius the SQLite fallback reads one widening ring per query
+    rings = math.ceil(math.log(geo.MAX_RADIUS_KM / geo.FIRST_RING_KM, geo.RING_GROWTH)) + 1
+    with query_budget(rings) as statements:
+        response = client.get("/api/v1/quests/", params={"fields": "name", "near": "51.5,-0.1", "limit": 5})
+    assert response.status_code == 200
+    # The same sparse SELECT each time, with no lazy loads in between
+    assert len(set(statements)) == 1
+    assert set(response.json()[0]) == {"id", "name"}
+
+
+def test_sparse_detail(client: TestClient, seeded: Session) -> None:
+    full = client.get("/api/v1/quests/1/").json()
+    response = client.get("/api/v1/quests/1/", params={"fields": "name,likes", "embed": "author"})
+
+    assert response.json() == {"id": 1, "name": full["name"], "likes": full["likes"], "author": full["author"]}
+    only_embeds = client.get("/api/v1/quests/1/", params={"embed": "difficulty"}).json()
+    assert "author" not in only_embeds and only_embeds["difficulty"] == full["difficulty"]
+    assert only_embeds["synopsis"] == full["synopsis"]
+
+
+@pytest.mark.parametrize("params", [{"fields": "id,hashed_password"}, {"embed": "author,comments"}])
+def test_unknown_names_are_rejected(client: TestClient, seeded: Session, params: dict) -> None:
+    response = client.get("/api/v1/quests/", params=params)
+    assert response.status_code == 400
+    assert "expected any of" in response.json()["detail"]
+    assert client.get("/api/v1/quests/1/", params=params).status_code == 400
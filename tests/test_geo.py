@@ -0,0 +1,134 @@
+from typing import Any, Dict
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db import geo, models
+from app.db.geo import GeoPoint, haversine_km, radius_bounding_box
+
+PLACES = {
+    "Edinburgh Castle": (55.9486, -3.1999),
+    "Stonehenge": (51.1789, -1.8262),
+    "Tower of London": (51.5081, -0.0759),
+    "Statue of Liberty": (40.6892, -74.0445),
+}
+
+
+@pytest.fixture
+def places(db: Session) -> Dict[str, models.Location]:
+    locations = {
+        name: models.Location(name=name, latitude=lat, longitude=lon)
+        for name, (lat, lon) in PLACES.items()
+    }
+    db.add_all(locations.values())
+    db.commit()
+    return locations
+
+
+def test_haversine_km() -> None:
+    london, paris = GeoPoint(51.5074, -0.1278), GeoPoint(48.8566, 2.3522)
+    assert haversine_km(london, paris) == pytest.approx(343.5, abs=1)
+
+
+def test_radius_bounding_box_contains_circle() -> None:
+    box = radius_bounding_box(GeoPoint(51.5, -0.1), 100)
+    assert box.min_latitude < 51.5 - 0.89 and box.max_latitude > 51.5 + 0.89
+    assert box.min_longitude < -0.1 - 1.4 and box.max_longitude > -0.1 + 1.4
+
+    polar = radius_bounding_box(GeoPoint(89.5, 10.0), 100)
+    assert (polar.min_longitude, polar.max_longitude) == (-180.0, 180.0)
+
+
+def test_locations_near_sorted_by_distance(client: TestClient, places: Dict[str, Any]) -> None:
+    response = client.get("/api/v1/locations/?near=51.5,-0.12&radius_km=150")
+    assert response.status_code == 200
+    assert [location["name"] for location in response.json()] == ["Tower of London", "Stonehenge"]
+
+
+def test_locations_near_without_radius_widen_a_ring(
+    client: TestClient, places: Dict[str, Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    measured = []
+
+    def counting_haversine(a: GeoPoint, b: GeoPoint) -> float:
+        measured.append(b)
+        return haversine_km(a, b)
+
+    monkeypatch.setattr(geo, "haversine_km", counting_haversine)
+    response = client.get("/api/v1/locations/?near=51.5,-0.12&limit=1")
+    assert [location["name"] for location in response.json()] == ["Tower of London"]
+    # Only the locations in the first ring were read
+    assert len(measured) == 1
+
+    response = client.get("/api/v1/locations/?near=51.5,-0.12")
+    assert [location["name"] for location in response.json()] == [
+        "Tower of London",
+        "Stonehenge",
+        "Edinburgh Castle",
+        "Statue of Liberty",
+    ]
+
+
+def test_locations_in_bbox(client: TestClient, places: Dict[str, Any]) -> None:
+    # Southern Britain, sorted by distance from the centre of the box (50.5, -3)
+    response = client.get("/api/v1/locations/?bbox=-8,44,2,57")
+    assert response.status_code == 200
+    assert [location["name"] for location in response.json()] == [
+        "Stonehenge",
+        "Tower of London",
+        "Edinburgh Castle",
+    ]
+
+
+def test_quests_near_filters_on_start_location(
+    client: TestClient,
+    db: Session,
+    places: Dict[str, models.Location],
+    sample_reference_data: Dict[str, Any],
+) -> None:
+    author = models.User(
+        email="cartographer@example.com",
+        display_name="Cartographer",
+        hashed_password=get_password_hash("password123"),
+    )
+    db.add(author)
+    for name, location in places.items():
+        db.add(
+            models.Quest(
+                name=f"Quest at {name}",
+                author=author,
+                start_location=location,
+                interest_id=sample_reference_data["interest"].id,
+                difficulty_id=sample_reference_data["difficulty"].id,
+                quest_type_id=sample_reference_data["quest_type"].id,
+            )
+        )
+    db.commit()
+
+    response = client.get("/api/v1/quests/?near=55.95,-3.19&radius_km=600&limit=2")
+    assert response.status_code == 200
+    assert [quest["name"] for quest in response.json()] == [
+        "Quest at Edinburgh Castle",
+        "Quest at Tower of London",
+    ]
+
+    response = client.get("/api/v1/quests/?near=55.95,-3.19&radius_km=100")
+    assert [quest["name"] for quest in response.json()] == ["Quest at Edinburgh Castle"]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "near=51.5",
+        "near=abc,def",
+        "near=91,0",
+        "radius_km=10",
+        "bbox=1,2,3",
+        "bbox=2,50,-6,57",
+    ],
+)
+def test_invalid_spatial_parameters(client: TestClient, query: str) -> None:
+    response = client.get(f"/api/v1/locations/?{query}")
+    assert response.status_code == 400
@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any, Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.util.concurrency import greenlet_spawn
+
+from app.core import hashing
+from app.core.hashing import PasswordHasher, PasswordHashingBusyError
+from app.db import crud_users
+
+
+@pytest.fixture(scope="module")
+def hasher() -> Generator[PasswordHasher, None, None]:
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    hasher.start()
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_and_verify_in_worker_process(hasher: PasswordHasher) -> None:
+    hashed = hasher.hash("password123")
+    assert hashed.startswith("$2b$")
+    assert hasher.verify("password123", hashed)
+    assert not hasher.verify("wrong", hashed)
+    assert hasher.pending == 0
+
+
+def test_async_and_greenlet_callers(hasher: PasswordHasher) -> None:
+    hashed = hasher.hash("password123")
+
+    async def scenario() -> Any:
+        # Coroutine API, and the sync API as called inside AsyncSession.run_sync
+        return (
+            await hasher.verify_async("password123", hashed),
+            await greenlet_spawn(hasher.verify, "password123", hashed),
+        )
+
+    assert asyncio.run(scenario()) == (True, True)
+
+
+def test_saturated_pool_rejects_work(hasher: PasswordHasher) -> None:
+    hasher._submit(hashing._hash, "password123")
+    with pytest.raises(PasswordHashingBusyError):
+        hasher.hash("password123")
+
+
+def test_login_returns_503_when_hashing_is_saturated(client: TestClient, monkeypatch: Any) -> None:
+    client.post(
+        "/api/v1/auth/register/",
+        json={"email": "storm@example.com", "display_name": "Storm", "password": "password123"},
+    )
+
+    def busy(*args: Any) -> bool:
+        raise PasswordHashingBusyError("Password hashing is at capacity")
+
+    monkeypatch.setattr(crud_users, "verify_password", busy)
+    response = client.post(
+        "/api/v1/auth/login/", data={"username": "storm@example.com", "password": "password123"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,97 @@
+from typing import Any, Callable, ContextManager, List
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db import likes, models
+from app.db.likes import LikeBuffer, MemoryLikeBuffer, RedisLikeBuffer, flush_likes
+
+
+@pytest.fixture(params=["memory", "redis"])
+def buffer(request: Any) -> LikeBuffer:
+    if request.param == "memory":
+        return MemoryLikeBuffer()
+    return RedisLikeBuffer(fakeredis.FakeRedis(), snapshot_ttl=0)
+
+
+def test_buffer_keeps_likes_during_and_after_failed_flush(buffer: LikeBuffer) -> None:
+    assert buffer.begin_flush() == {}
+    buffer.end_flush(committed=True)
+
+    buffer.add(1)
+    assert buffer.add(1) == 2
+    buffer.add(2, count=3)
+    assert buffer.begin_flush() == {1: 2, 2: 3}
+
+    # Likes arriving mid-flush count towards pending but are not taken
+    assert buffer.add(1) == 3
+    assert buffer.pending(1) == 3
+    buffer.end_flush(committed=False)
+    assert (buffer.pending(1), buffer.pending(2)) == (3, 3)
+
+    assert buffer.begin_flush() == {1: 3, 2: 3}
+    buffer.end_flush(committed=True)
+    assert (buffer.pending(1), buffer.pending(2)) == (0, 0)
+
+
+def test_flush_writes_all_quests_in_one_update(
+    db: Session,
+    create_quest: Callable[..., models.Quest],
+    record_statements: Callable[..., ContextManager[List[str]]],
+) -> None:
+    first, second = create_quest("First Quest").id, create_quest("Second Quest").id
+    buffer = MemoryLikeBuffer()
+    buffer.add(first, count=5)
+    buffer.add(second)
+
+    with record_statements("UPDATE") as updates:
+        assert flush_likes(db, buffer) == 2
+
+    assert len(updates) == 1
+    db.expire_all()
+    first_quest, second_quest = db.get(models.Quest, first), db.get(models.Quest, second)
+    assert (first_quest.likes, second_quest.likes) == (5, 1)
+    # Five likes in one flush trend higher than one
+    assert first_quest.trending_score > second_quest.trending_score > 0
+    assert buffer.pending(first) == 0
+
+
+def test_failed_flush_restores_deltas(
+    db: Session, create_quest: Callable[..., models.Quest], monkeypatch: Any
+) -> None:
+    quest_id = create_quest().id
+    buffer = MemoryLikeBuffer()
+    buffer.add(quest_id, count=4)
+
+    def fail(*args: Any) -> None:
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(likes, "_apply_deltas", fail)
+    with pytest.raises(RuntimeError):
+        flush_likes(db, buffer)
+    assert buffer.pending(quest_id) == 4
+
+
+def test_buffered_like_endpoint(
+    client: TestClient, db: Session, create_quest: Callable[..., models.Quest], monkeypatch: Any
+) -> None:
+    quest_id = create_quest().id
+    monkeypatch.setattr(likes, "like_buffer", MemoryLikeBuffer())
+
+    assert client.get(f"/api/v1/quests/{quest_id}/").json()["likes"] == 0
+    assert client.post(f"/api/v1/quests/{quest_id}/like/").json()["likes"] == 1
+    assert client.post(f"/api/v1/quests/{quest_id}/like/").json()["likes"] == 2
+    assert client.post("/api/v1/quests/999/like/").status_code == 404
+
+    # Not written yet, but readers already see the pending likes
+    assert db.get(models.Quest, quest_id).likes == 0
+    assert client.get(f"/api/v1/quests/{quest_id}/").json()["likes"] == 2
+
+    assert flush_likes(db) == 1
+    db.expire_all()
+    assert db.get(models.Quest, quest_id).likes == 2
+    assert likes.pending_likes(quest_id) == 0
+    assert client.get(f"/api/v1/quests/{quest_id}/").json()["likes"] == 2
+    assert client.get("/api/v1/quests/").json()[0]["likes"] == 2
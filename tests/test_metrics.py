@@ -0,0 +1,99 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from prometheus_client.parser import text_string_to_metric_families
+
+from app.core import metrics
+from app.core.principal_cache import principal_cache
+
+from benchmarks import middleware_overhead
+
+project_root = Path(__file__).parent.parent
+
+
+def samples(text: str) -> Dict[str, float]:
+    return {
+        f"{sample.name}{sorted(sample.labels.items())}": sample.value
+        for family in text_string_to_metric_families(text)
+        for sample in family.samples
+    }
+
+
+def test_metrics_endpoint(client: TestClient) -> None:
+    client.get("/api/v1/quests/999/")
+    client.get("/api/v1/quests/998/")
+    client.get("/no/such/route")
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    values = samples(response.text)
+
+    by_template = "http_request_duration_seconds_count[('method', 'GET'), ('route', '/api/v1/quests/{quest_id}/'), ('status', '404')]"
+    assert values[by_template] >= 2
+    assert "http_request_duration_seconds_count[('method', 'GET'), ('route', '<unmatched>'), ('status', '404')]" in values
+    # The scrape itself is in flight
+    assert values["http_requests_in_flight[]"] >= 1
+    misses = "cache_requests_total[('cache', 'responses'), ('result', 'miss')]"
+    assert misses in values
+    assert "password_hash_pending[]" in values
+
+
+def test_cache_counts_only_grow() -> None:
+    labels = {"cache": "principals", "result": "hit"}
+    metrics.refresh_process_gauges(force=True)
+    before = REGISTRY.get_sample_value("cache_requests_total", labels)
+    assert before is not None
+
+    principal_cache.stats.hits += 3
+    metrics.refresh_process_gauges(force=True)
+    assert REGISTRY.get_sample_value("cache_requests_total", labels) == before + 3
+
+    # Clearing the cache resets its stats, not the exported count
+    principal_cache.clear()
+    principal_cache.stats.hits += 1
+    metrics.refresh_process_gauges(force=True)
+    assert REGISTRY.get_sample_value("cache_requests_total", labels) == before + 4
+
+
+WORKER = """
+import asyncio
+from app.core.middleware import MetricsMiddleware
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+
+asyncio.run(MetricsMiddleware(app)({"type": "http", "method": "GET", "path": "/"}, None, lambda message: asyncio.sleep(0)))
+"""
+
+SCRAPE = """
+from app.core import metrics
+print(metrics.render().decode())
+"""
+
+
+def test_metrics_aggregate_across_processes(tmp_path: Path) -> None:
+    env = {
+        **os.environ,
+        "PROMETHEUS_MULTIPROC_DIR": str(tmp_path),
+        "DATABASE_URL": "sqlite:///:memory:",
+        "JWT_SECRET_KEY": "test-secret-key-for-testing-only",
+    }
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", WORKER], env=env, cwd=project_root, check=True)
+    scrape = subprocess.run(
+        [sys.executable, "-c", SCRAPE], env=env, cwd=project_root, check=True, capture_output=True, text=True
+    )
+
+    values = samples(scrape.stdout)
+    key = "http_request_duration_seconds_count[('method', 'GET'), ('route', '<unmatched>'), ('status', '200')]"
+    assert values[key] == 2
+
+
+def test_middleware_overhead_is_small() -> None:
+    for name, overhead_us in middleware_overhead.measure(requests=5000).items():
+        assert overhead_us < middleware_overhead.MAX_OVERHEAD_US, name
@@ -0,0 +1,165 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Set
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import MetaData, create_engine, inspect, text
+
+from app.db import search, trending  # noqa: F401  search adds the quests_fts DDL to create_all
+from app.db.models import Base
+
+project_root = Path(__file__).parent.parent
+
+
+def alembic_config(database_url: str, monkeypatch: Any) -> Config:
+    # alembic/env.py reads the URL from the environment
+    monkeypatch.setenv("DATABASE_URL", database_url)
+    # No ini file, so env.py leaves the test run's logging configuration alone
+    config = Config()
+    config.set_main_option("script_location", str(project_root / "alembic"))
+    return config
+
+
+def quest_indexes(database_url: str) -> Set[str]:
+    engine = create_engine(database_url)
+    try:
+        return {index["name"] for index in inspect(engine).get_indexes("quests")}
+    finally:
+        engine.dispose()
+
+
+def table_indexes(database_url: str, table: str) -> Set[str]:
+    engine = create_engine(database_url)
+    try:
+        return {index["name"] for index in inspect(engine).get_indexes(table)}
+    finally:
+        engine.dispose()
+
+
+def quest_columns(database_url: str) -> Set[str]:
+    engine = create_engine(database_url)
+    try:
+        return {column["name"] for column in inspect(engine).get_columns("quests")}
+    finally:
+        engine.dispose()
+
+
+def table_columns(database_url: str, table: str) -> Set[str]:
+    engine = create_engine(database_url)
+    try:
+        return {column["name"] for column in inspect(engine).get_columns(table)}
+    finally:
+        engine.dispose()
+
+
+def search_schema(database_url: str) -> Set[str]:
+    """The quests_fts table and its triggers."""
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as connection:
+            return set(connection.execute(
+                text("SELECT name FROM sqlite_master WHERE name LIKE 'quests_fts%' AND type IN ('table', 'trigger')")
+            ).scalars())
+    finally:
+        engine.dispose()
+
+
+def old_metadata() -> MetaData:
+    """
+    The tables as they were before the search index and the tag tables, with
+    nullable counters. Copies of the tables do not carry the search DDL hooks.
+    """
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        if table.name not in ("tags", "quest_tags"):
+            table.to_metadata(metadata)
+    for counter in ("likes", "bookmarks"):
+        column = metadata.tables["quests"].c[counter]
+        column.nullable, column.server_default = True, None
+    return metadata
+
+
+def test_migrations_upgrade_existing_database(tmp_path: Path, monkeypatch: Any) -> None:
+    # What the application creates today is what the migrations must reach
+    fresh_url = f"sqlite:///{tmp_path / 'fresh.db'}"
+    fresh = create_engine(fresh_url)
+    Base.metadata.create_all(bind=fresh)
+    fresh.dispose()
+    expected = quest_indexes(fresh_url)
+    expected_search = search_schema(fresh_url)
+    assert "quests_fts_insert" in expected_search
+    expected_tag_indexes = table_indexes(fresh_url, "quest_tags")
+    assert "ix_quest_tags_tag_id_quest_id" in expected_tag_indexes
+
+    database_url = f"sqlite:///{tmp_path / 'migrate.db'}"
+    engine = create_engine(database_url)
+    old_metadata().create_all(bind=engine)
+    created_at = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    # A database created before the indexes, trending_score, the location
+    # timestamps and the search index existed
+    with engine.begin() as connection:
+        for name in expected:
+            if name.startswith("ix_quests_") and name != "ix_quests_id":
+                connection.execute(text(f"DROP INDEX {name}"))
+        connection.execute(text("ALTER TABLE quests DROP COLUMN trending_score"))
+        connection.execute(text("ALTER TABLE locations DROP COLUMN created_at"))
+        connection.execute(text("ALTER TABLE locations DROP COLUMN updated_at"))
+        connection.execute(text("INSERT INTO locations (name, latitude, longitude) VALUES ('Old mill', 51.5, -0.1)"))
+        connection.execute(
+            text(
+                "INSERT INTO quests (name, author_id, likes, bookmarks, created_at) "
+                "VALUES ('Old favourite', 1, 3, 1, :created_at), ('Unloved', 1, NULL, 0, :created_at)"
+            ),
+            {"created_at": created_at.strftime("%Y-%m-%d %H:%M:%S")},
+        )
+    # Connections opened before a migration would keep the old schema
+    engine.dispose()
+    config = alembic_config(database_url, monkeypatch)
+
+    command.upgrade(config, "head")
+    assert quest_indexes(database_url) == expected
+    assert search_schema(database_url) == expected_search
+    assert {"created_at", "updated_at"} <= table_columns(database_url, "locations")
+    assert table_indexes(database_url, "quest_tags") == expected_tag_indexes
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT likes, trending_score FROM quests ORDER BY id")).all()
+        # Quests from before the search index are found by it
+        hits = connection.execute(text("SELECT rowid FROM quests_fts WHERE quests_fts MATCH 'favourite'")).all()
+        location_created_at = connection.execute(text("SELECT created_at FROM locations")).scalar_one()
+    engine.dispose()
+    assert [hit.rowid for hit in hits] == [1]
+    assert location_created_at is not None
+    assert rows[0].trending_score == pytest.approx(
+        trending.event_score(3 * trending.LIKE_WEIGHT + trending.BOOKMARK_WEIGHT, created_at)
+    )
+    assert tuple(rows[1]) == (0, 0)
+
+    command.downgrade(config, "base")
+    assert quest_indexes(database_url) == {"ix_quests_id"}
+    assert "trending_score" not in quest_columns(database_url)
+    assert "row_version" not in quest_columns(database_url)
+    assert not {"feed_entries", "tags", "quest_tags"} & set(inspect(engine).get_table_names())
+    assert search_schema(database_url) == set()
+    assert not {"created_at", "updated_at"} & table_columns(database_url, "locations")
+
+    # Indexes that already exist, e.g. created by hand, are left alone
+    with engine.begin() as connection:
+        connection.execute(text("CREATE INDEX ix_quests_created_at_id ON quests (created_at, id)"))
+    engine.dispose()
+    command.upgrade(config, "head")
+    assert quest_indexes(database_url) == expected
+    assert "row_version" in quest_columns(database_url)
+    assert "feed_entries" in inspect(engine).get_table_names()
+    assert search_schema(database_url) == expected_search
+    assert {"created_at", "updated_at"} <= table_columns(database_url, "locations")
+    engine.dispose()
+
+
+def test_migration_skips_empty_database(tmp_path: Path, monkeypatch: Any) -> None:
+    database_url = f"sqlite:///{tmp_path / 'empty.db'}"
+    command.upgrade(alembic_config(database_url, monkeypatch), "head")
+    engine = create_engine(database_url)
+    assert inspect(engine).get_table_names() == ["alembic_version"]
+    engine.dispose()
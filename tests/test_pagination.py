@@ -0,0 +1,88 @@
+from typing import List
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db import models
+from app.db.pagination import encode_cursor
+
+
+def create_users(db: Session, start: int, count: int) -> None:
+    for i in range(start, start + count):
+        db.add(
+            models.User(
+                email=f"pager{i}@example.com",
+                display_name=f"Pager {i}",
+                hashed_password=get_password_hash("password123"),
+            )
+        )
+    db.commit()
+
+
+def collect_pages(client: TestClient, url: str) -> List[List[str]]:
+    pages = []
+    response = client.get(url)
+    while True:
+        assert response.status_code == 200
+        pages.append([user["email"] for user in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+        response = client.get(f"{url}&cursor={cursor}")
+
+
+def test_users_cursor_pagination_walks_every_row_once(client: TestClient, db: Session) -> None:
+    """Rows created within the same second are paged in id order without gaps."""
+    create_users(db, 0, 12)
+
+    pages = collect_pages(client, "/api/v1/users/?limit=5")
+
+    assert [len(page) for page in pages] == [5, 5, 2]
+    emails = [email for page in pages for email in page]
+    assert emails == [f"pager{i}@example.com" for i in range(12)]
+
+
+def test_cursor_pages_do_not_drift_on_insert(client: TestClient, db: Session) -> None:
+    """Rows inserted while a client is paging do not shift the following pages."""
+    create_users(db, 0, 6)
+
+    first = client.get("/api/v1/users/?limit=3")
+    cursor = first.headers["X-Next-Cursor"]
+    create_users(db, 6, 2)
+
+    second = client.get(f"/api/v1/users/?limit=3&cursor={cursor}")
+    assert [user["email"] for user in second.json()] == [
+        f"pager{i}@example.com" for i in range(3, 6)
+    ]
+
+
+def test_last_page_has_no_cursor(client: TestClient, db: Session) -> None:
+    create_users(db, 0, 2)
+
+    response = client.get("/api/v1/users/?limit=5")
+    assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_invalid_cursor_is_rejected(client: TestClient) -> None:
+    for cursor in ("not-a-cursor", "WzFd"):
+        response = client.get(f"/api/v1/campaigns/?cursor={cursor}")
+        assert response.status_code == 400
+
+
+def test_cursor_values_must_match_the_sort_columns(client: TestClient) -> None:
+    # Campaigns page in (created_at, id) order
+    for values in (
+        ["2026-01-01T00:00:00", "7"],
+        ["2026-01-01T00:00:00", 7.5],
+        ["2026-01-01T00:00:00", True],
+        ["2026-01-01T00:00:00", None],
+        [1767225600, 7],
+        [["2026-01-01T00:00:00"], 7],
+    ):
+        response = client.get(f"/api/v1/campaigns/?cursor={encode_cursor(values)}")
+        assert response.status_code == 400, values
+
+    response = client.get(f"/api/v1/campaigns/?cursor={encode_cursor(['2026-01-01T00:00:00', 7])}")
+    assert response.status_code == 200
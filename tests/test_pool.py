@@ -0,0 +1,65 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+
+from app.core.config import settings
+from app.db.pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    engine_options,
+    pool_status,
+)
+
+
+def test_in_memory_sqlite_keeps_default_pool() -> None:
+    assert engine_options("sqlite:///:memory:") == {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+
+def test_engine_options_from_settings(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 5)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 2500)
+
+    options = engine_options("postgresql://u@db/quests")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (20, 5)
+    assert options["connect_args"] == {"options": "-c statement_timeout=2500"}
+
+    options = engine_options("postgresql+asyncpg://u@db/quests", async_=True)
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["connect_args"] == {"server_settings": {"statement_timeout": "2500"}}
+
+
+def test_pool_status_reports_occupancy_and_waits(tmp_path: Path) -> None:
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        status = pool_status(engine)
+        assert (status["size"], status["checked_out"], status["overflow"]) == (1, 1, 0)
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    status = pool_status(engine)
+    assert status["checked_out"] == 0
+    assert status["wait"]["checkouts"] == 1
+    assert status["wait"]["timeouts"] == 1
+    assert status["wait"]["wait_seconds_max"] >= status["wait"]["wait_seconds_avg"] > 0
+    engine.dispose()
+
+
+def test_health_db_endpoint(client: TestClient) -> None:
+    response = client.get("/health/db")
+    assert response.status_code == 200
+    body = response.json()
+    assert isinstance(body["pid"], int)
+    assert "pool_class" in body["pools"]["sync"]
@@ -0,0 +1,90 @@
+from typing import Any, Dict, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.principal_cache import principal_cache
+from app.core.security import create_access_token, get_password_hash
+from app.db import models
+
+
+def create_user(db: Session) -> Dict[str, str]:
+    db.add(
+        models.User(
+            email="principal@example.com",
+            display_name="Principal",
+            hashed_password=get_password_hash("password123"),
+        )
+    )
+    db.commit()
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': 'principal@example.com'})}"}
+
+
+def user_lookups(statements: List[str]) -> List[str]:
+    return [statement for statement in statements if "WHERE users.email" in statement]
+
+
+def test_warm_cache_skips_user_lookup(
+    client: TestClient,
+    db: Session,
+    sample_reference_data: Dict[str, Any],
+    select_statements: List[str],
+) -> None:
+    headers = create_user(db)
+    quest = models.Quest(
+        name="Cached Principal Quest",
+        author_id=db.query(models.User).one().id,
+        start_location=sample_reference_data["location"],
+        interest_id=sample_reference_data["interest"].id,
+        difficulty_id=sample_reference_data["difficulty"].id,
+        quest_type_id=sample_reference_data["quest_type"].id,
+    )
+    db.add(quest)
+    db.commit()
+    quest_id = quest.id
+
+    assert client.get("/api/v1/users/me/", headers=headers).status_code == 200
+    assert len(user_lookups(select_statements)) == 1
+    select_statements.clear()
+
+    me = client.get("/api/v1/users/me/", headers=headers)
+    assert me.status_code == 200
+    assert me.json()["email"] == "principal@example.com"
+    assert select_statements == []
+
+    response = client.post(f"/api/v1/quests/{quest_id}/bookmark/", headers=headers)
+    assert response.status_code == 200
+    assert user_lookups(select_statements) == []
+    assert (principal_cache.stats.hits, principal_cache.stats.misses) == (2, 1)
+
+
+def test_profile_update_evicts_principal(client: TestClient, db: Session) -> None:
+    headers = create_user(db)
+    client.get("/api/v1/users/me/", headers=headers)
+
+    response = client.put("/api/v1/users/me/", json={"display_name": "Renamed"}, headers=headers)
+    assert response.status_code == 200
+
+    assert client.get("/api/v1/users/me/", headers=headers).json()["display_name"] == "Renamed"
+    assert principal_cache.stats.misses == 2
+
+
+def test_deactivation_evicts_principal(client: TestClient, db: Session) -> None:
+    headers = create_user(db)
+    assert client.get("/api/v1/users/me/", headers=headers).json()["is_active"] is True
+
+    assert client.delete("/api/v1/users/me/", headers=headers).status_code == 204
+
+    assert client.get("/api/v1/users/me/", headers=headers).json()["is_active"] is False
+    response = client.put("/api/v1/users/me/", json={"display_name": "Blocked"}, headers=headers)
+    assert response.status_code == 403
+
+
+def test_cache_health_reports_counters(client: TestClient, db: Session) -> None:
+    headers = create_user(db)
+    client.get("/api/v1/users/me/", headers=headers)
+    client.get("/api/v1/users/me/", headers=headers)
+
+    caches = client.get("/health/cache").json()["caches"]
+    assert caches["principals"] == {"backend": "RedisCacheBackend", "hits": 1, "misses": 1}
+    assert set(caches["responses"]) == {"backend", "hits", "misses"}
@@ -0,0 +1,119 @@
+"""
+Query-plan regression tests for the quest listing.
+
+Seeds enough quests that a missing index matters, then EXPLAINs the SQL
+``get_quests`` issues for each supported filter combination and fails if the
+quests table is read with a full scan or the page has to be sorted.
+"""
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from sqlalchemy import event, insert, text
+from sqlalchemy.orm import Session
+
+from app.db import crud_quests, crud_tags, models
+from app.db.pagination import encode_cursor
+
+QUEST_COUNT = 5000
+CHOICES = 10
+
+# Full scans of quests, and sorting instead of reading in index order
+SQLITE_SCAN = re.compile(r"^SCAN quests$")
+SQLITE_SORT = re.compile(r"USE TEMP B-TREE FOR ORDER BY")
+POSTGRESQL_SCAN = re.compile(r"Seq Scan on quests\b")
+POSTGRESQL_SORT = re.compile(r"\bSort\b")
+
+
+@pytest.fixture
+def many_quests(db: Session) -> Session:
+    bind = db.get_bind()
+    db.execute(insert(models.User.__table__), [
+        {"id": n, "email": f"planner{n}@example.com", "display_name": f"Planner {n}", "hashed_password": "x"}
+        for n in range(1, CHOICES + 1)
+    ])
+    for model in (models.Difficulty, models.Interest, models.QuestType):
+        db.execute(insert(model.__table__), [{"id": n, "name": f"{model.__name__} {n}"} for n in range(1, CHOICES + 1)])
+    db.execute(insert(models.Campaign.__table__), [
+        {"id": n, "title": f"Campaign {n}", "author_id": n, "is_public": True} for n in range(1, CHOICES + 1)
+    ])
+    start = datetime(2024, 1, 1)
+    db.execute(insert(models.Quest.__table__), [
+        {
+            "id": n,
+            "name": f"Quest {n}",
+            "author_id": n % CHOICES + 1,
+            "campaign_id": n % CHOICES + 1,
+            "difficulty_id": n % CHOICES + 1,
+            "interest_id": (n // CHOICES) % CHOICES + 1,
+            "quest_type_id": (n // 7) % CHOICES + 1,
+            "is_public": n % 5 != 0,
+            "created_at": start + timedelta(minutes=n),
+            "likes": n % 97,
+            "bookmarks": n % 89,
+            "trending_score": float(n % 101),
+        }
+        for n in range(1, QUEST_COUNT + 1)
+    ])
+    tag_ids = crud_tags.ensure_tags(db, [f"tag{n}" for n in range(CHOICES)])
+    db.execute(insert(models.QuestTag.__table__), [
+        {"quest_id": n, "tag_id": tag_ids[f"tag{n % CHOICES}"]} for n in range(1, QUEST_COUNT + 1)
+    ])
+    db.commit()
+    with bind.connect() as connection:
+        connection.execute(text("ANALYZE"))
+        connection.commit()
+    return db
+
+
+def listing_statements(db: Session, **filters: Any) -> List[Tuple[str, Any]]:
+    statements: List[Tuple[str, Any]] = []
+
+    def record(conn: Any, cursor: Any, statement: str, parameters: Any, *args: Any) -> None:
+        if statement.lstrip().startswith("SELECT") and "FROM quests" in statement:
+            statements.append((statement, parameters))
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        crud_quests.get_quests(db, limit=20, **filters)
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+    return statements
+
+
+def plan_problems(db: Session, statement: str, parameters: Any, may_sort: bool) -> List[str]:
+    connection = db.connection()
+    if connection.dialect.name == "postgresql":
+        lines = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).scalars().all()
+        patterns = [POSTGRESQL_SCAN] + ([] if may_sort else [POSTGRESQL_SORT])
+    else:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        lines = [row.detail for row in rows]
+        patterns = [SQLITE_SCAN] + ([] if may_sort else [SQLITE_SORT])
+    return [line.strip() for line in lines if any(pattern.search(line) for pattern in patterns)]
+
+
+@pytest.mark.parametrize("filters, may_sort", [
+    ({}, False),
+    ({"is_public": True}, False),
+    ({"author_id": 3}, False),
+    ({"campaign_id": 3}, False),
+    ({"difficulty_id": 3}, False),
+    ({"interest_id": 3}, False),
+    ({"quest_type_id": 3}, False),
+    ({"is_public": True, "difficulty_id": 3}, False),
+    ({"author_id": 3, "is_public": True}, False),
+    ({"cursor": encode_cursor([datetime(2024, 1, 2), 1440])}, False),
+    ({"sort": "popular"}, False),
+    ({"sort": "bookmarked"}, False),
+    ({"sort": "trending"}, False),
+    # Tagged quests are found through quest_tags, then their page is sorted
+    ({"tags": ["tag3"]}, True),
+], ids=lambda value: ",".join(f"{key}={value[key]}" for key in value) or "unfiltered" if isinstance(value, dict) else None)
+def test_listing_uses_indexes(many_quests: Session, filters: Dict[str, Any], may_sort: bool) -> None:
+    statements = listing_statements(many_quests, **filters)
+    assert statements
+    for statement, parameters in statements:
+        assert plan_problems(many_quests, statement, parameters, may_sort) == [], statement
@@ -0,0 +1,91 @@
+import logging
+from typing import Callable, ContextManager, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db import models
+from app.db.query_stats import redact_parameters, track_queries
+
+QueryBudget = Callable[[int], ContextManager[List[str]]]
+
+
+def test_server_timing_header(client: TestClient, seeded: Session) -> None:
+    response = client.get("/api/v1/quests/", params={"limit": 20})
+
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="1 queries"' in timing
+    assert "total;dur=" in timing
+
+
+@pytest.mark.parametrize(
+    "path, budget",
+    [
+        ("/api/v1/quests/?limit=20", 1),
+        ("/api/v1/quests/1/", 1),
+        ("/api/v1/quests/?limit=20&sort=trending&tags=supernatural", 1),
+        ("/api/v1/quests/facets/", 1),
+        ("/api/v1/campaigns/?limit=20", 1),
+        ("/api/v1/locations/?limit=20", 1),
+        # Served from the in-memory snapshot once it is loaded
+        ("/api/v1/reference/all", 0),
+    ],
+)
+def test_read_endpoints_stay_within_query_budget(
+    client: TestClient, seeded: Session, query_budget: QueryBudget, path: str, budget: int
+) -> None:
+    client.get("/api/v1/reference/all")
+    with query_budget(budget):
+        assert client.get(path).status_code == 200
+
+
+def test_bookmark_toggle_query_budget(client: TestClient, seeded: Session, query_budget: QueryBudget) -> None:
+    user = seeded.query(models.User).order_by(models.User.id).first()
+    assert user is not None
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+    client.get("/api/v1/users/me/", headers=headers)  # Caches the principal
+
+    with query_budget(2):
+        assert client.post("/api/v1/quests/1/bookmark/", headers=headers).status_code == 200
+
+
+def test_query_budget_fails_when_exceeded(seeded: Session, query_budget: QueryBudget) -> None:
+    with pytest.raises(AssertionError, match="2 queries, budget 1"):
+        with query_budget(1):
+            seeded.execute(text("SELECT 1"))
+            seeded.execute(text("SELECT 2"))
+
+
+def test_track_queries_records_slowest(db: Session) -> None:
+    with track_queries() as stats:
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 2"))
+    db.execute(text("SELECT 3"))
+
+    assert stats.count == 2
+    assert stats.seconds >= stats.slowest_seconds > 0
+    assert stats.slowest_statement in ("SELECT 1", "SELECT 2")
+
+
+def test_slow_queries_are_logged_without_values(
+    db: Session, caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.db.slow_queries"):
+        db.execute(text("SELECT :email"), {"email": "secret@example.com"})
+
+    [record] = caplog.records
+    assert record.statement == "SELECT ?"
+    assert record.parameters == ["str"]
+    assert "secret@example.com" not in caplog.text
+
+
+def test_redact_parameters() -> None:
+    assert redact_parameters({"id": 1, "name": "x"}) == {"id": "int", "name": "str"}
+    assert redact_parameters((1, None)) == ["int", "NoneType"]
+    assert redact_parameters([(1,), (2,)]) == [["int"], "... 2 rows"]
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db import crud_quests, models, trending
+
+
+def create_quests(db: Session, reference: Dict[str, Any], rows: List[Dict[str, Any]]) -> List[models.Quest]:
+    author = models.User(
+        email="sorter@example.com", display_name="Sorter", hashed_password=get_password_hash("password123")
+    )
+    quests = [
+        models.Quest(
+            author=author,
+            start_location=reference["location"],
+            interest_id=reference["interest"].id,
+            difficulty_id=reference["difficulty"].id,
+            quest_type_id=reference["quest_type"].id,
+            **row,
+        )
+        for row in rows
+    ]
+    db.add_all(quests)
+    db.commit()
+    return quests
+
+
+def listed(client: TestClient, **params: Any) -> List[str]:
+    response = client.get("/api/v1/quests/", params=params)
+    assert response.status_code == 200
+    return [quest["name"] for quest in response.json()]
+
+
+def test_sort_orders(client: TestClient, db: Session, sample_reference_data: Dict[str, Any]) -> None:
+    now = datetime.now(timezone.utc)
+    create_quests(db, sample_reference_data, [
+        {"name": "Old", "created_at": now - timedelta(days=3), "likes": 5, "bookmarks": 0},
+        {"name": "Middle", "created_at": now - timedelta(days=2), "likes": 9, "bookmarks": 1},
+        {"name": "New", "created_at": now - timedelta(days=1), "likes": 0, "bookmarks": 4},
+    ])
+
+    assert listed(client) == ["New", "Middle", "Old"]
+    assert listed(client, sort="popular") == ["Middle", "Old", "New"]
+    assert listed(client, sort="bookmarked") == ["New", "Middle", "Old"]
+    assert client.get("/api/v1/quests/", params={"sort": "random"}).status_code == 422
+
+
+def test_sorted_pages_follow_cursor(client: TestClient, db: Session, sample_reference_data: Dict[str, Any]) -> None:
+    create_quests(db, sample_reference_data, [{"name": f"Quest {n}", "likes": n % 3} for n in range(7)])
+
+    names: List[str] = []
+    params: Dict[str, Any] = {"sort": "popular", "limit": 3}
+    while True:
+        response = client.get("/api/v1/quests/", params=params)
+        names += [quest["name"] for quest in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    assert names == ["Quest 5", "Quest 2", "Quest 4", "Quest 1", "Quest 6", "Quest 3", "Quest 0"]
+
+
+def test_trending_prefers_recent_engagement(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any]
+) -> None:
+    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    faded, fresh, ignored = create_quests(db, sample_reference_data, [
+        {"name": "Faded", "likes": 10, "trending_score": trending.event_score(10, at=week_ago)},
+        {"name": "Fresh"},
+        {"name": "Ignored"},
+    ])
+
+    crud_quests.like_quest(db, fresh.id)
+    db.commit()
+    assert listed(client, sort="trending") == ["Fresh", "Faded", "Ignored"]
+
+
+def test_events_add_up_in_log_space(db: Session, sample_reference_data: Dict[str, Any]) -> None:
+    quest, = create_quests(db, sample_reference_data, [{"name": "Engaged"}])
+    user_id = quest.author_id
+
+    crud_quests.like_quest(db, quest.id)
+    crud_quests.add_quest_bookmark_for_user(db, user_id, quest.id)
+    db.commit()
+    db.refresh(quest)
+
+    # Both events happened now: their weights simply add up
+    expected = trending.event_score(trending.LIKE_WEIGHT + trending.BOOKMARK_WEIGHT)
+    assert quest.trending_score == pytest.approx(expected, abs=1e-3)
+
+    # Removing the bookmark leaves the score alone
+    crud_quests.remove_quest_bookmark_for_user(db, user_id, quest.id)
+    db.commit()
+    db.refresh(quest)
+    assert quest.trending_score == pytest.approx(expected, abs=1e-3)
@@ -0,0 +1,98 @@
+from typing import Any, Dict, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db import models
+
+
+def create_quests(db: Session, reference: Dict[str, Any], count: int) -> List[models.Quest]:
+    """Create quests that each have their own author, locations and campaign."""
+    quests = []
+    for i in range(count):
+        author = models.User(
+            email=f"author{i}@example.com",
+            display_name=f"Author {i}",
+            hashed_password=get_password_hash("password123"),
+        )
+        campaign_author = models.User(
+            email=f"campaigner{i}@example.com",
+            display_name=f"Campaigner {i}",
+            hashed_password=get_password_hash("password123"),
+        )
+        start = models.Location(name=f"Start {i}", latitude=1.0 + i, longitude=2.0 + i)
+        destination = models.Location(name=f"End {i}", latitude=3.0 + i, longitude=4.0 + i)
+        campaign = models.Campaign(title=f"Campaign {i}", author=campaign_author)
+        quest = models.Quest(
+            name=f"Quest {i}",
+            synopsis=f"Synopsis {i}",
+            itinerary=f"Itinerary {i}",
+            author=author,
+            start_location=start,
+            destination=destination,
+            campaign=campaign,
+            interest_id=reference["interest"].id,
+            difficulty_id=reference["difficulty"].id,
+            quest_type_id=reference["quest_type"].id,
+        )
+        db.add(quest)
+        quests.append(quest)
+    db.commit()
+    return quests
+
+
+def test_get_quests_embeds_relationships(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any]
+) -> None:
+    """Nested objects in the quest list are populated from the eager loads."""
+    create_quests(db, sample_reference_data, 1)
+
+    response = client.get("/api/v1/quests/")
+    assert response.status_code == 200
+    quest = response.json()[0]
+    assert quest["author"]["display_name"] == "Author 0"
+    assert quest["start_location"]["name"] == "Start 0"
+    assert quest["destination"]["name"] == "End 0"
+    assert quest["campaign"]["author"]["display_name"] == "Campaigner 0"
+    assert quest["difficulty"]["name"] == "Medium"
+    assert quest["interest"]["name"] == "Exploration"
+    assert quest["quest_type"]["name"] == "Adventure"
+
+
+def test_get_quests_query_count_is_independent_of_page_size(
+    client: TestClient,
+    db: Session,
+    sample_reference_data: Dict[str, Any],
+    select_statements: List[str],
+) -> None:
+    """Listing quests issues a fixed number of SELECTs no matter how many rows are returned."""
+    create_quests(db, sample_reference_data, 12)
+
+    select_statements.clear()
+    response = client.get("/api/v1/quests/?limit=1")
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    small_page_queries = len(select_statements)
+
+    select_statements.clear()
+    response = client.get("/api/v1/quests/?limit=12")
+    assert response.status_code == 200
+    assert len(response.json()) == 12
+    assert len(select_statements) == small_page_queries == 1
+
+
+def test_get_quest_detail_single_query(
+    client: TestClient,
+    db: Session,
+    sample_reference_data: Dict[str, Any],
+    select_statements: List[str],
+) -> None:
+    """The quest detail endpoint loads the quest and its relationships in one SELECT."""
+    quest_id = create_quests(db, sample_reference_data, 1)[0].id
+
+    select_statements.clear()
+    response = client.get(f"/api/v1/quests/{quest_id}/")
+    assert response.status_code == 200
+    assert response.json()["campaign"]["author"]["display_name"] == "Campaigner 0"
+    assert len(select_statements) == 1
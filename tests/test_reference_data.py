@@ -0,0 +1,82 @@
+from typing import Any, Dict
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db import crud_reference_data
+
+
+def test_reference_endpoints_return_seeded_rows(
+    client: TestClient, sample_reference_data: Dict[str, Any]
+) -> None:
+    interests = client.get("/api/v1/reference/interests")
+    difficulties = client.get("/api/v1/reference/difficulties")
+    quest_types = client.get("/api/v1/reference/quest-types")
+
+    assert interests.json() == [{"name": "Exploration", "id": sample_reference_data["interest"].id}]
+    assert difficulties.json() == [{"name": "Medium", "id": sample_reference_data["difficulty"].id}]
+    assert quest_types.json() == [{"name": "Adventure", "id": sample_reference_data["quest_type"].id}]
+
+
+def test_all_combines_reference_tables(
+    client: TestClient, sample_reference_data: Dict[str, Any]
+) -> None:
+    response = client.get("/api/v1/reference/all")
+    assert response.status_code == 200
+    assert response.json() == {
+        "interests": client.get("/api/v1/reference/interests").json(),
+        "difficulties": client.get("/api/v1/reference/difficulties").json(),
+        "quest_types": client.get("/api/v1/reference/quest-types").json(),
+    }
+
+
+def test_matching_etag_returns_not_modified(
+    client: TestClient, sample_reference_data: Dict[str, Any]
+) -> None:
+    first = client.get("/api/v1/reference/all")
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    revalidated = client.get("/api/v1/reference/all", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+
+    stale = client.get("/api/v1/reference/all", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+
+
+def test_snapshot_is_served_without_querying(
+    client: TestClient, sample_reference_data: Dict[str, Any], select_statements: Any
+) -> None:
+    client.get("/api/v1/reference/interests")
+    select_statements.clear()
+
+    client.get("/api/v1/reference/interests")
+    client.get("/api/v1/reference/all")
+    assert select_statements == []
+
+
+def test_create_bumps_version_on_commit(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any]
+) -> None:
+    etag = client.get("/api/v1/reference/difficulties").headers["ETag"]
+
+    crud_reference_data.create_difficulty(db, "Legendary")
+    assert client.get("/api/v1/reference/difficulties").headers["ETag"] == etag
+    db.commit()
+
+    response = client.get("/api/v1/reference/difficulties", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert [difficulty["name"] for difficulty in response.json()] == ["Medium", "Legendary"]
+
+
+def test_rolled_back_create_keeps_snapshot(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any]
+) -> None:
+    version = crud_reference_data.get_snapshot(db).version
+
+    crud_reference_data.create_interest(db, "Never Saved")
+    db.rollback()
+
+    assert crud_reference_data.get_snapshot(db).version == version
@@ -0,0 +1,113 @@
+from typing import Any, Dict, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.cache import response_cache
+from app.core.security import get_password_hash
+from app.db import crud_quests, models, schemas
+
+
+def create_quests(db: Session, reference: Dict[str, Any], quests: List[Dict[str, Any]]) -> List[int]:
+    author = models.User(
+        email="searcher@example.com",
+        display_name="Searcher",
+        hashed_password=get_password_hash("password123"),
+    )
+    rows = [
+        models.Quest(
+            author=author,
+            start_location=reference["location"],
+            interest_id=reference["interest"].id,
+            difficulty_id=reference["difficulty"].id,
+            quest_type_id=reference["quest_type"].id,
+            **fields,
+        )
+        for fields in quests
+    ]
+    db.add_all(rows)
+    db.commit()
+    return [row.id for row in rows]
+
+
+def search(client: TestClient, q: str, **params: Any) -> Any:
+    return client.get("/api/v1/quests/search/", params={"q": q, **params})
+
+
+def test_search_ranks_name_matches_first(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any]
+) -> None:
+    lore, synopsis, name, _ = create_quests(db, sample_reference_data, [
+        {"name": "Old Library", "lore_excerpt": "A dragon once slept here."},
+        {"name": "Mountain Pass", "synopsis": "Follow the dragon's trail."},
+        {"name": "Slay the Dragon", "synopsis": "A classic."},
+        {"name": "Fishing Trip", "tags": "relaxing,water"},
+    ])
+
+    response = search(client, "dragon")
+    assert response.status_code == 200
+    hits = response.json()
+    assert [hit["quest"]["id"] for hit in hits] == [name, synopsis, lore]
+    assert hits[0]["rank"] > hits[1]["rank"] > hits[2]["rank"]
+    assert hits[0]["highlights"] == {"name": "Slay the <mark>Dragon</mark>"}
+    assert "<mark>dragon</mark>" in hits[2]["highlights"]["lore_excerpt"]
+
+    # Tags and quest givers are searched too, and the last word may be a prefix
+    assert [hit["quest"]["id"] for hit in search(client, "relax").json()] == [_]
+
+
+def test_search_highlights_escape_quest_text(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any]
+) -> None:
+    create_quests(db, sample_reference_data, [
+        {"name": "<script>alert('dragon')</script> & Co"},
+    ])
+
+    (hit,) = search(client, "dragon").json()
+    assert hit["highlights"] == {
+        "name": "&lt;script&gt;alert(&#x27;<mark>dragon</mark>&#x27;)&lt;/script&gt; &amp; Co"
+    }
+
+
+def test_search_pages_with_cursor(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any]
+) -> None:
+    ids = create_quests(db, sample_reference_data, [
+        {"name": f"Goblin Hunt {n}", "quest_giver": "Captain Goblinbane"} for n in range(5)
+    ])
+
+    seen: List[int] = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = search(client, "goblin hunt", **params)
+        seen += [hit["quest"]["id"] for hit in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert sorted(seen) == ids
+    assert len(seen) == len(set(seen))
+
+
+def test_search_index_follows_updates_and_deletes(
+    client: TestClient, db: Session, sample_reference_data: Dict[str, Any]
+) -> None:
+    quest_id, = create_quests(db, sample_reference_data, [{"name": "Haunted Manor"}])
+    assert len(search(client, "haunted").json()) == 1
+
+    quest = db.get(models.Quest, quest_id)
+    crud_quests.update_quest(db, quest, schemas.QuestUpdate(name="Sunny Meadow"))
+    db.commit()
+    assert search(client, "haunted").json() == []
+    assert len(search(client, "meadow").json()) == 1
+
+    db.delete(quest)
+    db.commit()
+    # Nothing in the API deletes quests yet, so nothing evicts cached results
+    response_cache.invalidate("quests")
+    assert search(client, "meadow").json() == []
+
+
+def test_search_rejects_queries_without_words(client: TestClient) -> None:
+    assert search(client, '"*-').status_code == 400
+    assert client.get("/api/v1/quests/search/").status_code == 422
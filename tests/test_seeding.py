@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.core.security import verify_password
+from app.db import models, seeding
+
+SAMPLE_DATA = json.loads((Path(__file__).parent.parent / "data" / "sample_data.json").read_text())
+
+
+def row_counts(db: Session) -> Dict[str, int]:
+    return {
+        model.__tablename__: db.query(model).count()
+        for model in (models.User, models.Location, models.Campaign, models.Quest, models.QuestTag)
+    }
+
+
+def test_seed_is_idempotent(db: Session) -> None:
+    seeding.seed(db, SAMPLE_DATA)
+    first = row_counts(db)
+    assert first["users"] == len(SAMPLE_DATA["users"])
+    assert first["quests"] == len(SAMPLE_DATA["sample_quests"])
+    assert first["quest_tags"] > 0
+
+    seeding.seed(db, SAMPLE_DATA)
+    assert row_counts(db) == first
+
+    quest = db.query(models.Quest).filter_by(name=SAMPLE_DATA["sample_quests"][0]["name"]).one()
+    assert quest.start_location.name == SAMPLE_DATA["sample_quests"][0]["start_location_name"]
+    assert quest.author.email == SAMPLE_DATA["users"][0]["email"]
+    assert verify_password(seeding.DEFAULT_PASSWORD, quest.author.hashed_password)
+
+
+def test_statements_do_not_grow_with_rows(
+    db: Session, record_statements: Callable[..., ContextManager[List[str]]]
+) -> None:
+    counts = {}
+    for scale in (10, 200):
+        with record_statements() as statements:
+            seeding.seed(db, seeding.synthetic_data(SAMPLE_DATA, scale))
+        counts[scale] = len(statements)
+
+    assert counts[200] <= counts[10]
+    assert db.query(models.Quest).count() == len(SAMPLE_DATA["sample_quests"]) + 200
+
+
+def test_synthetic_data_is_deterministic() -> None:
+    first = seeding.synthetic_data(SAMPLE_DATA, 50, seed=7)
+    assert first == seeding.synthetic_data(SAMPLE_DATA, 50, seed=7)
+    assert first != seeding.synthetic_data(SAMPLE_DATA, 50, seed=8)
+
+    assert len(first["users"]) == len(SAMPLE_DATA["users"]) + 50
+    assert len(first["locations"]) == len(SAMPLE_DATA["locations"]) + 50
+    assert len(first["sample_quests"]) == len(SAMPLE_DATA["sample_quests"]) + 50
+    assert len({quest["name"] for quest in first["sample_quests"]}) == len(first["sample_quests"])
+    assert len({user["email"] for user in first["users"]}) == len(first["users"])
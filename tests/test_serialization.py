@@ -0,0 +1,70 @@
+import json
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Type
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.api.serialization import dump_json, dump_one_json, quest_out
+from app.db import crud_campaigns, crud_locations, crud_quests, crud_users, likes, models, schemas
+from app.db.likes import MemoryLikeBuffer
+from benchmarks import serialization
+
+
+@pytest.mark.parametrize(
+    "schema, load",
+    [
+        (schemas.QuestOut, lambda db: crud_quests.get_quests(db, limit=100).items),
+        (schemas.CampaignOut, lambda db: crud_campaigns.get_campaigns(db, limit=100).items),
+        (schemas.LocationOut, lambda db: crud_locations.get_locations(db, limit=100).items),
+        (schemas.UserOut, lambda db: crud_users.get_users(db, limit=100).items),
+    ],
+)
+def test_projection_matches_schema_dump(
+    seeded: Session, schema: Type[BaseModel], load: Callable[[Session], List[Any]]
+) -> None:
+    objects = load(seeded)
+    assert objects
+
+    expected = TypeAdapter(List[schema]).dump_json([schema.model_validate(obj) for obj in objects])
+    assert dump_json(schema, objects) == expected
+
+
+def test_projection_includes_buffered_likes(seeded: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    buffer = MemoryLikeBuffer()
+    monkeypatch.setattr(likes, "like_buffer", buffer)
+    quest = seeded.get(models.Quest, 1)
+    buffer.add(1, 3)
+
+    assert json.loads(dump_one_json(schemas.QuestOut, quest))["likes"] == quest.likes + 3
+    assert dump_one_json(schemas.QuestOut, quest) == quest_out(quest).model_dump_json().encode()
+
+
+def test_aware_datetimes_match_pydantic() -> None:
+    location = models.Location(id=1, name="Somewhere", latitude=1.0, longitude=2.5)
+    author = models.User(
+        id=1, email="a@example.com", display_name="A", is_active=True,
+        created_at=datetime(2024, 5, 1, 12, 30, 15, 120, tzinfo=timezone.utc),
+    )
+    campaign = models.Campaign(
+        id=1, title="T", is_public=True, author_id=1, author=author, created_at=datetime(2024, 5, 1)
+    )
+
+    assert dump_one_json(schemas.LocationOut, location) == schemas.LocationOut.model_validate(location).model_dump_json().encode()
+    assert dump_one_json(schemas.CampaignOut, campaign) == schemas.CampaignOut.model_validate(campaign).model_dump_json().encode()
+
+
+def test_list_endpoints_keep_cursor_header(client: TestClient, seeded: Session) -> None:
+    for path in ("/api/v1/quests/", "/api/v1/campaigns/", "/api/v1/locations/", "/api/v1/users/"):
+        response = client.get(path, params={"limit": 2})
+        assert response.status_code == 200, path
+        assert response.headers["content-type"] == "application/json"
+        assert len(response.json()) == 2
+        assert "X-Next-Cursor" in response.headers, path
+
+
+def test_projection_is_cheaper_than_validation(seeded: Session) -> None:
+    report = serialization.measure(seeded, pages=3)
+    assert report["quests"]["projected_ms"] < report["quests"]["validated_ms"]
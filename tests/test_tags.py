@@ -0,0 +1,97 @@
+from typing import Any, Callable, Dict, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db import crud_quests, crud_tags, models, schemas
+
+
+def create_author(db: Session) -> models.User:
+    author = models.User(
+        email="tagger@example.com",
+        display_name="Tagger",
+        hashed_password=get_password_hash("password123"),
+    )
+    db.add(author)
+    db.commit()
+    return author
+
+
+def names(response: Any) -> List[str]:
+    return sorted(quest["name"] for quest in response.json())
+
+
+def test_parse_tags_normalises_names() -> None:
+    assert crud_tags.parse_tags(" Ghost  Hunting, castles,,ghost hunting ") == ["ghost hunting", "castles"]
+    assert crud_tags.parse_tags(None) == []
+
+
+def test_tag_filter_any_and_all(client: TestClient, create_quest: Callable[..., models.Quest]) -> None:
+    create_quest("Castle Ghosts", tags="Ghosts, Castles")
+    create_quest("Castle Siege", tags="castles, battles")
+    create_quest("Untagged")
+
+    assert names(client.get("/api/v1/quests/", params={"tags": "ghosts,battles"})) == [
+        "Castle Ghosts", "Castle Siege",
+    ]
+    assert names(client.get("/api/v1/quests/", params={"tags": "castles,ghosts", "tag_mode": "all"})) == [
+        "Castle Ghosts",
+    ]
+    assert client.get("/api/v1/quests/", params={"tags": "dragons"}).json() == []
+    assert client.get("/api/v1/quests/", params={"tags": "x", "tag_mode": "some"}).status_code == 422
+
+
+def test_updating_tags_relinks_quest(db: Session, create_quest: Callable[..., models.Quest]) -> None:
+    quest = create_quest("Retagged", tags="old, shared")
+
+    crud_quests.update_quest(db, quest, schemas.QuestUpdate(tags="shared, new"))
+    db.commit()
+
+    assert sorted(tag.name for tag in quest.normalized_tags) == ["new", "shared"]
+    assert db.query(models.Tag).count() == 3
+
+
+def test_facets_count_filtered_quests_in_one_query(
+    client: TestClient,
+    db: Session,
+    sample_reference_data: Dict[str, Any],
+    create_quest: Callable[..., models.Quest],
+    select_statements: List[str],
+) -> None:
+    create_quest("One", tags="ghosts, castles")
+    create_quest("Two", tags="castles")
+    select_statements.clear()
+
+    response = client.get("/api/v1/quests/facets/")
+    assert response.status_code == 200
+    facets = response.json()
+    assert [(tag["name"], tag["count"]) for tag in facets["tags"]] == [("castles", 2), ("ghosts", 1)]
+    assert facets["difficulties"] == [
+        {"id": sample_reference_data["difficulty"].id, "name": "Medium", "count": 2}
+    ]
+    assert len(facets["interests"]) == len(facets["quest_types"]) == 1
+    assert len(select_statements) == 1
+
+    filtered = client.get("/api/v1/quests/facets/", params={"tags": "ghosts"}).json()
+    assert [(tag["name"], tag["count"]) for tag in filtered["tags"]] == [("castles", 1), ("ghosts", 1)]
+    assert filtered["difficulties"][0]["count"] == 1
+
+
+def test_backfill_links_existing_tag_strings(db: Session, sample_reference_data: Dict[str, Any]) -> None:
+    author = create_author(db)
+    for n, tags in enumerate(["Ruins, Maps", "maps", None]):
+        db.add(models.Quest(
+            name=f"Legacy {n}",
+            tags=tags,
+            author_id=author.id,
+            start_location=sample_reference_data["location"],
+            interest_id=sample_reference_data["interest"].id,
+            difficulty_id=sample_reference_data["difficulty"].id,
+            quest_type_id=sample_reference_data["quest_type"].id,
+        ))
+    db.commit()
+
+    assert crud_tags.backfill_quest_tags(db, batch_size=2) == 3
+    assert crud_tags.backfill_quest_tags(db) == 0
+    assert sorted(tag.name for tag in db.query(models.Tag)) == ["maps", "ruins"]
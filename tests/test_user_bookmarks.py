@@ -2,7 +2,7 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-from app.db import models
+from app.db import crud_quests, models
 from app.core.security import get_password_hash, create_access_token
 
 
@@ -33,4 +33,32 @@ def test_get_my_bookmarked_quests_empty(client: TestClient, db: Session) -> None
 def test_get_my_bookmarked_quests_unauthorized(client: TestClient) -> None:
     """Test getting bookmarked quests without authentication"""
     response = client.get("/api/v1/users/me/bookmarks")
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+
+def test_bookmarked_quests_failure_is_logged_not_returned(
+    client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Errors loading bookmarks are logged; the client gets a generic message"""
+    user = models.User(
+        email="failing@example.com",
+        display_name="Failing User",
+        hashed_password=get_password_hash("password123"),
+        is_active=True
+    )
+    db.add(user)
+    db.commit()
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise RuntimeError("connection string with a password")
+
+    monkeypatch.setattr(crud_quests, "get_user_bookmarked_quests", fail)
+    response = client.get(
+        "/api/v1/quests/bookmarked/",
+        headers={"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+    )
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Could not load bookmarked quests"}
+    assert "Loading bookmarked quests failed" in caplog.text
+    assert "connection string with a password" in caplog.text